@@ -0,0 +1,83 @@
+# -*- coding: utf-8 -*-
+"""
+Benchmark of the flatten/unflatten round trip around `xr.apply_ufunc` used
+by the instrument simulators. Compares `stack` + `helpers.xrFastUnstack`
+with `helpers.DimensionFlattener` on a 1000 x 100 x 4 (time, layer,
+frequency) domain with a 64 element core dimension.
+
+Usage::
+
+    python benchmarks/benchmark_flatten.py
+"""
+import time
+import tracemalloc
+from collections import OrderedDict
+
+import numpy as np
+import xarray as xr
+
+from pamtra2 import helpers
+
+SHAPE = OrderedDict(time=1000, layer=100, frequency=4)
+N_CORE = 64
+
+
+def _create_dataset():
+    coords = OrderedDict((k, np.arange(v)) for k, v in SHAPE.items())
+    coords['sizeBin'] = np.arange(N_CORE)
+    spectrum = xr.DataArray(
+        np.random.random(tuple(SHAPE.values()) + (N_CORE,)),
+        dims=list(SHAPE.keys()) + ['sizeBin'],
+        coords=coords,
+    )
+    temperature = xr.DataArray(
+        np.random.random(tuple(SHAPE.values())[:2]),
+        dims=list(SHAPE.keys())[:2],
+    )
+    return xr.Dataset({'spectrum': spectrum, 'temperature': temperature})
+
+
+def _func(spectrum, temperature):
+    return spectrum.sum(-1) * temperature
+
+
+def _apply(ds):
+    return xr.apply_ufunc(
+        _func, ds.spectrum, ds.temperature,
+        input_core_dims=[['sizeBin'], []],
+    )
+
+
+def stack_unstack(ds):
+    stacked = ds.stack(merged=list(SHAPE.keys()))
+    result = xr.Dataset({'result': _apply(stacked)})
+    return helpers.xrFastUnstack(result, 'merged').result
+
+
+def flatten_unflatten(ds):
+    flattener = helpers.DimensionFlattener(ds, list(SHAPE.keys()))
+    return flattener.unflatten(_apply(flattener.flatten(ds)))
+
+
+def benchmark(func, ds, repeat=3):
+    times = []
+    for ii in range(repeat):
+        tracemalloc.start()
+        t0 = time.perf_counter()
+        result = func(ds)
+        times.append(time.perf_counter() - t0)
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+    return result, min(times), peak
+
+
+if __name__ == '__main__':
+    ds = _create_dataset()
+    print('domain: %s, core dimension: %i' % (dict(SHAPE), N_CORE))
+    results = []
+    for func in [stack_unstack, flatten_unflatten]:
+        result, runtime, peak = benchmark(func, ds)
+        results.append(result.transpose(*SHAPE.keys()))
+        print('%-20s time: %7.3f s   peak memory: %8.1f MB' % (
+            func.__name__, runtime, peak / 1024**2))
+    assert np.allclose(results[0].values, results[1].values)
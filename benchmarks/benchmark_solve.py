@@ -0,0 +1,82 @@
+# -*- coding: utf-8 -*-
+"""
+Benchmark of `hydrometeor.solve` for hydrometeors with many cheap
+properties on many small profiles, i.e. when the time is dominated by
+collecting the function arguments rather than by the functions
+themselves.
+
+Usage::
+
+    python benchmarks/benchmark_solve.py
+"""
+import time
+
+import numpy as np
+
+import pamtra2
+
+N_PROFILES = 50
+N_SOLVES = 20
+
+
+def _create(nLayer=2):
+    pam2 = pamtra2.pamtra2(
+        nLayer=nLayer,
+        hydrometeors=['cloud'],
+        frequencies=[35e9],
+    )
+    pam2.profile.height[:] = np.arange(nLayer) * 100 + 1000
+    pam2.profile.temperature[:] = 280
+    pam2.profile.pressure[:] = 90000
+    pam2.profile.relativeHumidity[:] = 90
+    pam2.profile.hydrometeorContent[:] = 1e-4
+    pam2.addMissingVariables()
+    pam2.addHydrometeor(
+        pamtra2.hydrometeors.softEllipsoidFixedDensity(
+            name='cloud',
+            nBins=2,
+            sizeBounds=pamtra2.hydrometeors.size.linspaceBounds,
+            sizeCenter=pamtra2.hydrometeors.size.boundsToMid,
+            sizeBoundsWidth=pamtra2.hydrometeors.size.boundsWidth,
+            numberConcentration=pamtra2.hydrometeors.numberConcentration.
+            monoDisperseWC,
+            aspectRatio=1.0,
+            mass=pamtra2.hydrometeors.mass.ellipsoid,
+            density=pamtra2.hydrometeors.density.water,
+            crossSectionArea=pamtra2.hydrometeors.crossSectionArea.sphere,
+            relativePermittivity=pamtra2.hydrometeors.relativePermittivity.
+            water_turner_kneifel_cadeddu,
+            scattering=pamtra2.hydrometeors.scattering.Rayleigh,
+            fallVelocity=pamtra2.hydrometeors.fallVelocity.
+            khvorostyanov01_drops,
+            Dmin=1e-5 - 1e-10,
+            Dmax=1e-5 + 1e-10,
+            checkTemperatureForRelativePermittivity=False,
+            useFuncArgDefaults=False,
+        )
+    )
+    return pam2
+
+
+def many_profiles():
+    for ii in range(N_PROFILES):
+        _create()
+
+
+def many_solves(pam2):
+    for ii in range(N_SOLVES):
+        pam2.hydrometeors.cloud.solve(incremental=False)
+
+
+if __name__ == '__main__':
+    _create()  # warm up
+    t0 = time.perf_counter()
+    many_profiles()
+    print('%i profiles created and solved: %.3f s' % (
+        N_PROFILES, time.perf_counter() - t0))
+
+    pam2 = _create()
+    t0 = time.perf_counter()
+    many_solves(pam2)
+    print('%i full solves of one profile: %.3f s' % (
+        N_SOLVES, time.perf_counter() - t0))
@@ -3,10 +3,16 @@ from __future__ import division, absolute_import, print_function
 
 
 from .core import __version__, calculate_gas_absorption_rosenkranz98, \
-    calculate_gas_absorption_liebe93
+    calculate_gas_absorption_liebe93, \
+    calculate_gas_absorption_rosenkranz98_multi_frequency, \
+    calculate_gas_absorption_liebe93_multi_frequency
+from .lookup_table import GasAbsorptionLookupTable
 
 __all__ = [
     '__version__',
     'calculate_gas_absorption_rosenkranz98',
     'calculate_gas_absorption_liebe93',
+    'calculate_gas_absorption_rosenkranz98_multi_frequency',
+    'calculate_gas_absorption_liebe93_multi_frequency',
+    'GasAbsorptionLookupTable',
 ]
@@ -116,6 +116,140 @@ def calculate_gas_absorption_liebe93(
     return atmoAbs
 
 
+def calculate_gas_absorption_rosenkranz98_multi_frequency(
+  frequency, temperature, waterVaporPressure, pressure, sumResults=False,
+  verbosity=0):
+    """
+    Microwave Gas absorption accoding to Rosenkranz 1998 for many
+    frequencies at once.
+
+    In contrast to `calculate_gas_absorption_rosenkranz98`, the frequencies
+    are given separately from the atmospheric state. The frequency
+    independent line strengths and widths are calculated only once per
+    atmospheric state and reused for all frequencies.
+
+    Parameters
+    ----------
+    frequency : array_like
+        frequencies [Hz], 1D with nFreq elements
+    temperature : array_like
+        temperature [K]
+    waterVaporPressure : array_like
+        water vapor pressure [Pa]
+    pressure : array_like
+        pressure [Pa]
+    sumResults : bool, optional
+        return sum of absAir and absWv or both separately (default False)
+    verbosity : int, optional
+        Verbose level of Fortran module (default 0)
+
+    Returns
+    -------
+    absAir : array_like
+        extinction by dry air [Np/m] with shape of the atmospheric state
+        plus a trailing frequency dimension
+    absWv : array_like
+        extinction by water vapor [Np/m] with shape of the atmospheric
+        state plus a trailing frequency dimension
+
+    """
+
+    pamgasabs_lib.report_module.verbose = verbosity
+
+    temperature, waterVaporPressure, pressure = np.broadcast_arrays(
+        temperature, waterVaporPressure, pressure)
+    shape = temperature.shape
+
+    # to GHz
+    frequencyGHz = np.ravel(frequency)/1e9
+
+    absoluteHumidity = meteo_si.humidity.e2a(waterVaporPressure, temperature)
+
+    error, absair, abswv = pamgasabs_lib.rosen98_gasabs_multi(
+        frequencyGHz,
+        temperature.ravel(),
+        np.ravel(absoluteHumidity),
+        pressure.ravel(),
+    )
+
+    if error > 0:
+        raise RuntimeError('Error in Fortran routine rosen98_gasabs_multi')
+
+    # to m
+    absair = absair.reshape(shape + (len(frequencyGHz),)) / 1000.
+    abswv = abswv.reshape(shape + (len(frequencyGHz),)) / 1000.
+
+    if sumResults:
+        return absair + abswv
+    else:
+        return absair, abswv
+
+
+def calculate_gas_absorption_liebe93_multi_frequency(
+  frequency, temperature, waterVaporPressure, pressure, verbosity=0):
+    """
+    Microwave Gas absorption accoding to Liebe 1993 for many frequencies at
+    once.
+
+    In contrast to `calculate_gas_absorption_liebe93`, the frequencies
+    are given separately from the atmospheric state. The frequency
+    independent line parameters are calculated only once per atmospheric
+    state and reused for all frequencies.
+
+    Parameters
+    ----------
+    frequency : array_like
+        frequencies [Hz], 1D with nFreq elements
+    temperature : array_like
+        temperature [K]
+    waterVaporPressure : array_like
+        water vapor pressure [Pa]
+    pressure : array_like
+        pressure [Pa]
+    verbosity : int, optional
+        Verbose level of Fortran module (default 0)
+
+    Returns
+    -------
+    atmoAbs : array_like
+        extinction by moist air [Np/m] with shape of the atmospheric state
+        plus a trailing frequency dimension
+    """
+
+    pamgasabs_lib.report_module.verbose = verbosity
+
+    temperature, waterVaporPressure, pressure = np.broadcast_arrays(
+        temperature, waterVaporPressure, pressure)
+    shape = temperature.shape
+
+    # to GHz
+    frequencyGHz = np.ravel(frequency)/1e9
+    # to kPa
+    pressurekPa = pressure.ravel()/1000.
+    # to Celsius
+    temperatureC = _kelvin2Celsius(temperature.ravel())
+    # to kPa
+    waterVaporPressurekPa = waterVaporPressure.ravel()/1000.
+    # we do hydrometeor attenaution somewhere else
+    liquidWaterContent = np.zeros_like(temperatureC)
+
+    error, atmoAbs = pamgasabs_lib.mpm93_multi(
+        frequencyGHz,
+        pressurekPa,
+        waterVaporPressurekPa,
+        temperatureC,
+        liquidWaterContent,
+        )
+
+    if error > 0:
+        raise RuntimeError('Error in Fortran routine mpm93_multi')
+
+    # per km to tper m
+    atmoAbs = atmoAbs.reshape(shape + (len(frequencyGHz),)) / 1000.
+
+    return atmoAbs
+
+
 def _kelvin2Celsius(kelvin):
     tFreezing = 273.15
     return kelvin - tFreezing
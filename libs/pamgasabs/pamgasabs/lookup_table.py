@@ -0,0 +1,297 @@
+# -*- coding: utf-8 -
+# (c) M. Maahn, 2018
+
+import numpy as np
+from pamtra2.libs import meteo_si
+
+from .core import calculate_gas_absorption_rosenkranz98, \
+    calculate_gas_absorption_liebe93, \
+    calculate_gas_absorption_rosenkranz98_multi_frequency, \
+    calculate_gas_absorption_liebe93_multi_frequency
+
+# Default grid of the lookup table. Pressure is interpolated logarithmically,
+# temperature and absolute humidity linearly. The ranges are chosen to cover
+# the valid range of the Rosenkranz 98 model. The absolute humidity grid is
+# refined towards dry conditions where the water vapor self continuum makes
+# the absorption strongly non-linear.
+DEFAULT_PRESSURE = np.geomspace(10, 1.19e5, 80)  # Pa
+DEFAULT_TEMPERATURE = np.linspace(170, 330, 33)  # K
+DEFAULT_ABSOLUTE_HUMIDITY = np.concatenate(
+    ([0], np.geomspace(1e-6, 0.04, 50)))  # kg/m3
+
+MODELS = ['Rosenkranz98', 'Liebe93']
+
+
+class GasAbsorptionLookupTable(object):
+    """
+    Precomputed microwave gas absorption for a fixed set of frequencies.
+
+    The gas absorption is evaluated once on a regular (pressure, temperature,
+    absolute humidity) grid for every frequency and trilinearly interpolated
+    afterwards (in log(pressure), temperature and absolute humidity). Points
+    outside of the grid or at frequencies not included in the table are
+    calculated with the full model.
+
+    With the default grid, the relative interpolation error with respect to
+    the full model is below 2% in the range 1 - 200 GHz for all physically
+    possible states (i.e. water vapor pressure below saturation) with
+    absorption larger than 1e-7 Np/m.
+    Use `estimate_error` to check the error bound for other grids or
+    frequencies.
+
+    Parameters
+    ----------
+    frequency : array_like
+        frequencies of the table [Hz]
+    model : {'Rosenkranz98', 'Liebe93'}, optional
+        gas absorption model (default 'Rosenkranz98')
+    pressure : array_like, optional
+        pressure grid [Pa], must be increasing (default DEFAULT_PRESSURE)
+    temperature : array_like, optional
+        temperature grid [K], must be increasing (default
+        DEFAULT_TEMPERATURE)
+    absoluteHumidity : array_like, optional
+        absolute humidity (water vapor density) grid [kg/m3], must be
+        increasing (default DEFAULT_ABSOLUTE_HUMIDITY)
+    verbosity : int, optional
+        Verbose level of Fortran module (default 0)
+
+    Attributes
+    ----------
+    table : array_like
+        gas absorption [Np/m] with shape (frequency, pressure, temperature,
+        absoluteHumidity)
+    """
+
+    def __init__(
+        self,
+        frequency,
+        model='Rosenkranz98',
+        pressure=DEFAULT_PRESSURE,
+        temperature=DEFAULT_TEMPERATURE,
+        absoluteHumidity=DEFAULT_ABSOLUTE_HUMIDITY,
+        verbosity=0,
+    ):
+
+        if model not in MODELS:
+            raise ValueError('Do not recognize gas absorption model: %s' %
+                             model)
+
+        self.model = model
+        self.verbosity = verbosity
+        self.frequency = np.unique(np.asarray(frequency, dtype=np.float64))
+        self.pressure = np.asarray(pressure, dtype=np.float64)
+        self.temperature = np.asarray(temperature, dtype=np.float64)
+        self.absoluteHumidity = np.asarray(absoluteHumidity, dtype=np.float64)
+
+        for grid in [self.pressure, self.temperature, self.absoluteHumidity]:
+            assert grid.ndim == 1
+            assert len(grid) >= 2
+            assert np.all(np.diff(grid) > 0)
+
+        self._logPressure = np.log(self.pressure)
+
+        pressure, temperature, absoluteHumidity = np.meshgrid(
+            self.pressure, self.temperature, self.absoluteHumidity,
+            indexing='ij')
+
+        waterVaporPressure = meteo_si.humidity.a2e(
+            absoluteHumidity, temperature)
+        if self.model == 'Rosenkranz98':
+            table = calculate_gas_absorption_rosenkranz98_multi_frequency(
+                self.frequency, temperature, waterVaporPressure, pressure,
+                sumResults=True, verbosity=self.verbosity)
+        elif self.model == 'Liebe93':
+            table = calculate_gas_absorption_liebe93_multi_frequency(
+                self.frequency, temperature, waterVaporPressure, pressure,
+                verbosity=self.verbosity)
+        self.table = np.ascontiguousarray(np.moveaxis(table, -1, 0))
+
+    @property
+    def shape(self):
+        return self.table.shape
+
+    def _calculate(self, frequency, temperature, absoluteHumidity, pressure):
+        """Evaluate the full gas absorption model for flat arrays."""
+        waterVaporPressure = meteo_si.humidity.a2e(
+            absoluteHumidity, temperature)
+        if self.model == 'Rosenkranz98':
+            return calculate_gas_absorption_rosenkranz98(
+                frequency, temperature, waterVaporPressure, pressure,
+                sumResults=True, verbosity=self.verbosity)
+        elif self.model == 'Liebe93':
+            return calculate_gas_absorption_liebe93(
+                frequency, temperature, waterVaporPressure, pressure,
+                verbosity=self.verbosity)
+
+    def _interpolate(self, iFrequency, temperature, absoluteHumidity,
+                     pressure):
+        """Trilinear interpolation of the table for flat arrays."""
+        indices = []
+        weights = []
+        for grid, values in [
+            (self._logPressure, np.log(pressure)),
+            (self.temperature, temperature),
+            (self.absoluteHumidity, absoluteHumidity),
+        ]:
+            ii = np.clip(np.searchsorted(grid, values) - 1, 0, len(grid) - 2)
+            indices.append(ii)
+            weights.append((values - grid[ii]) / (grid[ii+1] - grid[ii]))
+
+        (iP, iT, iA), (wP, wT, wA) = indices, weights
+
+        result = np.zeros(len(iFrequency))
+        for dP, fP in [(0, 1 - wP), (1, wP)]:
+            for dT, fT in [(0, 1 - wT), (1, wT)]:
+                for dA, fA in [(0, 1 - wA), (1, wA)]:
+                    result += fP * fT * fA * self.table[
+                        iFrequency, iP + dP, iT + dT, iA + dA]
+        return result
+
+    def __call__(self, frequency, temperature, waterVaporPressure, pressure):
+        """
+        Gas absorption interpolated from the lookup table. Same interface as
+        `calculate_gas_absorption_rosenkranz98` with sumResults=True.
+
+        Parameters
+        ----------
+        frequency : array_like
+            frequency [Hz]
+        temperature : array_like
+            temperature [K]
+        waterVaporPressure : array_like
+            water vapor pressure [Pa]
+        pressure : array_like
+            pressure [Pa]
+
+        Returns
+        -------
+        gasAbs : array_like
+            extinction by moist air [Np/m]
+        """
+
+        frequency, temperature, waterVaporPressure, pressure = \
+            np.broadcast_arrays(
+                frequency, temperature, waterVaporPressure, pressure)
+        shape = frequency.shape
+
+        frequency = frequency.ravel().astype(np.float64)
+        temperature = temperature.ravel().astype(np.float64)
+        pressure = pressure.ravel().astype(np.float64)
+        absoluteHumidity = meteo_si.humidity.e2a(
+            waterVaporPressure.ravel(), temperature)
+
+        iFrequency = np.clip(np.searchsorted(self.frequency, frequency),
+                             0, len(self.frequency) - 1)
+        inTable = (
+            (self.frequency[iFrequency] == frequency) &
+            (pressure >= self.pressure[0]) &
+            (pressure <= self.pressure[-1]) &
+            (temperature >= self.temperature[0]) &
+            (temperature <= self.temperature[-1]) &
+            (absoluteHumidity >= self.absoluteHumidity[0]) &
+            (absoluteHumidity <= self.absoluteHumidity[-1])
+        )
+
+        gasAbs = np.empty(frequency.shape)
+        gasAbs[inTable] = self._interpolate(
+            iFrequency[inTable],
+            temperature[inTable],
+            absoluteHumidity[inTable],
+            pressure[inTable],
+        )
+        if not np.all(inTable):
+            gasAbs[~inTable] = self._calculate(
+                frequency[~inTable],
+                temperature[~inTable],
+                absoluteHumidity[~inTable],
+                pressure[~inTable],
+            )
+
+        return gasAbs.reshape(shape)
+
+    def multi_frequency(self, frequency, temperature, waterVaporPressure,
+                        pressure):
+        """
+        Gas absorption interpolated from the lookup table for many
+        frequencies at once. Same interface as
+        `calculate_gas_absorption_rosenkranz98_multi_frequency` with
+        sumResults=True.
+
+        Parameters
+        ----------
+        frequency : array_like
+            frequencies [Hz], 1D with nFreq elements
+        temperature : array_like
+            temperature [K]
+        waterVaporPressure : array_like
+            water vapor pressure [Pa]
+        pressure : array_like
+            pressure [Pa]
+
+        Returns
+        -------
+        gasAbs : array_like
+            extinction by moist air [Np/m] with shape of the atmospheric
+            state plus a trailing frequency dimension
+        """
+        return self(
+            np.ravel(frequency),
+            np.asarray(temperature)[..., np.newaxis],
+            np.asarray(waterVaporPressure)[..., np.newaxis],
+            np.asarray(pressure)[..., np.newaxis],
+        )
+
+    def estimate_error(self, minAbsorption=1e-7):
+        """
+        Estimate the maximum relative interpolation error of the table by
+        comparing against the full model in the center of every grid cell,
+        where the error of the linear interpolation is largest. Grid cells
+        with water vapor pressure exceeding saturation (with respect to
+        water) are ignored.
+
+        Parameters
+        ----------
+        minAbsorption : float, optional
+            ignore grid cells with absorption below this threshold [Np/m]
+            (default 1e-7)
+
+        Returns
+        -------
+        maxError : array_like
+            maximum relative error for each frequency of the table
+        """
+
+        pressure = np.exp(0.5 * (self._logPressure[1:] +
+                                 self._logPressure[:-1]))
+        temperature = 0.5 * (self.temperature[1:] + self.temperature[:-1])
+        absoluteHumidity = 0.5 * (self.absoluteHumidity[1:] +
+                                  self.absoluteHumidity[:-1])
+        pressure, temperature, absoluteHumidity = np.meshgrid(
+            pressure, temperature, absoluteHumidity, indexing='ij')
+        pressure = pressure.ravel()
+        temperature = temperature.ravel()
+        absoluteHumidity = absoluteHumidity.ravel()
+
+        waterVaporPressure = meteo_si.humidity.a2e(
+            absoluteHumidity, temperature)
+        possible = (
+            (waterVaporPressure <=
+             meteo_si.humidity.e_sat_gg_water(temperature)) &
+            (waterVaporPressure < pressure)
+        )
+
+        maxError = np.zeros(len(self.frequency))
+        for ff, freq in enumerate(self.frequency):
+            reference = self._calculate(
+                np.full(pressure.size, freq), temperature, absoluteHumidity,
+                pressure)
+            interpolated = self._interpolate(
+                np.full(pressure.size, ff), temperature, absoluteHumidity,
+                pressure)
+            valid = possible & (reference > minAbsorption)
+            if np.any(valid):
+                maxError[ff] = np.max(
+                    np.abs(interpolated[valid] - reference[valid]) /
+                    reference[valid])
+        return maxError
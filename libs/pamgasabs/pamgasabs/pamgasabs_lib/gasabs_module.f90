@@ -111,7 +111,31 @@ contains
 !f2py threadsafe
       !
       !     PURPOSE: RETURNS ABSORPTION COEFFICIENT DUE TO OXYGEN IN AIR,
-      !              IN NEPERS/KM
+      !              IN NEPERS/KM. SEE o2abs_multi.
+      !
+      use kinds, only:dbl
+
+      implicit none
+
+      real(kind=dbl), intent(in) :: tempK, pres, vapden, freq
+      real(kind=dbl) :: o2abs
+      real(kind=dbl), dimension(1) :: loc_abs
+
+      call o2abs_multi(tempK, pres, vapden, 1, (/freq/), loc_abs)
+      o2abs = loc_abs(1)
+
+      return
+
+   end function o2abs
+   !
+   !
+   subroutine o2abs_multi(tempK, pres, vapden, nFreq, freq, o2abs)
+!f2py threadsafe
+      !
+      !     PURPOSE: RETURNS ABSORPTION COEFFICIENT DUE TO OXYGEN IN AIR,
+      !              IN NEPERS/KM, FOR nFreq FREQUENCIES. THE FREQUENCY
+      !              INDEPENDENT LINE STRENGTHS, WIDTHS AND MIXING
+      !              COEFFICIENTS ARE CALCULATED ONLY ONCE.
       !
       !      5/1/95  P. Rosenkranz
       !
@@ -135,13 +159,16 @@ contains
 
       implicit none
 
-      integer(kind=long) :: k
+      integer(kind=long) :: k, n
 
-      real(kind=dbl), intent(in) :: tempK, pres, vapden, freq
-      real(kind=dbl) :: th, th1, b, preswv, presda, den, dfnr, df
-      real(kind=dbl) :: str, sf1, sf2, loc_sum, y
+      integer, intent(in) :: nFreq
+      real(kind=dbl), intent(in) :: tempK, pres, vapden
+      real(kind=dbl), dimension(nFreq), intent(in) :: freq
+      real(kind=dbl) :: th, th1, b, preswv, presda, den, dfnr
+      real(kind=dbl) :: sf1, sf2, loc_sum
+      real(kind=dbl), dimension(40) :: df, str, y
 
-      real(kind=dbl) :: o2abs
+      real(kind=dbl), dimension(nFreq), intent(out) :: o2abs
       !      WIDTHS IN MHZ/MB
       real(kind=dbl) :: x = 0.8, &
                         wb300 = 0.56
@@ -200,27 +227,56 @@ contains
       presda = pres - preswv
       den = 0.001_dbl*(presda*b + 1.1_dbl*preswv*th)
       dfnr = wb300*den
-      loc_sum = 1.6d-17*freq*freq*dfnr/(th*(freq*freq + dfnr*dfnr))
       do k = 1, 40
-         df = w300(k)*den
-         y = 0.001_dbl*pres*b*(y300(k) + v(k)*th1)
-         str = s300(k)*exp(-be(k)*th1)
-         sf1 = (df + (freq - f(k))*y)/((freq - f(k))**2 + df*df)
-         sf2 = (df - (freq + f(k))*y)/((freq + f(k))**2 + df*df)
-         loc_sum = loc_sum + str*(sf1 + sf2)*(freq/f(k))**2
+         df(k) = w300(k)*den
+         y(k) = 0.001_dbl*pres*b*(y300(k) + v(k)*th1)
+         str(k) = s300(k)*exp(-be(k)*th1)
+      end do
+      do n = 1, nFreq
+         loc_sum = 1.6d-17*freq(n)*freq(n)*dfnr/(th*(freq(n)*freq(n) + dfnr*dfnr))
+         do k = 1, 40
+            sf1 = (df(k) + (freq(n) - f(k))*y(k))/((freq(n) - f(k))**2 + df(k)*df(k))
+            sf2 = (df(k) - (freq(n) + f(k))*y(k))/((freq(n) + f(k))**2 + df(k)*df(k))
+            loc_sum = loc_sum + str(k)*(sf1 + sf2)*(freq(n)/f(k))**2
+         end do
+         o2abs(n) = 0.5034d12*loc_sum*presda*th**3/pi
       end do
-      o2abs = 0.5034d12*loc_sum*presda*th**3/pi
 
       return
 
-   end function o2abs
+   end subroutine o2abs_multi
 
    !*************************************************************
    function abh2o(tempK, pres, rho, freq)
+!f2py threadsafe
+      !
+      ! PURPOSE- COMPUTE ABSORPTION COEF IN ATMOSPHERE DUE TO WATER VAPOR
+      !          SEE abh2o_multi.
+      !
+      use kinds, only:dbl
+
+      implicit none
+
+      real(kind=dbl), intent(in) :: tempK, pres, rho, freq
+      real(kind=dbl) :: abh2o
+      real(kind=dbl), dimension(1) :: loc_abs
+
+      call abh2o_multi(tempK, pres, rho, 1, (/freq/), loc_abs)
+      abh2o = loc_abs(1)
+
+      return
+
+   end function abh2o
+
+   !*************************************************************
+   subroutine abh2o_multi(tempK, pres, rho, nFreq, freq, abh2o)
 !f2py threadsafe
       !
       !  NAME- ABH2O    LANGUAGE- FORTRAN 77
       !
+      !  abh2o FOR nFreq FREQUENCIES. THE FREQUENCY INDEPENDENT LINE
+      !  STRENGTHS AND WIDTHS ARE CALCULATED ONLY ONCE.
+      !
       ! PURPOSE- COMPUTE ABSORPTION COEF IN ATMOSPHERE DUE TO WATER VAPOR
       !
       !  CALLING SEQUENCE PARAMETERS-
@@ -265,12 +321,15 @@ contains
 
       implicit none
 
-      real(kind=dbl), intent(in) :: tempK, pres, rho, freq
-      real(kind=dbl) :: abh2o
+      integer, intent(in) :: nFreq
+      real(kind=dbl), intent(in) :: tempK, pres, rho
+      real(kind=dbl), dimension(nFreq), intent(in) :: freq
+      real(kind=dbl), dimension(nFreq), intent(out) :: abh2o
       integer(kind=long), parameter :: nlines = 15
-      integer(kind=long) :: i, j
+      integer(kind=long) :: i, j, n
       real(kind=dbl) :: df(2)
-      real(kind=dbl) :: pvap, pda, den, ti, ti2, loc_sum, width, wsq, s, base, res, con
+      real(kind=dbl) :: pvap, pda, den, ti, ti2, loc_sum, res, con, conCoeff
+      real(kind=dbl), dimension(nlines) :: width, wsq, s, base
       !     LINE FREQUENCIES:
       real(kind=dbl), dimension(nlines) :: fl = (/ &
                                            22.2351, 183.3101, 321.2256, 325.1529, 380.1974, 439.1508, &
@@ -303,7 +362,7 @@ contains
                                            1.0, 0.68, 0.84, 0.78/)
 
       if (rho <= 0.) then
-         abh2o = 0._dbl
+         abh2o(:) = 0._dbl
          return
       endif
       pvap = rho*tempK/217._dbl
@@ -312,31 +371,40 @@ contains
       ti = 300._dbl/tempK
       ti2 = ti**2.5
       !
-      !      continuum terms
-      con = (5.43d-10*1.105_dbl*pda*ti**3 + 1.8d-8*0.79_dbl*pvap*ti**7.5)*pvap*freq*freq
+      !      frequency independent part of continuum terms
+      conCoeff = (5.43d-10*1.105_dbl*pda*ti**3 + 1.8d-8*0.79_dbl*pvap*ti**7.5)*pvap
       !
-      !      add resonances
-      loc_sum = 0.
+      !      frequency independent line widths and strengths
       do i = 1, nlines
-         width = w3(i)*pda*ti**x(i) + ws(i)*pvap*ti**xs(i)
-         wsq = width*width
-         s = s1(i)*ti2*exp(b2(i)*(1.-ti))
-         df(1) = freq - fl(i)
-         df(2) = freq + fl(i)
+         width(i) = w3(i)*pda*ti**x(i) + ws(i)*pvap*ti**xs(i)
+         wsq(i) = width(i)*width(i)
+         s(i) = s1(i)*ti2*exp(b2(i)*(1.-ti))
          !  use clough's definition of local line contribution
-         base = width/(562500._dbl + wsq)
-         !  do for positive and negative resonances
-         res = 0._dbl
-         do j = 1, 2
-            if (abs(df(j)) .lt. 750.) res = res + width/(df(j)**2 + wsq) - base
+         base(i) = width(i)/(562500._dbl + wsq(i))
+      end do
+      do n = 1, nFreq
+         !
+         !      continuum terms
+         con = conCoeff*freq(n)*freq(n)
+         !
+         !      add resonances
+         loc_sum = 0.
+         do i = 1, nlines
+            df(1) = freq(n) - fl(i)
+            df(2) = freq(n) + fl(i)
+            !  do for positive and negative resonances
+            res = 0._dbl
+            do j = 1, 2
+               if (abs(df(j)) .lt. 750.) res = res + width(i)/(df(j)**2 + wsq(i)) - base(i)
+            end do
+            loc_sum = loc_sum + s(i)*res*(freq(n)/fl(i))**2
          end do
-         loc_sum = loc_sum + s*res*(freq/fl(i))**2
+         abh2o(n) = 0.3183d-4*den*loc_sum + con
       end do
-      abh2o = 0.3183d-4*den*loc_sum + con
 
       return
 
-   end function abh2o
+   end subroutine abh2o_multi
 end module gasabs_module
 
 !- End of module header
@@ -67,8 +67,98 @@ SUBROUTINE mpm93(errorstatus,nLayer, freq, Pbkpa, Ekpa, Tc, W, abscof)
 
 END SUBROUTINE mpm93
 
+SUBROUTINE mpm93_multi(errorstatus, nLayer, nFreq, freq, Pbkpa, Ekpa, Tc, W, abscof)
+!f2py threadsafe
+
+  !****************************************************************** 
+  ! Same as mpm93, but for nLayer atmospheric states and nFreq
+  ! frequencies given separately. The frequency independent line
+  ! parameters are calculated only once per layer and reused for all
+  ! frequencies.
+  !****************************************************************** 
+
+   use kinds, only:dbl, & ! integer parameter specifying double precision
+      long ! integer parameter specifying long integer
+   use report_module
+
+   implicit none
+
+   integer, intent(in) :: nLayer
+   integer, intent(in) :: nFreq
+
+   real(kind=dbl), dimension(nFreq), intent(in) :: freq 
+   real(kind=dbl), dimension(nLayer), intent(in) :: Tc 
+   real(kind=dbl), dimension(nLayer), intent(in) :: Pbkpa 
+   real(kind=dbl), dimension(nLayer), intent(in) :: W 
+   real(kind=dbl), dimension(nLayer), intent(in) :: Ekpa 
+
+! Array arguments with intent(out):
+
+   real(kind=dbl), dimension(nLayer, nFreq), intent(out) :: abscof ! extinction by moist air [Np/km]
+
+   real(kind=dbl), dimension(nFreq) :: loc_abscof
+   integer :: nn
+
+   integer(kind=long), intent(out) :: errorstatus
+   integer(kind=long) :: err
+   character(len=80) :: msg
+   character(len=14) :: nameOfRoutine = 'mpm93_multi'
+
+   err = 0
+   errorstatus = 0
+
+   abscof(:, :) = 0.d0
+
+   do nn = 1, nLayer
+
+      call mpm93_one_multi(err, &
+         nFreq, &
+         freq, &
+         Pbkpa(nn), &
+         Ekpa(nn), &
+         Tc(nn), &
+         W(nn), &
+         loc_abscof)
+
+      if (err /= 0) then
+         msg = 'error in mpm93_one_multi!'
+         call report(err, msg, nameOfRoutine)
+         errorstatus = err
+         return
+      end if
+
+      abscof(nn, :) = loc_abscof
+
+   end do
+
+END SUBROUTINE mpm93_multi
+
 SUBROUTINE mpm93_one(errorstatus,freq, Pbkpa, Ekpa, Tc, W, abscof)
 !f2py threadsafe
+  ! MPM93 for a single frequency, see mpm93_one_multi
+
+  use kinds, only: dbl, long
+
+  implicit none
+
+  REAL(kind=dbl), intent(in) :: freq, Pbkpa, Ekpa, Tc, W
+  real(kind=dbl), intent(out) :: ABSCOF
+  integer(kind=long), intent(out) :: errorstatus
+
+  real(kind=dbl), dimension(1) :: loc_abscof
+
+  call mpm93_one_multi(errorstatus, 1, (/freq/), Pbkpa, Ekpa, Tc, W, loc_abscof)
+  ABSCOF = loc_abscof(1)
+
+  return
+
+END SUBROUTINE mpm93_one
+
+SUBROUTINE mpm93_one_multi(errorstatus, nFreq, freq, Pbkpa, Ekpa, Tc, W, abscof)
+!f2py threadsafe
+  !  MPM93 for nFreq frequencies. The frequency independent line strengths,
+  !  widths and shifts are calculated only once.
+  !
   !  MPM93 - subroutines adapted by Jeff Haferman (NASA/GSFC 5/97)
   !  from Liebe's MPM93 model.  His comments are included below.
   !  I've based this adaptation on Frank Evans' MPM92 extraction.
@@ -199,9 +289,11 @@ SUBROUTINE mpm93_one(errorstatus,freq, Pbkpa, Ekpa, Tc, W, abscof)
 
   implicit none
 
-  REAL(kind=dbl), intent(in) :: freq, Pbkpa, Ekpa, Tc, W
-  real(kind=dbl), intent(out) :: ABSCOF
-  INTEGER :: I
+  INTEGER, intent(in) :: nFreq
+  REAL(kind=dbl), dimension(nFreq), intent(in) :: freq
+  REAL(kind=dbl), intent(in) :: Pbkpa, Ekpa, Tc, W
+  real(kind=dbl), dimension(nFreq), intent(out) :: ABSCOF
+  INTEGER :: I, N
   integer :: ICE = 0
 
   REAL(kind=dbl) :: AT1, AT2, AT3, AT4
@@ -210,6 +302,8 @@ SUBROUTINE mpm93_one(errorstatus,freq, Pbkpa, Ekpa, Tc, W, abscof)
   REAL(kind=dbl) :: fD, fS, Eps, Epinf, Eopt
   REAL(kind=dbl) :: Ai, Bi, fice
   REAL(kind=dbl) :: V, P, Pb, E
+  REAL(kind=dbl), dimension(44) :: SO2, GAMMAO2, DELTAO2
+  REAL(kind=dbl), dimension(35) :: SH2O, GAMH2O
 
   COMPLEX(kind=dbl) :: ZN, ZNw, ZEp, ZF, ZFo, ZFn
 
@@ -337,38 +431,24 @@ SUBROUTINE mpm93_one(errorstatus,freq, Pbkpa, Ekpa, Tc, W, abscof)
      Pb = E 
   ENDIF
 
-  ! For OXYGEN                                                            
-  ZN = CMPLX(0._dbl, 0._dbl)
+  ! For OXYGEN, frequency independent line parameters
   DO I = 1, 44
      GAMMA = 0. 
      S = A(1,I) * P * V**3 * EXP(A(2,I) * (1._dbl - V)) * 1.d-6
      GAMMA = A(3,I) * (P * V**(0.8_dbl - A(4,I)) + 1.1_dbl * E * V) * 1.d-3
      GAMMA = (GAMMA**2 + (25._dbl * 0.6d-4)**2)**0.5
      DELTA = (A(5,I) + A(6,I) * V) * (P + E) * (V**0.8) * 1.d-3
-     ZF = freq / F0O2(I) * (CMPLX (1._dbl,-DELTA) / CMPLX(F0O2(I) - freq,-GAMMA) &
-      - CMPLX(1._dbl,DELTA) / CMPLX(F0O2(I) + freq,GAMMA))
-     ZN = ZN + S * ZF 
+     SO2(I) = S
+     GAMMAO2(I) = GAMMA
+     DELTAO2(I) = DELTA
   END DO
-
-  ! OXYGEN LINE ABSORPTION                                                
-  ! Cannot be less than 0.                                                
-  AT1 = 0.182_dbl * freq * AIMAG(ZN)
-  IF (AT1 < 0.) AT1 = 0._dbl
   !                                                                       
-  ! DRY AIR CONTINUUM                                                     
-  ZN = CMPLX(0._dbl,0._dbl)
+  ! DRY AIR CONTINUUM, frequency independent parameters
   So = 6.14d-5 * P * V**2
   GAMMAo = 0.56d-3 * (P + E) * V**0.8
-  ZFo = -freq / CMPLX(freq,GAMMAo)
   Sn = 1.40d-12 * p**2 * V**3.5
-  ZFn = CMPLX(0.,freq / (1.93d-5 * freq**1.5 + 1._dbl) )
-  ZN = So * ZFo + Sn * ZFn 
-
-  ! NONRESONAT DRY AIR ABSORPTION                                         
-  AT2 = 0.182_dbl * freq * AIMAG(ZN)
   !                                                                       
-  ! WATER VAPOR                                                           
-  ZN = CMPLX(0._dbl,0._dbl)
+  ! WATER VAPOR, frequency independent line parameters
   DO I = 1, 35
      GAMH = 0._dbl
      S = B(1,I) * E * V**3.5 * EXP(B(2,I) * (1._dbl - V))
@@ -376,19 +456,11 @@ SUBROUTINE mpm93_one(errorstatus,freq, Pbkpa, Ekpa, Tc, W, abscof)
      GAMH = B(3,I) * (P * V**B(5, I) + B(4, I) * E * V**B(6, I)) * 1.d-3
      GAMD2 = 1.d-12 / V * (1.46 * F0H2O(I))**2
      GAMH = 0.535_dbl * GAMH + (0.217_dbl * GAMH**2 + GAMD2)**0.5
-     DELH = 0._dbl
-     ZF = freq / F0H2O(I) * (CMPLX(1._dbl, -DELH) / CMPLX(F0H2O(I) - freq, -GAMH) &
-     - CMPLX(1._dbl,DELH) / CMPLX(F0H2O(I) + freq,GAMH))
-     ZN = ZN + S * ZF 
+     SH2O(I) = S
+     GAMH2O(I) = GAMH
   END DO
-
-  ! WATER VAPOR LINE ABSORPTION                                           
-  ! SEE LIEBE'S COMMENT REGARDING "PSUEDO-LINE WATER VAPOR CONTINUUM" - JL
-  AT3 = 0.182_dbl * freq * AIMAG(ZN)
-
-  !>>>>>>>>>>>>>>>> Not used since W is set equal 0 <<<<<<<<<<<<<<<<<<
   !                                                                       
-  ! LIQUID WATER PERMITTIVITY [8]                                         
+  ! LIQUID WATER PERMITTIVITY [8], frequency independent parameters
   ! Use exponential form for gamma for T<0 extrapolation (a la Frank Evans
   IF (ICE == 0) THEN
      !JLH    fD=20.20-146.4*(V-1)+316*(V-1)**2                               
@@ -397,28 +469,70 @@ SUBROUTINE mpm93_one(errorstatus,freq, Pbkpa, Ekpa, Tc, W, abscof)
      Eps = 103.3_dbl * (V - 1) + 77.66_dbl
      Epinf = 0.0671_dbl * Eps
      Eopt = 3.52_dbl
-     ! Complex Permittivity of water (double-Debye model)                    
-     ZEp = Eps - freq * ((Eps - Epinf) / CMPLX(freq, fD) + (Epinf &
-          - Eopt) / CMPLX(freq,fS))
-     !                                                                       
-     ! ICE PERMITTIVITY [8]                                                  
   ELSE 
      Ai = (62._dbl * V - 11.6_dbl) * 1.d-4 * EXP(-22.1_dbl * (V - 1._dbl))
      Bi = 0.542d-6 * (-24.17_dbl + 116.79_dbl / V + (V / (V - 0.9927_dbl))**2)
      Eps = 3.15_dbl
-     ! Complex Permittivity of Ice                                           
-     fice = freq
-     IF (freq < 0.001_dbl) fice = 0.001_dbl
-     ZEp = CMPLX(3.15_dbl,Ai / fice+Bi * fice)
   END IF
-  ! SUSPENDED PARTICLE RAYLEIGH APPROXIMATION [6]                         
-  ZNw = 1.5_dbl * W * ((ZEp - 1._dbl) / (ZEp + 2._dbl) - 1._dbl + 3._dbl / (Eps + 2._dbl))
-  !                                                                       
 
-  ! SUSPENDED WATER DROPLET EXTINCTION                                    
-  AT4 = 0.182_dbl * freq * AIMAG(ZNw)
-  !>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>    <<<<<<<<<<<<<<<<<<<<<<<<<<<<<<<<<<<                                                                        
-  ABSCOF = 0.23026_dbl * (AT1 + AT2 + AT3 + AT4)
+  DO N = 1, nFreq
+     ! For OXYGEN                                                            
+     ZN = CMPLX(0._dbl, 0._dbl)
+     DO I = 1, 44
+        ZF = freq(N) / F0O2(I) * (CMPLX (1._dbl,-DELTAO2(I)) / CMPLX(F0O2(I) - freq(N),-GAMMAO2(I)) &
+         - CMPLX(1._dbl,DELTAO2(I)) / CMPLX(F0O2(I) + freq(N),GAMMAO2(I)))
+        ZN = ZN + SO2(I) * ZF 
+     END DO
+
+     ! OXYGEN LINE ABSORPTION                                                
+     ! Cannot be less than 0.                                                
+     AT1 = 0.182_dbl * freq(N) * AIMAG(ZN)
+     IF (AT1 < 0.) AT1 = 0._dbl
+     !                                                                       
+     ! DRY AIR CONTINUUM                                                     
+     ZN = CMPLX(0._dbl,0._dbl)
+     ZFo = -freq(N) / CMPLX(freq(N),GAMMAo)
+     ZFn = CMPLX(0.,freq(N) / (1.93d-5 * freq(N)**1.5 + 1._dbl) )
+     ZN = So * ZFo + Sn * ZFn 
+
+     ! NONRESONAT DRY AIR ABSORPTION                                         
+     AT2 = 0.182_dbl * freq(N) * AIMAG(ZN)
+     !                                                                       
+     ! WATER VAPOR                                                           
+     ZN = CMPLX(0._dbl,0._dbl)
+     DO I = 1, 35
+        DELH = 0._dbl
+        ZF = freq(N) / F0H2O(I) * (CMPLX(1._dbl, -DELH) / CMPLX(F0H2O(I) - freq(N), -GAMH2O(I)) &
+        - CMPLX(1._dbl,DELH) / CMPLX(F0H2O(I) + freq(N),GAMH2O(I)))
+        ZN = ZN + SH2O(I) * ZF 
+     END DO
+
+     ! WATER VAPOR LINE ABSORPTION                                           
+     ! SEE LIEBE'S COMMENT REGARDING "PSUEDO-LINE WATER VAPOR CONTINUUM" - JL
+     AT3 = 0.182_dbl * freq(N) * AIMAG(ZN)
+
+     !>>>>>>>>>>>>>>>> Not used since W is set equal 0 <<<<<<<<<<<<<<<<<<
+     IF (ICE == 0) THEN
+        ! Complex Permittivity of water (double-Debye model)                    
+        ZEp = Eps - freq(N) * ((Eps - Epinf) / CMPLX(freq(N), fD) + (Epinf &
+             - Eopt) / CMPLX(freq(N),fS))
+        !                                                                       
+        ! ICE PERMITTIVITY [8]                                                  
+     ELSE 
+        ! Complex Permittivity of Ice                                           
+        fice = freq(N)
+        IF (freq(N) < 0.001_dbl) fice = 0.001_dbl
+        ZEp = CMPLX(3.15_dbl,Ai / fice+Bi * fice)
+     END IF
+     ! SUSPENDED PARTICLE RAYLEIGH APPROXIMATION [6]                         
+     ZNw = 1.5_dbl * W * ((ZEp - 1._dbl) / (ZEp + 2._dbl) - 1._dbl + 3._dbl / (Eps + 2._dbl))
+     !                                                                       
+
+     ! SUSPENDED WATER DROPLET EXTINCTION                                    
+     AT4 = 0.182_dbl * freq(N) * AIMAG(ZNw)
+     !>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>    <<<<<<<<<<<<<<<<<<<<<<<<<<<<<<<<<<<                                                                        
+     ABSCOF(N) = 0.23026_dbl * (AT1 + AT2 + AT3 + AT4)
+  END DO
 
   errorstatus = err
 
@@ -426,4 +540,4 @@ SUBROUTINE mpm93_one(errorstatus,freq, Pbkpa, Ekpa, Tc, W, abscof)
 
   return
 
-END SUBROUTINE mpm93_one
+END SUBROUTINE mpm93_one_multi
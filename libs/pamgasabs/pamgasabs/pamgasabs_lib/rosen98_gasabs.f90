@@ -59,6 +59,99 @@ subroutine rosen98_gasabs &
 
 end subroutine rosen98_gasabs
 
+subroutine rosen98_gasabs_multi &
+   (errorstatus, & ! out
+    nLayer, & !in
+    nFreq, & !in
+    freq, & ! in
+    tempK, & ! in
+    rhoWv, & ! in
+    pres, & ! in
+    absAir, & ! out
+    absWv) ! out
+!f2py threadsafe
+
+! Description:
+!  Same as rosen98_gasabs, but for nLayer atmospheric states and nFreq
+!  frequencies given separately. The frequency independent line strengths
+!  and widths are calculated only once per layer and reused for all
+!  frequencies.
+
+   use kinds, only:dbl, & ! integer parameter specifying double precision
+      long ! integer parameter specifying long integer
+   use gasabs_module ! functions for calculating absorption by gases
+   use report_module
+
+   implicit none
+
+   integer, intent(in) :: nLayer
+   integer, intent(in) :: nFreq
+
+   real(kind=dbl), dimension(nFreq), intent(in) :: freq ! frequency [GHz]
+   real(kind=dbl), dimension(nLayer), intent(in) :: tempK ! temperature [K]
+   real(kind=dbl), dimension(nLayer), intent(in) :: pres ! pressure [Pa]
+   real(kind=dbl), dimension(nLayer), intent(in) :: rhoWv ! water vapor density [kg/m**3]
+
+! Array arguments with intent(out):
+
+   real(kind=dbl), dimension(nLayer, nFreq), intent(out) :: absAir ! extinction by dry air [Np/km]
+   real(kind=dbl), dimension(nLayer, nFreq), intent(out) :: absWv ! extinction by water vapor [Np/km]
+
+   real(kind=dbl), dimension(nFreq) :: absO2
+   real(kind=dbl) :: pmb ! pressure [mb]
+   real(kind=dbl) :: vapden ! water vpor density [g/m**3]
+   integer :: nn, ff
+
+   integer(kind=long), intent(out) :: errorstatus
+   character(len=80) :: msg
+   character(len=20) :: nameOfRoutine = 'rosen98_gasabs_multi'
+
+   if (verbose >= 2) call report(info, 'Start of ', nameOfRoutine)
+
+   errorstatus = success
+
+   absAir(:, :) = 0.d0
+   absWv(:, :) = 0.d0
+
+   ! check for "reasonable" input values
+   if (any(freq <= 0.0_dbl) .or. any(freq > 800.0_dbl)) then
+      errorstatus = fatal
+      msg = 'Frequency not between 0 and 800 GHz in rosen98_gasabs!'
+      call report(errorstatus, msg, nameOfRoutine)
+      return
+   elseif (any(tempK <= 100.0_dbl)) then
+      errorstatus = fatal
+      msg = 'Temperature lower than 100 K in rosen98_gasabs!'
+      call report(errorstatus, msg, nameOfRoutine)
+      return
+   elseif (any(pres < 10.0_dbl) .or. any(pres > 1.2d5)) then
+      errorstatus = fatal
+      msg = 'Pressure not between 10 and 1.2d5 Pa in rosen98_gasabs!'
+      call report(errorstatus, msg, nameOfRoutine)
+      return
+   end if
+
+   do nn = 1, nLayer
+
+      ! convert pressure from Pa to Mb
+      pmb = pres(nn)/100.0_dbl
+
+      ! convert vapor density from kg/m**3 to g/m**3
+      vapden = rhoWv(nn)*1000.0_dbl
+
+      ! get volume extinction coefficients
+      call o2abs_multi(tempK(nn), pmb, vapden, nFreq, freq, absO2)
+      do ff = 1, nFreq
+         absAir(nn, ff) = absn2(tempK(nn), pmb, freq(ff)) + absO2(ff)
+      end do
+      call abh2o_multi(tempK(nn), pmb, vapden, nFreq, freq, absWv(nn, :))
+
+   end do
+
+   if (verbose >= 2) call report(info, 'End of ', nameOfRoutine)
+
+end subroutine rosen98_gasabs_multi
+
 subroutine rosen98_gasabs_one &
    (errorstatus, & ! out
     freq, & ! in
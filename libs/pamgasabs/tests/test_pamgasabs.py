@@ -51,3 +51,100 @@ def test_pamgasabs_vec_liebe93():
         verbosity=10)
 
     assert np.allclose(absair, np.array([1.52462334e-05, 1.10830357e-05]))
+
+
+def test_pamgasabs_lookup_table_rosenkranz98():
+
+    frequency = np.array([35e9, 94e9])
+    table = pamgasabs.GasAbsorptionLookupTable(frequency)
+
+    assert table.shape[0] == 2
+    assert np.all(table.estimate_error() < 0.02)
+
+    temperature = np.array([[300, 250, 210]])
+    waterVaporPressure = np.array([[2000, 50, 0.1]])
+    pressure = np.array([[100000, 50000, 20000]])
+
+    args = np.broadcast_arrays(
+        frequency[:, np.newaxis], temperature, waterVaporPressure, pressure)
+
+    reference = pamgasabs.calculate_gas_absorption_rosenkranz98(
+        *[arg.ravel() for arg in args], sumResults=True)
+    interpolated = table(*args)
+
+    assert interpolated.shape == (2, 3)
+    assert np.allclose(interpolated.ravel(), reference, rtol=0.02, atol=0)
+
+
+def test_pamgasabs_lookup_table_fallback():
+
+    table = pamgasabs.GasAbsorptionLookupTable(
+        [35e9], model='Liebe93')
+
+    # frequency not in table and temperature outside of table
+    frequency = np.array([94e9, 35e9])
+    temperature = np.array([300, 340])
+    waterVaporPressure = np.array([138.45, 138.45])
+    pressure = np.array([1000*100, 1000*100])
+
+    reference = pamgasabs.calculate_gas_absorption_liebe93(
+        frequency, temperature, waterVaporPressure, pressure)
+
+    assert np.allclose(
+        table(frequency, temperature, waterVaporPressure, pressure),
+        reference)
+
+
+def test_pamgasabs_multi_frequency_rosenkranz98():
+
+    frequency = np.array([22.235e9, 35e9, 94e9, 183e9])
+    temperature = np.array([[300, 250, 210], [280, 270, 260]])
+    waterVaporPressure = np.array([[2000, 50, 0], [1000, 500, 100]])
+    pressure = np.array([[100000, 50000, 20000], [95000, 90000, 85000]])
+
+    absair, abswv = \
+        pamgasabs.calculate_gas_absorption_rosenkranz98_multi_frequency(
+            frequency, temperature, waterVaporPressure, pressure)
+
+    assert absair.shape == (2, 3, 4)
+    assert abswv.shape == (2, 3, 4)
+
+    # values of calculate_gas_absorption_rosenkranz98 before it used the
+    # multi frequency kernels
+    assert np.allclose(absair, np.array([
+        [[2.59182353e-06, 6.21330694e-06, 6.24220938e-06, 2.74105373e-06],
+         [1.10743718e-06, 2.67060220e-06, 2.93370811e-06, 1.37071761e-06],
+         [2.91161359e-07, 7.05408038e-07, 8.29483570e-07, 4.14512499e-07]],
+        [[2.87221355e-06, 6.90562686e-06, 7.20530971e-06, 3.23270387e-06],
+         [2.87147525e-06, 6.91223409e-06, 7.33901285e-06, 3.33087730e-06],
+         [2.86218407e-06, 6.89755575e-06, 7.44808035e-06, 3.42286010e-06]],
+    ]))
+    assert np.allclose(abswv, np.array([
+        [[7.97375435e-05, 3.14609500e-05, 1.70338967e-04, 1.19155265e-02],
+         [4.24782447e-06, 5.13365081e-07, 2.76818670e-06, 8.84118084e-04],
+         [0, 0, 0, 0]],
+        [[4.49555709e-05, 1.68395014e-05, 9.18316984e-05, 7.49353813e-03],
+         [2.42580703e-05, 8.20745065e-06, 4.44661837e-05, 4.32434683e-03],
+         [5.22029146e-06, 1.56177009e-06, 8.34305301e-06, 1.00138370e-03]],
+    ]))
+
+
+def test_pamgasabs_multi_frequency_liebe93():
+
+    frequency = np.array([22.235e9, 35e9, 94e9, 183e9])
+    temperature = np.array([300, 250, 210])
+    waterVaporPressure = np.array([2000, 50, 0])
+    pressure = np.array([100000, 50000, 20000])
+
+    atmoAbs = pamgasabs.calculate_gas_absorption_liebe93_multi_frequency(
+        frequency, temperature, waterVaporPressure, pressure)
+
+    assert atmoAbs.shape == (3, 4)
+
+    # values of calculate_gas_absorption_liebe93 before it used the multi
+    # frequency kernels
+    assert np.allclose(atmoAbs, np.array([
+        [8.29465637e-05, 4.17973634e-05, 1.99663651e-04, 1.18379849e-02],
+        [5.38001115e-06, 3.33870085e-06, 5.99692939e-06, 8.78644481e-04],
+        [2.94515592e-07, 7.06708584e-07, 6.55653463e-07, 4.17847170e-07],
+    ]))
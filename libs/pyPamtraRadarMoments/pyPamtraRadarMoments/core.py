@@ -12,6 +12,38 @@ from . import pyPamtraRadarMomentsLib
 __version__ = '0.1'
 
 
+def setNumThreads(nThreads=0):
+    """
+    Set the number of OpenMP threads of the loops over heights in
+    calc_hildebrandSekhon and calc_radarMoments.
+
+    Parameters
+    ----------
+
+    nThreads : int, optional
+        number of threads. 0 means the OpenMP default, i.e. OMP_NUM_THREADS
+        or all cores (default 0)
+
+    """
+    assert nThreads >= 0
+    pyPamtraRadarMomentsLib.parallel_module.n_threads = nThreads
+
+
+def getNumThreads():
+    """
+    Number of OpenMP threads of the loops over heights, 1 if the library is
+    compiled without OpenMP.
+
+    Returns
+    -------
+
+    nThreads : int
+        number of threads
+
+    """
+    return int(pyPamtraRadarMomentsLib.parallel_module.query_num_threads())
+
+
 def calc_hildebrandSekhon(spectrum, radarNAve=1, verbosity=0):
     """
     Calculate the mean and maximum of noise of the linear radar spectrum
@@ -24,6 +24,7 @@ contains
 
       use kinds
       use report_module
+      use parallel_module, only:get_num_threads
       implicit none
 
       integer, intent(in) :: radar_nfft, radar_nPeaks, n_heights
@@ -46,7 +47,7 @@ contains
       integer :: hh
 
       integer(kind=long), intent(out) :: errorstatus
-      integer(kind=long) :: err
+      integer(kind=long) :: err, err_one
       character(len=80) :: msg
       character(len=19) :: nameOfRoutine = 'calc_moments_column'
 
@@ -58,6 +59,8 @@ contains
       slope(:, :, :) = -9999.d0
       quality(:) = 0
 
+      !$omp parallel do default(shared) private(hh, err_one) &
+      !$omp reduction(max:err) schedule(dynamic) num_threads(get_num_threads())
       do hh = 1, n_heights
 
          if (ANY(ISNAN(radar_spectrum_in(hh, :))) .or. ALL(radar_spectrum_in(hh, :) == 0.d0)) then
@@ -69,7 +72,7 @@ contains
          end if
 
          call calc_moments_one( &
-            errorstatus, &
+            err_one, &
             radar_nfft, &
             radar_nPeaks, &
             radar_spectrum_in(hh, :), &
@@ -86,14 +89,19 @@ contains
             slope(hh, :, :), &
             edge(hh, :, :), &
             quality(hh))
-         if (err /= 0) then
-            msg = 'error in calc_moments_one!'
-            call report(err, msg, nameOfRoutine)
-            errorstatus = err
-            return
-         end if
+         err = max(err, err_one)
 
       end do
+      !$omp end parallel do
+
+      if (err /= 0) then
+         msg = 'error in calc_moments_one!'
+         call report(err, msg, nameOfRoutine)
+         errorstatus = err
+         return
+      end if
+
+      errorstatus = err
       if (verbose >= 2) call report(info, 'End of ', nameOfRoutine)
 
    end subroutine calc_moments_column
@@ -170,6 +178,7 @@ contains
 
       integer(kind=long), intent(out) :: errorstatus
       integer(kind=long) :: err = 0
+      !$omp threadprivate(err)
       character(len=80) :: msg
       character(len=16) :: nameOfRoutine = 'calc_moments_one'
 
@@ -67,6 +67,7 @@ SUBROUTINE DSORT (errorstatus,DX, DY, N, KFLAG)
     
     integer(kind=long), intent(out) :: errorstatus
     integer(kind=long) :: err = 0
+    !$omp threadprivate(err)
     character(len=80) :: msg
     character(len=14) :: nameOfRoutine = 'dsort'
 
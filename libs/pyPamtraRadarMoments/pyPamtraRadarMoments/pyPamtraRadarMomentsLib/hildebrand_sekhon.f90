@@ -42,6 +42,7 @@ subroutine hildebrand_sekhon( &
    use kinds
 !  use settings, only: verbose
    use report_module
+   use parallel_module, only:get_num_threads
    implicit none
 
    integer, intent(in) :: n_ave, n_ffts, n_heights
@@ -54,7 +55,7 @@ subroutine hildebrand_sekhon( &
    integer :: n, i, numNs, h
 
    integer(kind=long), intent(out) :: errorstatus
-   integer(kind=long) :: err = 0
+   integer(kind=long) :: err, err_one
    character(len=80) :: msg
    character(len=17) :: nameOfRoutine = 'hildebrand_sekhon'
 
@@ -69,16 +70,19 @@ subroutine hildebrand_sekhon( &
    end interface
 
    if (verbose >= 2) call report(info, 'Start of ', nameOfRoutine)
+   err = 0
 
+   !$omp parallel do default(shared) &
+   !$omp private(h, i, n, numNs, sumLi, sumSq, sumNs, maxNs, dummy, a1, a3, &
+   !$omp         spectrum_sorted, err_one) &
+   !$omp reduction(max:err) schedule(dynamic) num_threads(get_num_threads())
    do h = 1, n_heights
       spectrum_sorted = spectrum(h, :)
       dummy = 0.d0
-      call dsort(err, spectrum_sorted, dummy, n_ffts, 1)
-      if (err /= 0) then
-         msg = 'error in dsort!'
-         call report(err, msg, nameOfRoutine)
-         errorstatus = err
-         stop !return
+      call dsort(err_one, spectrum_sorted, dummy, n_ffts, 1)
+      if (err_one /= 0) then
+         err = max(err, err_one)
+         CYCLE
       end if
 
       if (verbose >= 10) print *, "hildebrand spectrum_sorted", h, spectrum_sorted
@@ -115,6 +119,14 @@ subroutine hildebrand_sekhon( &
 
       if (verbose >= 5) print *, "hildebrand found", h, noise_mean(h), noise_max(h)
    end do
+   !$omp end parallel do
+
+   if (err /= 0) then
+      msg = 'error in dsort!'
+      call report(err, msg, nameOfRoutine)
+      errorstatus = err
+      return
+   end if
 
    errorstatus = err
    if (verbose >= 2) call report(info, 'End of ', nameOfRoutine)
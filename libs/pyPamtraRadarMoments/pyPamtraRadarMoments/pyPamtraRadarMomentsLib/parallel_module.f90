@@ -0,0 +1,35 @@
+module parallel_module
+   ! Description:
+   ! Number of OpenMP threads used for the loops over heights. The loops
+   ! run serially if the library is compiled without OpenMP.
+   !
+   ! History:
+   ! Version   Date     Comment
+   ! -------   ----     -------
+   !  0.1   19/10/2026    creation of file
+
+   implicit none
+   ! 0 means the OpenMP default, i.e. OMP_NUM_THREADS or all cores
+   integer :: n_threads = 0
+
+contains
+   function get_num_threads()
+      ! returns the number of threads used for the next parallel loop
+!$    use omp_lib, only:omp_get_max_threads
+      implicit none
+      integer :: get_num_threads
+
+      get_num_threads = 1
+!$    get_num_threads = omp_get_max_threads()
+      if (n_threads > 0) get_num_threads = n_threads
+   end function get_num_threads
+
+   subroutine query_num_threads(num_threads)
+      ! get_num_threads for python
+      implicit none
+      integer, intent(out) :: num_threads
+
+      num_threads = get_num_threads()
+   end subroutine query_num_threads
+
+end module parallel_module
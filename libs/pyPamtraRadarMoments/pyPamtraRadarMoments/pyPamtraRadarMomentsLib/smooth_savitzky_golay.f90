@@ -56,6 +56,7 @@ SUBROUTINE SMOOTH_SAVITZKY_GOLAY(errorstatus, dataIn, length, use_fft, dataOut)
 
    integer(kind=long), intent(out) :: errorstatus
    integer(kind=long) :: err = 0
+   !$omp threadprivate(err)
    character(len=80) :: msg
    character(len=21) :: nameOfRoutine = 'SMOOTH_SAVITZKY_GOLAY'
 
@@ -4,11 +4,48 @@
 from __future__ import absolute_import, division, print_function
 
 import numpy as np
+import scipy.signal
 
 from . import pyPamtraRadarSimulatorLib as rsLib
 
 __version__ = '0.1'
 
+NOISE_ENGINES = ['exponential', 'gamma']
+
+# bins of the noise free spectrum smaller than this fraction of its maximum
+# do not belong to the peak, see calcNoiseFreeMoments
+NOISE_FREE_PEAK_THRESHOLD = 1e-10
+
+# value of heights which could not be simulated
+MISSING_VALUE = -9999.
+
+
+def setNumThreads(nThreads=0):
+    """Set the number of OpenMP threads of the loops over heights in
+    createRadarSpectrum and simulateRadarSpectrum. The results do not
+    depend on the number of threads.
+
+    Parameters
+    ----------
+    nThreads : int
+        number of threads. 0 means the OpenMP default, i.e. OMP_NUM_THREADS
+        or all cores (Default value = 0)
+    """
+    assert nThreads >= 0
+    rsLib.parallel_module.n_threads = nThreads
+
+
+def getNumThreads():
+    """Number of OpenMP threads of the loops over heights, 1 if the
+    library is compiled without OpenMP.
+
+    Returns
+    -------
+    nThreads : int
+        number of threads
+    """
+    return int(rsLib.parallel_module.query_num_threads())
+
 
 def radarSimulator(
     diameterSpec,
@@ -37,7 +74,8 @@ def radarSimulator(
     radarBeamwidthDeg=0.2,
     radarIntegrationTime=60,
     seed=0,
-    verbosity=0
+    verbosity=0,
+    radarNoiseEngine='exponential',
 ):
     """Convert a spectrum of hydrometeor backscattering (per hydrometeor)
     as a function of size into a merged spectrum as a function of velocity.
@@ -102,6 +140,9 @@ def radarSimulator(
         generated (Default value = 0)
     verbosity :
         Fortran verbosity level (Default value = 0)
+    radarNoiseEngine : {'exponential', 'gamma'}
+        Noise engine, see simulateRadarSpectrum (Default value =
+        'exponential')
 
     Returns
     -------
@@ -158,6 +199,7 @@ def radarSimulator(
         radarIntegrationTime=radarIntegrationTime,
         seed=seed,
         verbosity=verbosity,
+        radarNoiseEngine=radarNoiseEngine,
     )
 
     return radar_spectrum
@@ -328,9 +370,21 @@ def simulateRadarSpectrum(
     radarBeamwidthDeg=0.2,
     radarIntegrationTime=60,
     seed=0,
-    verbosity=0
+    verbosity=0,
+    radarNoiseEngine='exponential',
 ):
-    """
+    """Add turbulence, noise and attenuation to the idealized radar spectrum
+    and simulate the averaging of radarNAve spectra.
+
+    The noise of a single spectrum is exponentially distributed, so the
+    average of radarNAve spectra follows a gamma distribution with shape
+    radarNAve and scale mean/radarNAve (i.e. a scaled chi-square
+    distribution with 2*radarNAve degrees of freedom). The 'exponential'
+    noise engine draws radarNAve*radarNFFT random numbers per height in
+    Fortran and averages them. The 'gamma' engine samples the averaged
+    spectrum directly from the gamma distribution, which requires
+    radarNAve times fewer random numbers with the same statistics, but
+    not the same realizations.
 
     Parameters
     ----------
@@ -366,16 +420,23 @@ def simulateRadarSpectrum(
         radar full beam width 2-way 6dB drop (Default value = 0.2)
     radarIntegrationTime :
         radar integration time (Default value = 60)
-    seed :
-        Seed of the random number generator. 0 means the seed is randomly
-        generated (Default value = 0)
+    seed : int or array_like
+        Seed of the random number generator, for all heights or for every
+        height. 0 means the seed is randomly generated. The random numbers
+        of a height depend on its seed and on its number among the heights
+        with the same seed, so heights with different seeds can be simulated
+        in a single call (Default value = 0)
     verbosity :
         Fortran verbosity level (Default value = 0)
+    radarNoiseEngine : {'exponential', 'gamma'}
+        'exponential' averages radarNAve noisy spectra, 'gamma' samples
+        the averaged spectrum directly (Default value = 'exponential')
 
 
     Returns
     -------
-
+    radar_spectrum : array_like
+        Simulated radar spectrum in mm6/m3/(m/s).
     """
 
     assert np.all(height > -420) # altitude Dead Sea
@@ -394,15 +455,14 @@ def simulateRadarSpectrum(
     assert radarNAve >= 0
     assert radarBeamwidthDeg > 0
     assert radarIntegrationTime >= 0
-    assert seed >= 0
+    seed = np.broadcast_to(
+        np.asarray(seed, dtype=int), mergedParticleSpec.shape[:1])
+    assert np.all(seed >= 0)
     assert verbosity >= 0
+    assert radarNoiseEngine in NOISE_ENGINES
 
     rsLib.report_module.verbose = verbosity
 
-    # In case we are using a fixed seed, make sure we start the beginning
-    # again.
-    rsLib.random_module.counter = 0
-
     # estimate noise from value at 1 km:
     radarPNnoise = 10**(0.1 * radarPNoise1000) * (height / 1000.)**2
 
@@ -421,6 +481,19 @@ def simulateRadarSpectrum(
         raise RuntimeError(
             'Error in Fortran routine radar_spectral_broadening')
 
+    skip = (
+        np.any(np.isnan(mergedParticleSpec), axis=-1) |
+        np.isnan(spectralBroadening) |
+        np.isnan(pathIntegratedAttenuation)
+    )
+    gate = _gateNumbers(seed, skip)
+
+    if radarNoiseEngine == 'gamma':
+        # 0 means infinite averages, i.e. no noise is added in Fortran
+        fortranNAve = 0
+    else:
+        fortranNAve = radarNAve
+
     error, radar_spectrum = rsLib.radar_simulator.simulate_radar(
         wavelength,
         mergedParticleSpec,
@@ -430,17 +503,283 @@ def simulateRadarSpectrum(
         radarMaxV,
         radarMinV,
         radarNFFT,
-        radarNAve,
+        fortranNAve,
         radarAliasingNyquistInterv,
         radarK2,
         seed,
+        gate,
     )
     if error > 0:
         raise RuntimeError('Error in Fortran routine simulate_radar')
 
+    if (radarNoiseEngine == 'gamma') and (radarNAve > 0):
+        radar_spectrum = _addGammaNoise(radar_spectrum, radarNAve, seed)
+
     return radar_spectrum
 
 
+def _gateNumbers(seed, skip):
+    """Number of every height among the heights with the same seed,
+    counting only heights which are not skipped.
+
+    Parameters
+    ----------
+    seed : array_like
+        seed of every height
+    skip : array_like
+        True for heights which are not simulated
+
+    Returns
+    -------
+    gate : array_like
+        gate number of every height, -1 for skipped heights
+    """
+    gate = np.full(seed.shape, -1, dtype=int)
+    for value in np.unique(seed):
+        this = (seed == value) & ~skip
+        gate[this] = np.arange(np.sum(this))
+    return gate
+
+
+def _addGammaNoise(spectrum, nAve, seed=0):
+    """Multiply spectrum with the noise of the average of nAve spectra.
+
+    The average of nAve exponentially distributed values with mean 1 is
+    gamma distributed with shape nAve and scale 1/nAve.
+
+    Parameters
+    ----------
+    spectrum : array_like
+        noise free spectrum. Heights with missing values (-9999) are kept.
+    nAve : int
+        number of averaged spectra
+    seed : int or array_like, optional
+        Seed of the random number generator, for all heights or for every
+        height. 0 means the seed is randomly generated (Default value = 0)
+
+    Returns
+    -------
+    spectrum : array_like
+        spectrum with noise
+    """
+    seed = np.broadcast_to(seed, spectrum.shape[:1])
+    noise = np.empty(spectrum.shape)
+    for value in np.unique(seed):
+        if value > 0:
+            rng = np.random.default_rng(value)
+        else:
+            rng = np.random.default_rng()
+        this = seed == value
+        noise[this] = rng.gamma(
+            nAve, 1. / nAve, size=(np.sum(this),) + spectrum.shape[1:])
+    return np.where(spectrum == MISSING_VALUE, spectrum, spectrum * noise)
+
+
+def calcNoiseFreeMoments(
+    height,
+    eddyDissipationRate,
+    horizontalWind,
+    mergedParticleSpec,
+    pathIntegratedAttenuation,
+    wavelength,
+    radarMaxV=7.885,
+    radarMinV=-7.885,
+    radarAliasingNyquistInterv=1,
+    radarNFFT=256,
+    radarBeamwidthDeg=0.2,
+    radarIntegrationTime=60,
+    momentsReceiverMiscalibration=0,
+    verbosity=0,
+):
+    """Noise free moments of the idealized radar spectrum.
+
+    The moments are calculated analytically from the idealized spectrum
+    instead of simulating and analyzing a noisy spectrum. The spectral
+    broadening due to turbulence and horizontal wind is a convolution with
+    a Gaussian, i.e. its variance is added to the variance of the
+    idealized spectrum, the third central moment is not changed and the
+    fourth central moment m4 becomes m4 + 6 m2 s**2 + 3 s**4. The complete
+    spectrum is treated as a single peak. If the broadened spectrum lies
+    within a single Nyquist interval, the mean Doppler velocity is folded
+    into the Nyquist range.
+
+    Only spectra crossing a Nyquist limit are broadened numerically and
+    folded like in the simulator. Their moments are calculated for the
+    contiguous range around the maximum larger than
+    NOISE_FREE_PEAK_THRESHOLD times the maximum. As for the noisy
+    spectrum, the peak is not continued across the Nyquist limits, so parts
+    of the peak folded to the other end of the spectrum are not included.
+
+    Parameters
+    ----------
+    height :
+        altitude in m
+    eddyDissipationRate :
+        eddy dissipation rate in  m^(2/3) s^(-1)
+    horizontalWind :
+        horizontal wind in m/s
+    mergedParticleSpec :
+        idealized radar spectrum in mm6/m3. Sum for all hydrometeors.
+        Shape (height, radarNFFT * (1 + 2 * radarAliasingNyquistInterv))
+    pathIntegratedAttenuation :
+        path integrated attenuation in dB
+    wavelength :
+        wavelength in m
+    radarMaxV :
+        maximum radar nyquist velocity in m/s (Default value = 7.885)
+    radarMinV :
+        minimum radar nyquist velocity in m/s (Default value = -7.885)
+    radarAliasingNyquistInterv :
+        defines how often the spectrum is folded to consider aliasing
+        (Default value = 1)
+    radarNFFT :
+        bins of the radar spectrum (Default value = 256)
+    radarBeamwidthDeg :
+        radar full beam width 2-way 6dB drop (Default value = 0.2)
+    radarIntegrationTime :
+        radar integration time (Default value = 60)
+    momentsReceiverMiscalibration :
+        simulate a wrong radar receiver calibration [dB] (Default value = 0)
+    verbosity :
+        Fortran verbosity level (Default value = 0)
+
+    Returns
+    -------
+    Ze : array_like
+        reflectivity in mm6/m3, NaN if there is no signal
+    meanDopplerVel : array_like
+        mean Doppler velocity in m/s
+    spectrumWidth : array_like
+        spectrum width in m/s
+    skewness : array_like
+        skewness
+    kurtosis : array_like
+        kurtosis
+    """
+    mergedParticleSpec = np.asarray(mergedParticleSpec)
+
+    assert np.ndim(mergedParticleSpec) == 2
+    assert np.all(mergedParticleSpec[~np.isnan(mergedParticleSpec)] >= 0)
+    assert radarMaxV > radarMinV
+    assert radarAliasingNyquistInterv >= 0
+    assert mergedParticleSpec.shape[1] == radarNFFT * (
+        1 + 2 * radarAliasingNyquistInterv)
+
+    spectralBroadening = calcSpectralBroadening(
+        np.asarray(eddyDissipationRate, dtype=float),
+        np.asarray(horizontalWind, dtype=float),
+        np.asarray(height, dtype=float),
+        np.asarray(wavelength, dtype=float),
+        radarBeamwidthDeg=radarBeamwidthDeg,
+        radarIntegrationTime=radarIntegrationTime,
+        verbosity=verbosity,
+    )
+
+    delV = (radarMaxV - radarMinV) / radarNFFT
+    nyquistRange = radarMaxV - radarMinV
+    minVAliased = radarMinV - radarAliasingNyquistInterv * nyquistRange
+    velocity = np.arange(mergedParticleSpec.shape[1]) * delV + minVAliased
+
+    power, meanDopplerVel, m2, m3, m4 = _spectrumMoments(
+        mergedParticleSpec, velocity)
+    with np.errstate(invalid='ignore'):
+        s2 = spectralBroadening**2
+        m4 = m4 + 6 * m2 * s2 + 3 * s2**2
+        m2 = m2 + s2
+
+        # velocities covered by the broadened spectrum. Beyond tail, the
+        # Gaussian is smaller than NOISE_FREE_PEAK_THRESHOLD times its
+        # maximum.
+        tail = np.sqrt(-2 * np.log(NOISE_FREE_PEAK_THRESHOLD)) * \
+            spectralBroadening
+        occupied = mergedParticleSpec > 0
+        lowest = np.min(np.where(occupied, velocity, np.inf), axis=-1) - tail
+        highest = np.max(
+            np.where(occupied, velocity, -np.inf), axis=-1) + tail
+        interval = np.floor((lowest - radarMinV) / nyquistRange)
+        folded = interval == np.floor((highest - radarMinV) / nyquistRange)
+
+    # spectra within a single Nyquist interval are folded as a whole
+    meanDopplerVel = np.where(
+        folded, meanDopplerVel - interval * nyquistRange, meanDopplerVel)
+
+    # spectra crossing a Nyquist limit are broadened and folded like in the
+    # simulator
+    crossing = ~folded & np.isfinite(lowest) & np.isfinite(highest) & \
+        np.isfinite(power)
+    if np.any(crossing):
+        spectrum = _foldedNoiseFreePeak(
+            mergedParticleSpec[crossing],
+            spectralBroadening[crossing],
+            velocity,
+            radarNFFT,
+            radarAliasingNyquistInterv,
+        )
+        (power[crossing], meanDopplerVel[crossing], m2[crossing],
+         m3[crossing], m4[crossing]) = _spectrumMoments(
+            spectrum, velocity[:radarNFFT] +
+            radarAliasingNyquistInterv * nyquistRange)
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        Ze = power * delV * 1e18
+        Ze = Ze / 10**(0.1 * (pathIntegratedAttenuation -
+                              momentsReceiverMiscalibration))
+        spectrumWidth = np.sqrt(m2)
+        skewness = m3 / m2**1.5
+        kurtosis = m4 / m2**2
+
+    Ze = np.where(Ze > 0, Ze, np.nan)
+    return Ze, meanDopplerVel, spectrumWidth, skewness, kurtosis
+
+
+def _spectrumMoments(spectrum, velocity):
+    """Sum, mean and central moments 2 to 4 of spectra along the last
+    axis."""
+    with np.errstate(divide='ignore', invalid='ignore'):
+        power = np.sum(spectrum, axis=-1)
+        weights = spectrum / power[:, np.newaxis]
+        mean = np.sum(weights * velocity, axis=-1)
+        deviation = velocity - mean[:, np.newaxis]
+        m2 = np.sum(weights * deviation**2, axis=-1)
+        m3 = np.sum(weights * deviation**3, axis=-1)
+        m4 = np.sum(weights * deviation**4, axis=-1)
+    return power, mean, m2, m3, m4
+
+
+def _foldedNoiseFreePeak(spectrum, spectralBroadening, velocityAliased,
+                         radarNFFT, radarAliasingNyquistInterv):
+    """Broaden and fold the idealized spectrum like simulate_radar_one and
+    keep only the peak, the contiguous range around the maximum larger
+    than NOISE_FREE_PEAK_THRESHOLD times the maximum. Like the moments
+    estimator, the peak is not continued across the Nyquist limits."""
+    nAliased = spectrum.shape[1]
+    spectrum = spectrum.copy()
+
+    # convolution with a Gaussian defined on the aliased velocities,
+    # normalized to unity area
+    with np.errstate(divide='ignore', invalid='ignore'):
+        turb = np.exp(-velocityAliased**2 / (
+            2 * spectralBroadening[:, np.newaxis]**2))
+        turb = turb / np.sum(turb, axis=-1, keepdims=True)
+    broaden = (spectralBroadening > 0) & (np.sum(turb, axis=-1) > 0)
+    if np.any(broaden):
+        turbSpectrum = scipy.signal.fftconvolve(
+            spectrum[broaden], turb[broaden], axes=-1)
+        turbSpectrum = turbSpectrum[:, nAliased // 2:nAliased // 2 + nAliased]
+        spectrum[broaden] = np.where(turbSpectrum > 0, turbSpectrum, 0)
+
+    spectrum = spectrum.reshape(
+        (spectrum.shape[0], 1 + 2 * radarAliasingNyquistInterv, radarNFFT)
+    ).sum(axis=1)
+
+    signal = spectrum > NOISE_FREE_PEAK_THRESHOLD * np.max(
+        spectrum, axis=-1, keepdims=True)
+    runs = np.cumsum(~signal, axis=-1)
+    peakRun = np.take_along_axis(
+        runs, np.argmax(spectrum, axis=-1)[:, np.newaxis], axis=-1)
+    return np.where(signal & (runs == peakRun), spectrum, 0)
+
+
 def calcSpectralBroadening(
     eddyDissipationRate,
     horizontalWind,
@@ -96,7 +96,7 @@ subroutine convolutionFFT(Xin, M, Ain, N, Yout)
 
 !!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!
    double complex, allocatable :: R1F(:), R2F(:), RFF(:) ! intermidiate stage
-   integer*8 plan ! We always need a plan!
+   integer*8 plan1, plan2, planF ! We always need a plan!
 !!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!
 
    !increase input to same length
@@ -115,15 +115,24 @@ subroutine convolutionFFT(Xin, M, Ain, N, Yout)
 
 !!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!
 
-   call dfftw_plan_dft_r2c_1d(plan, MNext, R1, R1F, FFTW_ESTIMATE)
-   call dfftw_execute_dft_r2c(plan, R1, R1F)
+   ! Only the execution of plans is thread safe in FFTW, the planner is not.
+   !$omp critical (fftw_planner)
+   call dfftw_plan_dft_r2c_1d(plan1, MNext, R1, R1F, FFTW_ESTIMATE)
+   call dfftw_plan_dft_r2c_1d(plan2, MNext, R2, R2F, FFTW_ESTIMATE)
+   call dfftw_plan_dft_c2r_1d(planF, MNext, RFF, RF, FFTW_ESTIMATE)
+   !$omp end critical (fftw_planner)
 
-   call dfftw_plan_dft_r2c_1d(plan, MNext, R2, R2F, FFTW_ESTIMATE)
-   call dfftw_execute_dft_r2c(plan, R2, R2F)
+   call dfftw_execute_dft_r2c(plan1, R1, R1F)
+   call dfftw_execute_dft_r2c(plan2, R2, R2F)
 
    RFF = R1F*R2F ! complex vector arithmetics is cool and super efficient  !!
-   call dfftw_plan_dft_c2r_1d(plan, MNext, RFF, RF, FFTW_ESTIMATE)
-   call dfftw_execute_dft_c2r(plan, RFF, RF)
+   call dfftw_execute_dft_c2r(planF, RFF, RF)
+
+   !$omp critical (fftw_planner)
+   call dfftw_destroy_plan(plan1)
+   call dfftw_destroy_plan(plan2)
+   call dfftw_destroy_plan(planF)
+   !$omp end critical (fftw_planner)
 
 !!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!
 ! I keep this version as a comment since it involves halfcomplex formatted
@@ -48,6 +48,7 @@ contains
 
       integer(kind=long), intent(out) :: errorstatus
       integer(kind=long) :: err = 0
+      !$omp threadprivate(err)
       character(len=80) :: msg
       character(len=36) :: nameOfRoutine = 'dia2vel_heymsfield10_particles_ms_as'
 
@@ -113,6 +114,7 @@ contains
 
       integer(kind=long), intent(out) :: errorstatus
       integer(kind=long) :: err = 0
+      !$omp threadprivate(err)
       character(len=80) :: msg
       character(len=33) :: nameOfRoutine = 'dia2vel_heymsfield10_particles'
 
@@ -182,6 +184,7 @@ contains
 
       integer(kind=long), intent(out) :: errorstatus
       integer(kind=long) :: err = 0
+      !$omp threadprivate(err)
       character(len=80) :: msg
       character(len=33) :: nameOfRoutine = 'dia2vel_khvorostyanov01_particles'
 
@@ -268,6 +271,7 @@ contains
 
       integer(kind=long), intent(out) :: errorstatus
       integer(kind=long) :: err = 0
+      !$omp threadprivate(err)
       character(len=80) :: msg
       character(len=31) :: nameOfRoutine = 'dia2vel_khvorostyanov01_spheres'
 
@@ -346,6 +350,7 @@ contains
 
       integer(kind=long), intent(out) :: errorstatus
       integer(kind=long) :: err = 0
+      !$omp threadprivate(err)
       character(len=80) :: msg
       character(len=29) :: nameOfRoutine = 'dia2vel_khvorostyanov01_drops'
 
@@ -429,6 +434,7 @@ contains
 
       integer(kind=long), intent(out) :: errorstatus
       integer(kind=long) :: err = 0
+      !$omp threadprivate(err)
       character(len=80) :: msg
       character(len=20) :: nameOfRoutine = 'dia2vel_foote69_rain'
 
@@ -499,6 +505,7 @@ contains
 
       integer(kind=long), intent(out) :: errorstatus
       integer(kind=long) :: err = 0
+      !$omp threadprivate(err)
       character(len=80) :: msg
       character(len=20) :: nameOfRoutine = 'dia2vel_pavlos_cloud'
 
@@ -544,6 +551,7 @@ contains
 
       integer(kind=long), intent(out) :: errorstatus
       integer(kind=long) :: err = 0
+      !$omp threadprivate(err)
       character(len=80) :: msg
       character(len=20) :: nameOfRoutine = 'dia2vel_metek_rain'
 
@@ -614,6 +622,7 @@ contains
 
       integer(kind=long), intent(out) :: errorstatus
       integer(kind=long) :: err = 0
+      !$omp threadprivate(err)
       character(len=80) :: msg
       character(len=20) :: nameOfRoutine = 'dia2vel_rogers_drops'
 
@@ -674,6 +683,7 @@ contains
 
       integer(kind=long), intent(out) :: errorstatus
       integer(kind=long) :: err = 0
+      !$omp threadprivate(err)
       character(len=80) :: msg
       character(len=22) :: nameOfRoutine = 'dia2vel_rogers_graupel'
 
@@ -716,6 +726,7 @@ contains
       real(kind=dbl) ::fallvel_A, fallvel_B
       integer(kind=long), intent(out) :: errorstatus
       integer(kind=long) :: err = 0
+      !$omp threadprivate(err)
       character(len=80) :: msg
       character(len=20) :: nameOfRoutine = 'dia2vel_power_law'
 
@@ -796,6 +807,7 @@ contains
 
       integer(kind=long), intent(out) :: errorstatus
       integer(kind=long) :: err = 0
+      !$omp threadprivate(err)
       character(len=80) :: msg
       character(len=27) :: nameOfRoutine = 'dia2vel_corrected_power_law'
 
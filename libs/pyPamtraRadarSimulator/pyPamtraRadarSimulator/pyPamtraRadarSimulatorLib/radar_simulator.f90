@@ -17,6 +17,7 @@ contains
       radar_aliasing_nyquist_interv, & !in
       radar_K2, & !in
       seed, & !in
+      gate, & !in
       noise_turb_spectra & !out
       )
       ! This routine takes the backscattering spectrum depending on Doppler velocity,
@@ -25,10 +26,15 @@ contains
       ! based on Spectra_simulator by P. Kollias
       ! converted from Matlab to Fortran by M. Maahn (2012)
       !
+      ! seed and gate are given for every height. The random numbers of a
+      ! height depend only on its seed and gate, so the results do not depend
+      ! on the number of threads. Heights with negative gate are skipped.
+      !
 
       use kinds
       use constants
       use report_module
+      use parallel_module, only:get_num_threads
       implicit none
 
       real(kind=dbl), intent(in) ::  wavelength !heigth of layer in m
@@ -44,13 +50,14 @@ contains
       integer, intent(in) ::  radar_aliasing_nyquist_interv
       integer, intent(in) ::  radar_no_Ave
       real(kind=dbl), intent(in) :: radar_K2
-      integer, intent(in) ::  seed
+      integer, dimension(n_heights), intent(in) ::  seed
+      integer, dimension(n_heights), intent(in) ::  gate
       real(kind=dbl), dimension(n_heights, radar_nfft), intent(out):: noise_turb_spectra
 
       integer :: hh
 
       integer(kind=long), intent(out) :: errorstatus
-      integer(kind=long) :: err
+      integer(kind=long) :: err, err_one
       character(len=80) :: msg
       character(len=15) :: nameOfRoutine = 'radar_simulator'
 
@@ -59,15 +66,17 @@ contains
 
       noise_turb_spectra(:, :) = -9999.d0
 
+      !$omp parallel do default(shared) private(hh, err_one) &
+      !$omp reduction(max:err) schedule(dynamic) num_threads(get_num_threads())
       do hh = 1, n_heights
 
-         if (ANY(ISNAN(particle_spectrum(hh, :))) .or. ISNAN(spectral_broadening(hh)) .or. ISNAN(PIA(hh))) then
-            if (verbose >= 2) print *, 'skipping due to NAN', hh
+         if (gate(hh) < 0) then
+            if (verbose >= 2) print *, 'skipping', hh
             CYCLE
          end if
 
          call simulate_radar_one( &
-            errorstatus, &
+            err_one, &
             wavelength, &
             particle_spectrum(hh, :), &
             PIA(hh), &
@@ -80,18 +89,23 @@ contains
             radar_no_Ave, &
             radar_aliasing_nyquist_interv, &
             radar_K2, &
-            seed, &
+            seed(hh), &
+            gate(hh), &
             noise_turb_spectra(hh, :) &
             )
-
-         if (err /= 0) then
-            msg = 'error in simulate_radar_one!'
-            call report(err, msg, nameOfRoutine)
-            errorstatus = err
-            return
-         end if
+         err = max(err, err_one)
 
       end do
+      !$omp end parallel do
+
+      if (err /= 0) then
+         msg = 'error in simulate_radar_one!'
+         call report(err, msg, nameOfRoutine)
+         errorstatus = err
+         return
+      end if
+
+      errorstatus = err
       if (verbose >= 2) call report(info, 'End of ', nameOfRoutine)
 
    end subroutine simulate_radar
@@ -111,6 +125,7 @@ contains
       radar_aliasing_nyquist_interv, & !in
       radar_K2, & !in
       seed, & !in
+      gate, & !in
       noise_turb_spectra & !out
       )
       ! This routine takes the backscattering spectrum depending on Doppler velocity,
@@ -120,11 +135,12 @@ contains
       ! converted from Matlab to Fortran by M. Maahn (2012)
       !
       ! out is saved directly to vars_output module
+      ! gate is the number of the height used for the random numbers
 
       use kinds
       use constants
       use report_module
-      use random_module, only:get_random
+      use random_module, only:get_random_gate
 
       implicit none
 
@@ -141,6 +157,7 @@ contains
       integer, intent(in) ::  radar_no_Ave
       real(kind=dbl), intent(in) :: radar_K2
       integer, intent(in) ::  seed
+      integer, intent(in) ::  gate
       real(kind=dbl), dimension(radar_nfft), intent(out):: noise_turb_spectra ! in [mm⁶/m³/(m/s)]
 
 
@@ -148,8 +165,9 @@ contains
       real(kind=dbl), dimension(radar_nfft_aliased) :: particle_spectrum_att
       real(kind=dbl), dimension(radar_nfft_aliased) :: spectra_velo_aliased
       real(kind=dbl), dimension(radar_nfft_aliased):: turb
-      real(kind=dbl), dimension(radar_nfft*radar_no_Ave):: x_noise
-      real(kind=dbl), dimension(radar_no_Ave, radar_nfft):: noise_turb_spectra_tmp
+      ! allocatable to keep large arrays off the (thread) stack
+      real(kind=dbl), allocatable, dimension(:):: x_noise
+      real(kind=dbl), allocatable, dimension(:, :):: noise_turb_spectra_tmp
       real(kind=dbl), dimension(radar_nfft):: snr_turb_spectra, &
                                               spectra_velo, turb_spectra_aliased
       integer::quailty_aliasing
@@ -160,6 +178,7 @@ contains
       integer(kind=long) :: ii, tt, ts_imin, ts_imax, startI, stopI
       integer(kind=long), intent(out) :: errorstatus
       integer(kind=long) :: err = 0
+      !$omp threadprivate(err)
       character(len=80) :: msg
       character(len=19) :: nameOfRoutine = 'radar_simulator_one'
 
@@ -365,7 +384,8 @@ contains
    else
       !get noise.
       if (verbose > 2) print *, "get noise"
-      call get_random(err, radar_no_Ave*radar_nfft, seed, x_noise)
+      allocate (x_noise(radar_nfft*radar_no_Ave), noise_turb_spectra_tmp(radar_no_Ave, radar_nfft))
+      call get_random_gate(err, radar_no_Ave*radar_nfft, seed, gate, x_noise)
       if (err /= 0) then
          msg = 'error in random!'
          call report(err, msg, nameOfRoutine)
@@ -381,6 +401,7 @@ contains
       else
          noise_turb_spectra = SUM(noise_turb_spectra_tmp, DIM=1)/radar_no_Ave
       end if
+      deallocate (x_noise, noise_turb_spectra_tmp)
    end if
 
    !spetial output for testing the radar simulator
@@ -30,6 +30,7 @@ contains
       use kinds
       use constants
       use report_module
+      use parallel_module, only:get_num_threads
 
       implicit none
 
@@ -60,7 +61,7 @@ contains
       integer :: zz
 
       integer(kind=long), intent(out) :: errorstatus
-      integer(kind=long) :: err = 0
+      integer(kind=long) :: err, err_one
       character(len=80) :: msg
       character(len=18) :: nameOfRoutine = 'get_radar_spectrum'
 
@@ -94,6 +95,8 @@ contains
 
       particle_spec(:, :) = -9999.d0
 
+      !$omp parallel do default(shared) private(zz, err_one) &
+      !$omp reduction(max:err) schedule(dynamic) num_threads(get_num_threads())
       do zz = 1, n_heights
 
          if (ANY(ISNAN(diameter_spec(zz, :))) .or. &
@@ -107,7 +110,7 @@ contains
          end if
 
          call get_radar_spectrum_one( &
-            errorstatus, &
+            err_one, &
             nbins, & !in
             diameter_spec(zz, :), & !in
             spec_width(zz, :), &
@@ -130,15 +133,19 @@ contains
             particle_spec(zz, :), &
             vel_spec(zz, :)) !out
          !out
-
-         if (err /= 0) then
-            msg = 'error in get_radar_spectrum_one!'
-            call report(err, msg, nameOfRoutine)
-            errorstatus = err
-            return
-         end if
+         err = max(err, err_one)
 
       end do
+      !$omp end parallel do
+
+      if (err /= 0) then
+         msg = 'error in get_radar_spectrum_one!'
+         call report(err, msg, nameOfRoutine)
+         errorstatus = err
+         return
+      end if
+
+      errorstatus = err
       if (verbose >= 2) call report(info, 'End of ', nameOfRoutine)
 
    end subroutine get_radar_spectrum
@@ -244,6 +251,7 @@ contains
       integer :: ii, jj
       integer(kind=long), intent(out) :: errorstatus
       integer(kind=long) :: err = 0
+      !$omp threadprivate(err)
       character(len=80) :: msg
       character(len=22) :: nameOfRoutine = 'get_radar_spectrum_one'
 
@@ -29,6 +29,7 @@ contains
 
       integer(kind=long), intent(out) :: errorstatus
       integer(kind=long) :: err = 0
+      !$omp threadprivate(err)
       character(len=80) :: msg
       character(len=10) :: nameOfRoutine = 'get_random'
 
@@ -63,4 +64,51 @@ contains
       return
    end subroutine get_random
 
+   subroutine get_random_gate(errorstatus, n, seedval, gate, x_noise)
+      ! Description:
+      ! returns n random numbers like get_random, but uses gate instead of
+      ! the module counter. Can be called in parallel, each thread has its
+      ! own state of the random number generator.
+      !
+      ! History:
+      ! Version   Date     Comment
+      ! -------   ----     -------
+      !  0.1   19/10/2026    creation of subroutine
+
+      use report_module
+      use kinds
+      implicit none
+      integer, intent(in) :: n
+      integer, intent(in) :: seedval
+      integer, intent(in) :: gate
+      real(kind=dbl), intent(out), dimension(n) :: x_noise
+      integer :: i, m, clock
+      integer, dimension(:), allocatable :: seed
+
+      integer(kind=long), intent(out) :: errorstatus
+      character(len=15) :: nameOfRoutine = 'get_random_gate'
+
+      if (verbose >= 2) call report(info, 'Start of ', nameOfRoutine)
+      call random_seed(size=m)
+
+      allocate (seed(m))
+      if (seedval > 0) then
+         clock = seedval - 1 + gate ! minus one is for historical reasons
+      else if (seedval < 0) then
+         clock = seedval - 1 ! minus one is for historical reasons
+      else
+         call system_clock(count=clock)
+         clock = clock + gate
+      end if
+
+      seed = clock + 37*(/(i - 1, i=1, m)/)
+      call random_seed(put=seed)
+      deallocate (seed)
+      call RANDOM_NUMBER(x_noise)
+
+      errorstatus = 0
+      if (verbose >= 2) call report(info, 'End of ', nameOfRoutine)
+      return
+   end subroutine get_random_gate
+
 end module random_module
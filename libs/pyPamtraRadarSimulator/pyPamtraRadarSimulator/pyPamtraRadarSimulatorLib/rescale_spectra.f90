@@ -66,6 +66,7 @@ contains
 
       integer(kind=long), intent(out) :: errorstatus
       integer(kind=long) :: err = 0
+      !$omp threadprivate(err)
       character(len=80) :: msg
       character(len=15) :: nameOfRoutine = 'rescale_spectra'
 
@@ -214,6 +215,7 @@ contains
 
       integer(kind=long), intent(out) :: errorstatus
       integer(kind=long) :: err = 0
+      !$omp threadprivate(err)
       character(len=80) :: msg
       character(len=15) :: nameOfRoutine = 'average_spectra'
 
@@ -295,6 +297,7 @@ contains
 
       integer(kind=long), intent(out) :: errorstatus
       integer(kind=long) :: err = 0
+      !$omp threadprivate(err)
       character(len=80) :: msg
       character(len=19) :: nameOfRoutine = 'interpolate_spectra'
 
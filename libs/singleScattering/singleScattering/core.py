@@ -46,11 +46,16 @@ import numpy as np
 
 # Complementary library
 # Implemented with basic functionality
-from . import mie, rayleigh, tmatrix, ssrg, scatterer, scattering_utilities
+from . import mie, rayleigh, tmatrix, ssrg, scatterer, scattering_utilities, \
+    database
 
 models_list = ['Rayleigh (Ray)', 'Mie', 'Tmatrix (TMM)',
                'Self-Similar Rayleigh-Gans (SSRG)', 'LiuDB', 'LeinonenDB',
-               'AydinDB', 'HongDB', 'ChalmersDB', 'OpenSSP (KwoDB)']
+               'AydinDB', 'HongDB', 'ChalmersDB', 'OpenSSP (KwoDB)',
+               'Database (DB)']
+
+database_models = ['LiuDB', 'LeinonenDB', 'AydinDB', 'HongDB', 'ChalmersDB',
+                   'OpenSSP', 'KwoDB', 'Database', 'DB']
 
 
 def scattering(diameters,
@@ -80,6 +85,9 @@ def scattering(diameters,
         refractive_indices
     orientation : placeholder for orientation of the scatterer
     model : one of the model_list (might be substituted by the shortname in the parenthesis)
+        Database models require the keyword database (path to a store
+        created with database.create_database or a
+        database.ScatteringDatabase) and optionally temperature [K]
 
     **kwargs : additional arguments to be passed to the requested model
 
@@ -95,6 +103,7 @@ def scattering(diameters,
                of propagation
         Cbck : Radar backscattering cross section [meters**2]
                => 4*pi dCsca(pi)/dOmega
+        S : Complex amplitude matrix, None for database models
 
     Raises
     ------
@@ -123,21 +132,26 @@ def scattering(diameters,
         scatt = ssrg.SsrgScatt(diameters, frequencies, wavelengths,
                                refractive_indices, dielectric_permittivities,
                                **kwargs)
-    elif ((model == 'LiuDB')):
-        raise NotImplementedError(model+" capabilities will be soon added")
-    elif ((model == 'LeinonenDB')):
-        raise NotImplementedError(model+" capabilities will be soon added")
-    elif ((model == 'AydinDB')):
-        raise NotImplementedError(model+" capabilities will be soon added")
-    elif ((model == 'HongDB')):
-        raise NotImplementedError(model+" capabilities will be soon added")
-    elif ((model == 'ChalmersDB')):
-        raise NotImplementedError(model+" capabilities will be soon added")
-    elif ((model == 'OpenSSP') or (model == 'KwoDB')):
-        raise NotImplementedError(model+" capabilities will be soon added")
+    elif (model in database_models):
+        # the data of the databases is not shipped, it has to be ingested
+        # with database.create_database first
+        if 'database' not in kwargs.keys():
+            raise NotImplementedError(
+                model+" requires the keyword database with the path to a "
+                "store created with database.create_database")
+        if ((refractive_indices is not None) or
+                (dielectric_permittivities is not None)):
+            raise AttributeError('Dielectric properties are defined by '
+                                 'the database')
+        scatt = database.DatabaseScatt(diameters, frequencies, wavelengths,
+                                       **kwargs)
     else:
         raise AttributeError("I do not recognize the %s as a "
                              "valid substance I can only compute"
                              " dielectric properties of %s" % (
                                  model, models_list))
-    return scatt.Cext, scatt.Csca, scatt.Cabs, scatt.Cbck, scatt.S
+    if scatt.cross_sections_only:
+        S = None
+    else:
+        S = scatt.S
+    return scatt.Cext, scatt.Csca, scatt.Cabs, scatt.Cbck, S
@@ -0,0 +1,308 @@
+# -*- coding: utf-8 -*-
+""" singleScattering.database.py
+
+Generic scattering database backend and database scatterer object
+
+Tabulated scattering properties of particles (e.g. from the Liu, Leinonen,
+Aydin, Hong, Chalmers or OpenSSP databases) are ingested once with
+create_database into a compact binary store. The store consists of a data
+file with the records sorted by (frequency, temperature, diameter) and a
+small index with the start and end of every (frequency, temperature) block.
+The data file is memory mapped, so only the blocks required for a lookup
+are read from disk.
+
+Example
+-------
+    $ python
+    >>> from singleScattering import database
+    >>> database.create_database('liu_sector', frequency, temperature,
+    ...                          diameter, Cext, Csca, Cabs, Cbck)
+    >>> db = database.ScatteringDatabase('liu_sector')
+    >>> Cext, Csca, Cabs, Cbck = db.lookup(frequency, temperature, diameter)
+
+"""
+
+import os
+
+import numpy as np
+
+from .scatterer import Scatterer
+
+INDEX_FILE = 'index.npz'
+DATA_FILE = 'data.npy'
+
+# columns of the data file
+COLUMNS = ['diameter', 'Cext', 'Csca', 'Cabs', 'Cbck']
+
+
+def create_database(path, frequency, temperature, diameter, Cext, Csca,
+                    Cabs, Cbck, description=''):
+    """ Ingest tabulated scattering properties into a database store
+
+    The records do not need to be sorted and the diameters do not need to
+    be the same for all frequencies and temperatures.
+
+    Parameters
+    ----------
+    path : str
+        directory of the store, created if it does not exist
+    frequency : array_like
+        frequency of every record [Hz]
+    temperature : array_like
+        temperature of every record [K]
+    diameter : array_like
+        size of the particle of every record [meters]
+    Cext, Csca, Cabs, Cbck : array_like
+        extinction, scattering, absorption and backscattering cross section
+        of every record [meters**2]
+    description : str, optional
+        description of the data stored with the index (default '')
+
+    Returns
+    -------
+    ScatteringDatabase
+        the new database
+
+    Raises
+    ------
+    ValueError
+        If records are duplicated or cross sections are negative
+    """
+    records = np.broadcast_arrays(frequency, temperature, diameter, Cext,
+                                  Csca, Cabs, Cbck)
+    frequency, temperature, diameter, Cext, Csca, Cabs, Cbck = [
+        np.ravel(rr).astype(np.float64) for rr in records]
+
+    if np.any(np.stack([Cext, Csca, Cabs, Cbck]) < 0):
+        raise ValueError('Cross sections must not be negative')
+
+    order = np.lexsort((diameter, temperature, frequency))
+    frequency = frequency[order]
+    temperature = temperature[order]
+    data = np.stack(
+        [diameter, Cext, Csca, Cabs, Cbck], axis=-1)[order]
+
+    frequencies = np.unique(frequency)
+    temperatures = np.unique(temperature)
+    iF = np.searchsorted(frequencies, frequency)
+    iT = np.searchsorted(temperatures, temperature)
+
+    # start and end of every (frequency, temperature) block, -1 if missing
+    offsets = np.full((len(frequencies), len(temperatures), 2), -1,
+                      dtype=np.int64)
+    block = iF * len(temperatures) + iT
+    starts = np.flatnonzero(np.diff(block, prepend=-1))
+    ends = np.append(starts[1:], len(block))
+    offsets[iF[starts], iT[starts], 0] = starts
+    offsets[iF[starts], iT[starts], 1] = ends
+
+    for start, end in zip(starts, ends):
+        if np.any(np.diff(data[start:end, 0]) == 0):
+            raise ValueError('Duplicated diameter for frequency %g and '
+                             'temperature %g' % (frequency[start],
+                                                 temperature[start]))
+
+    os.makedirs(path, exist_ok=True)
+    np.save(os.path.join(path, DATA_FILE), data)
+    np.savez(os.path.join(path, INDEX_FILE),
+             frequency=frequencies,
+             temperature=temperatures,
+             offsets=offsets,
+             description=description,
+             )
+    return ScatteringDatabase(path)
+
+
+class ScatteringDatabase(object):
+    """ Memory mapped store of tabulated scattering properties
+
+    Cross sections are interpolated linearly in log(diameter) and
+    log(cross section) within every (frequency, temperature) block and
+    linearly in temperature between blocks. Frequencies must match the
+    tabulated frequencies, temperatures outside of the tabulated range use
+    the closest tabulated temperature. Diameters outside of the tabulated
+    range result in NaN.
+
+    Parameters
+    ----------
+    path : str
+        directory of a store created with create_database
+    frequency_rtol : float
+        relative tolerance used for matching frequencies (default 1e-6)
+
+    Attributes
+    ----------
+    frequency : array_like
+        tabulated frequencies [Hz]
+    temperature : array_like
+        tabulated temperatures [K]
+    description : str
+        description of the data
+    """
+
+    def __init__(self, path, frequency_rtol=1e-6):
+        self.path = path
+        self.frequency_rtol = frequency_rtol
+        with np.load(os.path.join(path, INDEX_FILE)) as index:
+            self.frequency = index['frequency']
+            self.temperature = index['temperature']
+            self.offsets = index['offsets']
+            self.description = str(index['description'])
+        self.data = np.load(os.path.join(path, DATA_FILE), mmap_mode='r')
+
+    def __repr__(self):
+        return 'ScatteringDatabase(%r, %i records, %i frequencies, ' \
+            '%i temperatures)' % (self.path, len(self.data),
+                                  len(self.frequency), len(self.temperature))
+
+    def _frequency_index(self, frequency):
+        last = len(self.frequency) - 1
+        iF = np.clip(np.searchsorted(self.frequency, frequency), 0, last)
+        iLower = np.clip(iF - 1, 0, last)
+        # choose the closer neighbour
+        lower = np.abs(frequency - self.frequency[iLower]) < \
+            np.abs(frequency - self.frequency[iF])
+        iF = np.where(lower, iLower, iF)
+        match = np.isclose(self.frequency[iF], frequency,
+                           rtol=self.frequency_rtol, atol=0)
+        if not np.all(match):
+            raise ValueError('Frequencies %s not in database. Available '
+                             'frequencies are %s' % (
+                                 np.unique(frequency[~match]),
+                                 self.frequency))
+        return iF
+
+    def _interpolate_block(self, iF, iT, diameter):
+        """ Interpolate cross sections of one block to diameter """
+        start, end = self.offsets[iF, iT]
+        if start < 0:
+            raise ValueError('No data for frequency %g and temperature %g' % (
+                self.frequency[iF], self.temperature[iT]))
+        block = np.asarray(self.data[start:end])
+        logD = np.log(block[:, 0])
+        logC = np.log(np.maximum(block[:, 1:], np.finfo(np.float64).tiny))
+        logDiameter = np.log(diameter)
+
+        result = np.empty(diameter.shape + (4,))
+        for ii in range(4):
+            result[:, ii] = np.exp(np.interp(
+                logDiameter, logD, logC[:, ii], left=np.nan, right=np.nan))
+        return result
+
+    def lookup(self, frequency, temperature, diameter):
+        """ Interpolated cross sections
+
+        Parameters
+        ----------
+        frequency : array_like
+            frequency [Hz]
+        temperature : array_like
+            temperature [K]
+        diameter : array_like
+            size of the particle [meters]
+
+        Returns
+        -------
+        Cext, Csca, Cabs, Cbck : array_like
+            extinction, scattering, absorption and backscattering cross
+            sections [meters**2] with the broadcasted shape of the input.
+            NaN for NaN temperatures and diameters outside of the
+            tabulated range.
+        """
+        frequency, temperature, diameter = np.broadcast_arrays(
+            frequency, temperature, diameter)
+        shape = diameter.shape
+        frequency = np.ravel(frequency).astype(np.float64)
+        temperature = np.ravel(temperature).astype(np.float64)
+        diameter = np.ravel(diameter).astype(np.float64)
+
+        iF = self._frequency_index(frequency)
+
+        # temperature interpolation weights, constant outside of the range
+        temperature = np.clip(temperature, self.temperature[0],
+                              self.temperature[-1])
+        if len(self.temperature) > 1:
+            iT = np.clip(np.searchsorted(self.temperature, temperature) - 1,
+                         0, len(self.temperature) - 2)
+            wT = (temperature - self.temperature[iT]) / \
+                (self.temperature[iT + 1] - self.temperature[iT])
+        else:
+            iT = np.zeros(diameter.shape, dtype=int)
+            wT = np.zeros(diameter.shape)
+
+        result = np.zeros(diameter.shape + (4,))
+        for dT, weight in [(0, 1 - wT), (1, wT)]:
+            # blocks with zero weight are not read
+            needed = weight > 0
+            blocks = np.stack([iF[needed], iT[needed] + dT], axis=-1)
+            if len(blocks) == 0:
+                continue
+            uniqueBlocks, inverse = np.unique(
+                blocks, axis=0, return_inverse=True)
+            neededIndex = np.flatnonzero(needed)
+            for bb, (bF, bT) in enumerate(uniqueBlocks):
+                ii = neededIndex[inverse.ravel() == bb]
+                result[ii] += weight[ii, np.newaxis] * \
+                    self._interpolate_block(bF, bT, diameter[ii])
+        # NaN temperatures have NaN weights, so no block was read
+        result[np.isnan(temperature)] = np.nan
+
+        result = result.reshape(shape + (4,))
+        return result[..., 0], result[..., 1], result[..., 2], result[..., 3]
+
+
+class DatabaseScatt(Scatterer):
+    """
+    Scatterer looking up tabulated scattering properties in a
+    ScatteringDatabase. Only the cross sections are available, the
+    amplitude matrix is not part of the database.
+
+    Parameters
+    ----------
+    database : str or ScatteringDatabase
+        database or path to the store
+    temperature : array_like
+        temperature of the particle [K]
+    """
+
+    def __init__(self,
+                 diameter=1.0e-3,
+                 frequency=None,
+                 wavelength=None,
+                 temperature=273.15,
+                 database=None,
+                 theta_inc=0.0,
+                 phi_inc=0.0,
+                 theta_sca=0.0,
+                 phi_sca=0.0):
+
+        # temperature is not known to Scatterer, so broadcast it first
+        temperature = np.asarray(temperature)
+        if temperature.ndim > 0:
+            diameter, temperature = np.broadcast_arrays(
+                diameter, temperature)
+
+        if database is None:
+            raise AttributeError('A ScatteringDatabase or the path to a '
+                                 'database store is required')
+        elif not isinstance(database, ScatteringDatabase):
+            database = ScatteringDatabase(database)
+        self.database = database
+
+        Scatterer.__init__(self,
+                           diameter=diameter,
+                           frequency=frequency,
+                           wavelength=wavelength,
+                           theta_inc=theta_inc,
+                           phi_inc=phi_inc,
+                           theta_sca=theta_sca,
+                           phi_sca=phi_sca,
+                           cross_sections_only=True)
+
+        self.temperature = np.broadcast_to(
+            temperature, self.shapeIn).ravel()
+
+        self.Cext, self.Csca, self.Cabs, self.Cbck = self.database.lookup(
+            self.frequency, self.temperature, self.diameter)
+
+        self.unravel_output()
@@ -46,7 +46,8 @@ class MieScatt(Scatterer):
                  theta_inc=0.0,
                  phi_inc=0.0,
                  theta_sca=0.0,
-                 phi_sca=0.0):
+                 phi_sca=0.0,
+                 cross_sections_only=False):
 
         Scatterer.__init__(self,
                            diameter=diameter,
@@ -57,7 +58,8 @@ class MieScatt(Scatterer):
                            theta_inc=theta_inc,
                            phi_inc=phi_inc,
                            theta_sca=theta_sca,
-                           phi_sca=phi_sca)
+                           phi_sca=phi_sca,
+                           cross_sections_only=cross_sections_only)
 
         #print('I am a Mie instance')
         self.geometric_cross_section = np.pi*self.diameter*self.diameter*0.25
@@ -66,21 +68,23 @@ class MieScatt(Scatterer):
         Q, theta, vecS1, vecS2 = cMie.mie(self.wavelength,
                                           self.diameter,
                                           self.refractive_index)
-        # Here I apply the dimension and convention conversion factor (-j/k)
-        # in order to compare to what Mishenko T-Matrix is giving
-        # TODO It might be beneficial if I document the convention somewhere
-        f1 = scipy.interpolate.interp1d(theta, vecS1)
-        f2 = scipy.interpolate.interp1d(theta, vecS2)
-
-        # 1j* is equivalent to (/-1j)
-        S1 = 1.j*f1(self.scatt_angle)/self.wavenumber
-        # 1j* is equivalent to (/-1j)
-        S2 = 1.j*f2(self.scatt_angle)/self.wavenumber
-
-        S34 = 0.0 + 0.0j
-        Ra, Rb = transformation_matrices(
-            self.rot_alpha, self.rot_beta, self.phi_inc, self.phi_sca)
-        self.estimate_amplitude_matrix(S1, S2, S34, Ra, Rb)
+        if not self.cross_sections_only:
+            # Here I apply the dimension and convention conversion factor
+            # (-j/k) in order to compare to what Mishenko T-Matrix is giving
+            # TODO It might be beneficial if I document the convention
+            # somewhere
+            f1 = scipy.interpolate.interp1d(theta, vecS1)
+            f2 = scipy.interpolate.interp1d(theta, vecS2)
+
+            # 1j* is equivalent to (/-1j)
+            S1 = 1.j*f1(self.scatt_angle)/self.wavenumber
+            # 1j* is equivalent to (/-1j)
+            S2 = 1.j*f2(self.scatt_angle)/self.wavenumber
+
+            S34 = 0.0 + 0.0j
+            Ra, Rb = transformation_matrices(
+                self.rot_alpha, self.rot_beta, self.phi_inc, self.phi_sca)
+            self.estimate_amplitude_matrix(S1, S2, S34, Ra, Rb)
 
         self.Cext = Q[..., 0]*self.geometric_cross_section
         self.Csca = Q[..., 1]*self.geometric_cross_section
@@ -27,7 +27,44 @@ import numpy as np
 from pamtra2.libs.refractiveIndex import utilities as ref_utils
 
 from .scatterer import Scatterer
-from .scattering_utilities import transformation_matrices
+from .scattering_utilities import size_parameter, transformation_matrices
+
+
+def rayleigh_cross_sections(diameter, wavelength, dielectric_permittivity):
+    """
+    Closed form Rayleigh cross sections of a sphere computed directly on
+    arrays without setting up a Scatterer object (i.e. no amplitude and
+    scattering geometry). Arguments are broadcasted against each other.
+    No check is performed to the actual validity of the Rayleigh
+    approximation
+
+    Parameters
+    ----------
+    diameter : array_like
+        diameter of the sphere [m]
+    wavelength : array_like
+        wavelength [m]
+    dielectric_permittivity : array_like
+        complex relative dielectric permittivity
+
+    Returns
+    -------
+    Cext, Csca, Cabs, Cbck : array_like
+        extinction, scattering, absorption and backscattering cross
+        sections [m2]
+    """
+    diameter = np.asarray(diameter)
+    K = ref_utils.K(np.asarray(dielectric_permittivity))
+    K2 = (K*K.conj()).real
+    x = size_parameter(0.5*diameter, np.asarray(wavelength))
+    x4 = x**4
+    geometric_cross_section = np.pi*diameter*diameter*0.25
+
+    Cabs = 4.*x*K.imag*geometric_cross_section
+    Csca = 8.*x4*K2*geometric_cross_section/3.0
+    Cext = Cabs + Csca
+    Cbck = 4.*x4*K2*geometric_cross_section
+    return Cext, Csca, Cabs, Cbck
 
 
 class RayleighScatt(Scatterer):
@@ -47,7 +84,8 @@ class RayleighScatt(Scatterer):
                  theta_inc=0.0,
                  phi_inc=0.0,
                  theta_sca=0.0,
-                 phi_sca=0.0):
+                 phi_sca=0.0,
+                 cross_sections_only=False):
 
         Scatterer.__init__(self,
                            diameter=diameter,
@@ -58,22 +96,22 @@ class RayleighScatt(Scatterer):
                            theta_inc=theta_inc,
                            phi_inc=phi_inc,
                            theta_sca=theta_sca,
-                           phi_sca=phi_sca)
+                           phi_sca=phi_sca,
+                           cross_sections_only=cross_sections_only)
 
         self.geometric_cross_section = np.pi*self.diameter*self.diameter*0.25
         self.K = ref_utils.K(self.dielectric_permittivity)
 
-        self.Cabs = 4.*self.size_parameter*self.K.imag*self.geometric_cross_section
-        self.Csca = 8.*self.size_parameter**4*self.K2*self.geometric_cross_section/3.0
-        self.Cext = self.Cabs + self.Csca
-        self.Cbck = 4.*self.size_parameter**4*self.K2*self.geometric_cross_section
+        self.Cext, self.Csca, self.Cabs, self.Cbck = rayleigh_cross_sections(
+            self.diameter, self.wavelength, self.dielectric_permittivity)
 
-        S1 = self.wavenumber**2*self.K*(self.diameter*0.5)**3
-        S2 = S1*np.cos(self.scatt_angle)
-        S34 = 0.0 + 0.0j
-        Ra, Rb = transformation_matrices(
-            self.rot_alpha, self.rot_beta, self.phi_inc, self.phi_sca)
+        if not self.cross_sections_only:
+            S1 = self.wavenumber**2*self.K*(self.diameter*0.5)**3
+            S2 = S1*np.cos(self.scatt_angle)
+            S34 = 0.0 + 0.0j
+            Ra, Rb = transformation_matrices(
+                self.rot_alpha, self.rot_beta, self.phi_inc, self.phi_sca)
 
-        self.estimate_amplitude_matrix(S1, S2, S34, Ra, Rb)
+            self.estimate_amplitude_matrix(S1, S2, S34, Ra, Rb)
 
         self.unravel_output()
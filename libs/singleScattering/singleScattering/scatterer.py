@@ -49,6 +49,12 @@ class Scatterer(object):
                             ... still do not know if I need all of them
         theta_inc, theta_sca:
         phi_inc, phi_sca:
+        cross_sections_only: If True, the amplitude matrix S and the Mueller
+            matrix Z are not available, only the cross sections are computed.
+        S: Complex 2x2 amplitude matrix of every particle. Computed on first
+            access.
+        Z: Real 4x4 Mueller matrix of every particle. Computed on first
+            access.
 
     """
 
@@ -66,8 +72,14 @@ class Scatterer(object):
                  phi_sca=0.0,
                  aspect_ratio=1,
                  volume=-99,
+                 cross_sections_only=False,
                  ):
 
+        self.cross_sections_only = cross_sections_only
+        self._S = None
+        self._Z = None
+        self._amplitude_matrix_args = None
+
         # first, convert inputs to arrays
         diameter, diameter_scalar = self.makeArray(diameter)
         refractive_index, refractive_index_scalar = self.makeArray(
@@ -166,13 +178,11 @@ class Scatterer(object):
         if self.scalar_input:
             # if scalars were initialy provided, make arrays scalar again
 
-            self.S = np.squeeze(self.S)
             self.Cabs = np.squeeze(self.Cabs)
             self.Csca = np.squeeze(self.Csca)
             self.Cext = np.squeeze(self.Cext)
             self.Cbck = np.squeeze(self.Cbck)
         else:
-            self.S = self.S.reshape(self.shapeIn+(2, 2,))
             self.Cabs = self.Cabs.reshape(self.shapeIn)
             self.Csca = self.Csca.reshape(self.shapeIn)
             self.Cext = self.Cext.reshape(self.shapeIn)
@@ -235,6 +245,7 @@ class Scatterer(object):
                # need to allow this for DB based scattering ???
                 self.refractive_index = None
                 self.dielectric_permittivity = None
+                self.K2 = None
             else:
                 self.dielectric_permittivity = np.array(
                     dielectric_permittivity)
@@ -271,15 +282,51 @@ class Scatterer(object):
         self.scatt_angle, self.rot_alpha, self.rot_beta = angles
 
     def estimate_amplitude_matrix(self, S1, S2, S34, Ra, Rb):
+        """ Store the elements of the amplitude matrix. The (N, 2, 2)
+        matrix itself is only assembled when S is accessed.
+        """
+        self._amplitude_matrix_args = (S1, S2, S34, Ra, Rb)
+        self._S = None
+        self._Z = None
 
-        S1234 = np.zeros(S1.shape + (2, 2,)) + 0.0j
-        S1234[..., 0, 0] = S2
-        S1234[..., 0, 1] = S34
-        S1234[..., 1, 0] = S34
-        S1234[..., 1, 1] = S1
-
-        # @ operator applies only to two last dimesnions.
-        self.S = Rb@S1234@Ra.T
+    def _reshape_matrix(self, matrix):
+        if self.scalar_input:
+            return np.squeeze(matrix)
+        else:
+            return matrix.reshape(self.shapeIn + matrix.shape[-2:])
+
+    @property
+    def S(self):
+        if self._S is None:
+            if self.cross_sections_only:
+                raise AttributeError('Amplitude matrix is not available '
+                                     'with cross_sections_only=True')
+            S1, S2, S34, Ra, Rb = self._amplitude_matrix_args
+            S1234 = np.zeros(np.shape(S1) + (2, 2,)) + 0.0j
+            S1234[..., 0, 0] = S2
+            S1234[..., 0, 1] = S34
+            S1234[..., 1, 0] = S34
+            S1234[..., 1, 1] = S1
+
+            # @ operator applies only to two last dimesnions.
+            self._S = self._reshape_matrix(Rb@S1234@Ra.T)
+            self._amplitude_matrix_args = None
+        return self._S
+
+    @S.setter
+    def S(self, S):
+        self._S = S
+
+    @property
+    def Z(self):
+        if self._Z is None:
+            self._Z = scatt_utils.amplitude2mueller(
+                scatt_utils.amplitude_matrix(self.S)).matrix
+        return self._Z
+
+    @Z.setter
+    def Z(self, Z):
+        self._Z = Z
 
 
 class Liu_DB(Scatterer):
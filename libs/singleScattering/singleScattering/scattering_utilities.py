@@ -29,7 +29,7 @@ class amplitude_matrix(object):
     |         |
     | S4   S1 |
 
-
+    S can also be an array of amplitude matrices with shape (..., 2, 2).
     """
 
     def __init__(self, S):
@@ -37,19 +37,19 @@ class amplitude_matrix(object):
 
     @property
     def S1(self):
-        return self.matrix[1, 1]
+        return self.matrix[..., 1, 1]
 
     @property
     def S2(self):
-        return self.matrix[0, 0]
+        return self.matrix[..., 0, 0]
 
     @property
     def S3(self):
-        return self.matrix[0, 1]
+        return self.matrix[..., 0, 1]
 
     @property
     def S4(self):
-        return self.matrix[1, 0]
+        return self.matrix[..., 1, 0]
 
     def to_mueller(self):
         return amplitude2mueller(self)
@@ -74,44 +74,46 @@ def amplitude2mueller(ampl):
     However, better to check, I see a sign problem in Z13 and Z14, also Z23 and Z24
     and probably more ...
 
+    Arrays of amplitude matrices result in Mueller matrices with shape
+    (..., 4, 4).
     """
 
-    mueller = np.ndarray((4, 4))
+    mueller = np.empty(np.shape(ampl.S1) + (4, 4))
     S1_2 = (ampl.S1 * ampl.S1.conjugate()).real
     S2_2 = (ampl.S2 * ampl.S2.conjugate()).real
     S3_2 = (ampl.S3 * ampl.S3.conjugate()).real
     S4_2 = (ampl.S4 * ampl.S4.conjugate()).real
-    mueller[0, 0] = 0.5 * (S2_2 + S1_2 + S4_2 + S3_2)
-    mueller[0, 1] = 0.5 * (S2_2 - S1_2 + S4_2 - S3_2)
-    mueller[0, 2] = -(ampl.S2 * ampl.S3.conjugate() +
-                      ampl.S1 * ampl.S4.conjugate()).real
-    mueller[0, 3] = -(ampl.S2 * ampl.S3.conjugate() -
-                      ampl.S1 * ampl.S4.conjugate()).imag
-
-    mueller[1, 0] = 0.5 * (S2_2 - S1_2 - S4_2 + S3_2)
-    mueller[1, 1] = 0.5 * (S2_2 + S1_2 - S4_2 - S3_2)
-    mueller[1, 2] = -(ampl.S2 * ampl.S3.conjugate() -
-                      ampl.S1 * ampl.S4.conjugate()).real
-    mueller[1, 3] = -(ampl.S2 * ampl.S3.conjugate() +
-                      ampl.S1 * ampl.S4.conjugate()).imag
-
-    mueller[2, 0] = -(ampl.S2 * ampl.S4.conjugate() +
-                      ampl.S1 * ampl.S3.conjugate()).real
-    mueller[2, 1] = -(ampl.S2 * ampl.S4.conjugate() -
-                      ampl.S1 * ampl.S3.conjugate()).real
-    mueller[2, 2] = (ampl.S2 * ampl.S1.conjugate() +
-                     ampl.S3 * ampl.S4.conjugate()).real
-    mueller[2, 3] = (ampl.S2 * ampl.S1.conjugate() +
-                     ampl.S4 * ampl.S3.conjugate()).imag
-
-    mueller[3, 0] = -(ampl.S4 * ampl.S2.conjugate() +
-                      ampl.S1 * ampl.S3.conjugate()).imag
-    mueller[3, 1] = -(ampl.S4 * ampl.S2.conjugate() -
-                      ampl.S1 * ampl.S3.conjugate()).imag
-    mueller[3, 2] = (ampl.S1 * ampl.S2.conjugate() -
-                     ampl.S3 * ampl.S4.conjugate()).imag
-    mueller[3, 3] = (ampl.S1 * ampl.S2.conjugate() -
-                     ampl.S3 * ampl.S4.conjugate()).real
+    mueller[..., 0, 0] = 0.5 * (S2_2 + S1_2 + S4_2 + S3_2)
+    mueller[..., 0, 1] = 0.5 * (S2_2 - S1_2 + S4_2 - S3_2)
+    mueller[..., 0, 2] = -(ampl.S2 * ampl.S3.conjugate() +
+                           ampl.S1 * ampl.S4.conjugate()).real
+    mueller[..., 0, 3] = -(ampl.S2 * ampl.S3.conjugate() -
+                           ampl.S1 * ampl.S4.conjugate()).imag
+
+    mueller[..., 1, 0] = 0.5 * (S2_2 - S1_2 - S4_2 + S3_2)
+    mueller[..., 1, 1] = 0.5 * (S2_2 + S1_2 - S4_2 - S3_2)
+    mueller[..., 1, 2] = -(ampl.S2 * ampl.S3.conjugate() -
+                           ampl.S1 * ampl.S4.conjugate()).real
+    mueller[..., 1, 3] = -(ampl.S2 * ampl.S3.conjugate() +
+                           ampl.S1 * ampl.S4.conjugate()).imag
+
+    mueller[..., 2, 0] = -(ampl.S2 * ampl.S4.conjugate() +
+                           ampl.S1 * ampl.S3.conjugate()).real
+    mueller[..., 2, 1] = -(ampl.S2 * ampl.S4.conjugate() -
+                           ampl.S1 * ampl.S3.conjugate()).real
+    mueller[..., 2, 2] = (ampl.S2 * ampl.S1.conjugate() +
+                          ampl.S3 * ampl.S4.conjugate()).real
+    mueller[..., 2, 3] = (ampl.S2 * ampl.S1.conjugate() +
+                          ampl.S4 * ampl.S3.conjugate()).imag
+
+    mueller[..., 3, 0] = -(ampl.S4 * ampl.S2.conjugate() +
+                           ampl.S1 * ampl.S3.conjugate()).imag
+    mueller[..., 3, 1] = -(ampl.S4 * ampl.S2.conjugate() -
+                           ampl.S1 * ampl.S3.conjugate()).imag
+    mueller[..., 3, 2] = (ampl.S1 * ampl.S2.conjugate() -
+                          ampl.S3 * ampl.S4.conjugate()).imag
+    mueller[..., 3, 3] = (ampl.S1 * ampl.S2.conjugate() -
+                          ampl.S3 * ampl.S4.conjugate()).real
 
     return scattering_matrix(mueller)
 
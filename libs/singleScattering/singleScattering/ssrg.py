@@ -112,7 +112,8 @@ class SsrgScatt(Scatterer):
                  phi_sca=0.0,
                  aspect_ratio=1.0,
                  ssrg_parameters='HW14',
-                 volume=None
+                 volume=None,
+                 cross_sections_only=False
                  ):
 
         Scatterer.__init__(self,
@@ -124,7 +125,8 @@ class SsrgScatt(Scatterer):
                            theta_inc=theta_inc,
                            phi_inc=phi_inc,
                            theta_sca=theta_sca,
-                           phi_sca=phi_sca)
+                           phi_sca=phi_sca,
+                           cross_sections_only=cross_sections_only)
 
         if volume is None:
             raise AttributeError(
@@ -156,35 +158,36 @@ class SsrgScatt(Scatterer):
         # volume by comparison with other scattering quantities in ssrg
         # NOTE: This should be not azimuthally averaged!!!
         #self.S2 = self.wavenumber**2*self.K*(self.diameter*0.5)**3*np.sqrt(phi_ssrg)
-        S1 = 3.*self.wavenumber**2*self.K * \
-            self.volume*np.sqrt(phi_ssrg)/(4.*np.pi)
-        S2 = S1*np.cos(self.scatt_angle)
-        S34 = 0.0 + 0.0j
-        Ra, Rb = transformation_matrices(
-            self.rot_alpha, self.rot_beta, self.phi_inc, self.phi_sca)
-        if np.isnan(self.rot_alpha):
-            if (self.theta_inc == self.theta_sca):  # polar
-                Ra = np.array([[np.cos(self.phi_inc), -np.sin(self.phi_inc)],
-                               [-np.sin(self.phi_inc), -np.cos(self.phi_inc)]])
-                Rb = np.array([[np.cos(self.phi_sca), -np.sin(self.phi_sca)],
-                               [-np.sin(self.phi_sca), -np.cos(self.phi_sca)]])
-            if ((self.phi_sca == self.phi_inc)):  # forward???
-                Ra = np.array([[1, 0], [0, -1]])
-                Rb = Ra
-            if (self.theta_inc == 0.0):
-                diff = self.phi_sca - self.phi_inc
-                Ra = np.array([[np.cos(diff), np.sin(diff)],
-                               [np.sin(diff), -np.cos(diff)]])
-                Rb = np.array([[1, 0], [0, -1]])
-            if (self.theta_sca == 0.0):
-                diff = self.phi_inc - self.phi_sca
-                Ra = np.array([[1, 0], [0, -1]])
-                Rb = np.array([[np.cos(diff), np.sin(diff)],
-                               [np.sin(diff), -np.cos(diff)]])
-        print('ORIGINAL\n\n', np.array([[S2, S34], [S34, S1]]))
-        
-        # self.S = Rb@np.array([[S2, S34], [S34, S1]])@Ra.T
-        self.estimate_amplitude_matrix(S1, S2, S34, Ra, Rb)
+        if not self.cross_sections_only:
+            S1 = 3.*self.wavenumber**2*self.K * \
+                self.volume*np.sqrt(phi_ssrg)/(4.*np.pi)
+            S2 = S1*np.cos(self.scatt_angle)
+            S34 = 0.0 + 0.0j
+            Ra, Rb = transformation_matrices(
+                self.rot_alpha, self.rot_beta, self.phi_inc, self.phi_sca)
+            if np.isnan(self.rot_alpha):
+                if (self.theta_inc == self.theta_sca):  # polar
+                    Ra = np.array([[np.cos(self.phi_inc), -np.sin(self.phi_inc)],
+                                   [-np.sin(self.phi_inc), -np.cos(self.phi_inc)]])
+                    Rb = np.array([[np.cos(self.phi_sca), -np.sin(self.phi_sca)],
+                                   [-np.sin(self.phi_sca), -np.cos(self.phi_sca)]])
+                if ((self.phi_sca == self.phi_inc)):  # forward???
+                    Ra = np.array([[1, 0], [0, -1]])
+                    Rb = Ra
+                if (self.theta_inc == 0.0):
+                    diff = self.phi_sca - self.phi_inc
+                    Ra = np.array([[np.cos(diff), np.sin(diff)],
+                                   [np.sin(diff), -np.cos(diff)]])
+                    Rb = np.array([[1, 0], [0, -1]])
+                if (self.theta_sca == 0.0):
+                    diff = self.phi_inc - self.phi_sca
+                    Ra = np.array([[1, 0], [0, -1]])
+                    Rb = np.array([[np.cos(diff), np.sin(diff)],
+                                   [np.sin(diff), -np.cos(diff)]])
+            print('ORIGINAL\n\n', np.array([[S2, S34], [S34, S1]]))
+
+            # self.S = Rb@np.array([[S2, S34], [S34, S1]])@Ra.T
+            self.estimate_amplitude_matrix(S1, S2, S34, Ra, Rb)
 
         # so far in our convention the imaginary part of dielectric properties is
         # positive for absorbing materials, thus you don't find -K.imag
@@ -68,7 +68,8 @@ class TmatrixScatt(Scatterer):
                  phi_sca=0.0,
                  alpha=0.0,  # we introduce alpha and beta euler angles
                  beta=0.0,  # for orientation
-                 aspect_ratio=1.0):
+                 aspect_ratio=1.0,
+                 cross_sections_only=False):
 
         Scatterer.__init__(self,
                            diameter=diameter,
@@ -79,7 +80,8 @@ class TmatrixScatt(Scatterer):
                            theta_inc=theta_inc,
                            phi_inc=phi_inc,
                            theta_sca=theta_sca,
-                           phi_sca=phi_sca)
+                           phi_sca=phi_sca,
+                           cross_sections_only=cross_sections_only)
 
         self.geometric_cross_section = np.pi*self.diameter*self.diameter*0.25
         self.K = ref_utils.K(self.dielectric_permittivity)
@@ -94,7 +96,8 @@ class TmatrixScatt(Scatterer):
 
         self._init_tmatrix()
 
-        self.S, self.Z = self.get_SZ()
+        if not self.cross_sections_only:
+            self.S, self.Z = self.get_SZ()
         self.Csca = self.scattering_xsect()
         self.Cext = self.extinction_xsect()
         self.Cbck = self.backscatter_xsect()
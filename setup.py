@@ -27,6 +27,15 @@ if sys.platform == 'darwin':
 
 library_dirs = ['~/.local/lib/', '/usr/local/lib/', '/opt/local/lib/']
 
+# OpenMP parallelization of the loops over heights of the radar libraries.
+# Set PAMTRA2_NO_OPENMP to build them without OpenMP.
+kwOpenMP = dict(kw)
+if 'PAMTRA2_NO_OPENMP' not in os.environ:
+    kwOpenMP['extra_f90_compile_args'] = ['-fopenmp']
+    kwOpenMP['extra_link_args'] = kw.get('extra_link_args', []) + [
+        '-fopenmp']
+
+
 def configuration(parent_package='', top_path=None):
 
     config = Configuration(
@@ -80,6 +89,7 @@ pyrasim = Extension(
         '%s/pyPamtraRadarSimulatorLib/pyPamtraRadarSimulatorLib.pyf' %
         pyrasim_path,
         '%s/pyPamtraRadarSimulatorLib/kinds.f90' % pyrasim_path,
+        '%s/pyPamtraRadarSimulatorLib/parallel_module.f90' % pyrasim_path,
         '%s/pyPamtraRadarSimulatorLib/report_module.f90' % pyrasim_path,
         '%s/pyPamtraRadarSimulatorLib/constants.f90' % pyrasim_path,
         '%s/pyPamtraRadarSimulatorLib/dsort.f90' % pyrasim_path,
@@ -97,7 +107,7 @@ pyrasim = Extension(
     library_dirs=library_dirs,
     libraries=['fftw3', 'lapack'],
     extra_compile_args = [ "-fPIC"],
-    **kw)
+    **kwOpenMP)
 
 pyramom_path = 'libs/pyPamtraRadarMoments/pyPamtraRadarMoments'
 pyramom = Extension(
@@ -106,6 +116,7 @@ pyramom = Extension(
         '%s/pyPamtraRadarMomentsLib/nan.f90' % pyramom_path,
         '%s/pyPamtraRadarMomentsLib/pyPamtraRadarMomentsLib.pyf' % pyramom_path,
         '%s/pyPamtraRadarMomentsLib/kinds.f90' % pyramom_path,
+        '%s/pyPamtraRadarMomentsLib/parallel_module.f90' % pyramom_path,
         '%s/pyPamtraRadarMomentsLib/report_module.f90' % pyramom_path,
         '%s/pyPamtraRadarMomentsLib/constants.f90' % pyramom_path,
         '%s/pyPamtraRadarMomentsLib/convolution.f90' % pyramom_path,
@@ -117,7 +128,7 @@ pyramom = Extension(
     library_dirs=library_dirs,
     libraries=['fftw3', 'lapack'],
     extra_compile_args = [ "-fPIC"],
-    **kw)
+    **kwOpenMP)
 
 refractiveIndex_path = 'libs/refractiveIndex/refractiveIndex'
 meteo_si_path = 'libs/meteo_si/meteo_si'
@@ -11,5 +11,7 @@ from . import hydrometeors
 from . import instruments
 from . import dimensions
 from . import helpers
+from . import validation
+from . import thermodynamics
 from . import libs
 from . import importer
@@ -5,7 +5,7 @@ from collections import OrderedDict
 import numpy as np
 import xarray as xr
 
-from . import constants, dimensions, helpers, units
+from . import constants, dimensions, helpers, thermodynamics, units
 from .libs import meteo_si
 
 __version__ = 0.2
@@ -140,15 +140,14 @@ class default(object):
         return self.profile
 
     def addMissingVariables(self):
+        '''
+        add height bin depth and all variables derived from temperature,
+        pressure, relative humidity and hydrometeor content (see
+        thermodynamics.VARIABLES) in a single pass
+        '''
 
         self.addHeightBinDepth()
-        self.addSpecificHumidity()
-        self.addAbsoluteHumidity()
-        self.addDryAirDensity()
-        self.addAirDensity()
-        self.addDynamicViscosity()
-        self.addKinematicViscosity()
-        self.addWaterVaporPressure()
+        thermodynamics.addThermodynamicVariables(self.profile)
 
         return self.profile
 
@@ -253,18 +252,7 @@ class default(object):
         p = self.profile.pressure
         T = self.profile.temperature
         q = self.profile.specificHumidity
-        try:
-            qm = self.profile.hydrometeorContent.sum('hydrometeor')
-        except ValueError:
-            warnings.warn('hydrometeor content not considered when calculating'
-                          ' air density, because hydrometeor dimension is '
-                          'missing. ')
-            qm = 0
-        except AttributeError:
-            warnings.warn('hydrometeor content not considered when calculating'
-                          ' air density, because hydrometeorContent variable'
-                          ' is missing.')
-            qm = 0
+        qm = thermodynamics.hydrometeorContentSum(self.profile)
 
         args = (p, T, q, qm)
         self.profile['airDensity'] = xr.apply_ufunc(
@@ -5,7 +5,7 @@ from collections import OrderedDict
 import numpy as np
 import xarray as xr
 
-from . import constants, dimensions, helpers, units
+from . import constants, dimensions, helpers, thermodynamics, units
 from .libs import meteo_si
 
 __version__ = 0.2
@@ -95,9 +95,11 @@ class pamtra2(object):
         profile=None,
         additionalDims={},
         verbosity=0,
+        combineHydrometeorBins=False,
     ):
 
         self.verbosity = verbosity
+        self.combineHydrometeorBins = combineHydrometeorBins
         self.coords = {}
         self.coords[dimensions.ADDITIONAL] = OrderedDict(additionalDims)
         self.coords[dimensions.LAYER] = OrderedDict(layer=range(nLayer))
@@ -142,53 +144,196 @@ class pamtra2(object):
 
         self.instruments = helpers.AttrDict()
 
+        # derived fields shared by all instruments, see memoize
+        self._memo = {}
+
         return
 
+    def memoize(self, key, func, dependencies=[]):
+        """Memo of derived fields shared by all instruments, e.g.
+        attenuation or integrated cross sections.
+
+        The result of func is stored under key together with a content
+        based fingerprint of dependencies. It is recalculated only if the
+        fingerprint changed, i.e. if any dependency was replaced or
+        modified in place.
+
+        Parameters
+        ----------
+        key : hashable
+            identifier of the field, e.g. including the frequencies
+        func : callable
+            function without arguments calculating the field
+        dependencies : list, optional
+            all inputs of func, e.g. xr.DataArrays of the profiles
+
+        Returns
+        -------
+        value
+            (memoized) result of func. Do not modify in place.
+        """
+        fingerprint = helpers.fingerprint(*dependencies)
+        cached = self._memo.get(key)
+        if (cached is not None) and (cached[0] == fingerprint):
+            return cached[1]
+        value = func()
+        self._memo[key] = (fingerprint, value)
+        return value
+
+    def clearMemo(self):
+        """Remove all derived fields stored by memoize."""
+        self._memo = {}
+
     def getProfileAllBroadcasted(self, variables=None, sel={}):
-        if variables is None:
-            return xr.broadcast(self.profile.sel(**sel))[0]
-        else:
-            return xr.broadcast(self.profile.sel(**sel)[variables])[0]
+        profile = self.profile.sel(**sel)
+        if variables is not None:
+            profile = profile[variables]
+        # xr.broadcast rebuilds datasets through the constructor of their
+        # type, which customProfile does not provide.
+        profile = xr.Dataset(
+            profile.data_vars, coords=profile.coords, attrs=profile.attrs)
+        return xr.broadcast(profile)[0]
+
+    def getCombinedBins(self, variables, sel={}):
+        """Pack the size bins of all hydrometeors into one dataset.
+
+        The sizeBin dimensions of all hydrometeors are concatenated into
+        the dimension 'bin', so properties of all hydrometeors can be
+        processed in a single vectorized pass. Variables not depending on
+        sizeBin are repeated for every bin of the hydrometeor.
+
+        Parameters
+        ----------
+        variables : list of str
+            variables of the hydrometeors' profiles
+        sel : dict, optional
+            selection applied to the hydrometeors' profiles before
+            combining, e.g. {'frequency': [35e9]} (default {})
+
+        Returns
+        -------
+        combined : xr.Dataset
+            variables with dimension 'bin'. Coordinate 'binHydrometeor'
+            contains the hydrometeor of each bin.
+        offsets : OrderedDict
+            slice of the bins of each hydrometeor.
+        """
+        perHydro = []
+        offsets = OrderedDict()
+        start = 0
+        for name in self.hydrometeors.keys():
+            profile = self.hydrometeors[name].profile[variables].sel(**sel)
+            profile = profile.drop_vars(
+                [k for k in ['sizeBin', 'sizeBin1'] if k in profile.coords]
+            ).rename({'sizeBin': 'bin'})
+            nBins = profile.sizes['bin']
+            for var in variables:
+                if 'bin' not in profile[var].dims:
+                    profile[var] = profile[var].expand_dims(bin=nBins)
+            profile = profile.assign_coords(
+                binHydrometeor=('bin', [name] * nBins))
+            perHydro.append(profile)
+            offsets[name] = slice(start, start + nBins)
+            start += nBins
+        combined = xr.concat(perHydro, dim='bin')
+        return combined, offsets
 
     def getIntegratedScatteringCrossSections(
         self,
         frequencies=None,
         crossSections='all'
     ):
+        """Scattering cross sections integrated over the size bins of all
+        hydrometeors, i.e. sum of cross section times number concentration.
 
-        integrated = {}
+        Parameters
+        ----------
+        frequencies : list of float, optional
+            only these frequencies are evaluated. Default is all
+            frequencies.
+        crossSections : list of str or 'all', optional
+            names of the cross sections (default 'all')
+
+        Returns
+        -------
+        dict of xr.DataArray
+            integrated cross sections
+        """
 
         if crossSections == 'all':
             crossSections = [
-                'extinctionCrossSection'
-                'scatterCrossSection'
+                'extinctionCrossSection',
+                'scatterCrossSection',
                 'absorptionCrossSection',
                 'backscatterCrossSection',
             ]
-        for crossSection in crossSections:
-            perHydro = []
-            for name in self.hydrometeors.keys():
-                numberConcentration = self.hydrometeors[
-                    name].profile.numberConcentration.fillna(0)
-                crossSec = self.hydrometeors[name].profile[crossSection]
-                if frequencies is not None:
-                    crossSec.sel(frequency=frequencies)
-                thisHydro = crossSec * numberConcentration
-                perHydro.append(thisHydro)
-            integrated[crossSection] = xr.concat(
-                perHydro, dim='hydro').sum(['hydro', 'sizeBin'])
+
+        dependencies = [self.combineHydrometeorBins]
+        for name in self.hydrometeors.keys():
+            profile = self.hydrometeors[name].profile
+            dependencies.append(
+                [name, profile.numberConcentration] +
+                [profile[crossSection] for crossSection in crossSections]
+            )
+        if frequencies is not None:
+            frequencies = tuple(np.atleast_1d(
+                np.asarray(frequencies, dtype=float)))
+        integrated = self.memoize(
+            ('integratedScatteringCrossSections', tuple(crossSections),
+             frequencies),
+            lambda: self._integrateScatteringCrossSections(
+                None if frequencies is None else list(frequencies),
+                crossSections),
+            dependencies,
+        )
+        return dict(integrated)
+
+    def _integrateScatteringCrossSections(self, frequencies, crossSections):
+        """Helper function for getIntegratedScatteringCrossSections"""
+
+        integrated = {}
+        sel = {}
+        if frequencies is not None:
+            sel['frequency'] = frequencies
+
+        if self.combineHydrometeorBins:
+            combined, _ = self.getCombinedBins(
+                crossSections + ['numberConcentration'], sel=sel)
+            numberConcentration = combined.numberConcentration.fillna(0)
+            for crossSection in crossSections:
+                integrated[crossSection] = xr.dot(
+                    combined[crossSection].fillna(0), numberConcentration,
+                    dims='bin')
+            return integrated
+
+        for name in self.hydrometeors.keys():
+            profile = self.hydrometeors[name].profile
+            numberConcentration = profile.numberConcentration.fillna(0)
+            for crossSection in crossSections:
+                crossSec = profile[crossSection].sel(**sel)
+                # xr.dot sums over sizeBin without materializing the
+                # product of the broadcasted variables
+                thisHydro = xr.dot(
+                    crossSec.fillna(0), numberConcentration, dims='sizeBin')
+                total = integrated.get(crossSection)
+                if total is None:
+                    # xr.dot returns a new array which can be modified
+                    integrated[crossSection] = thisHydro
+                elif set(thisHydro.dims) <= set(total.dims):
+                    total += thisHydro
+                else:
+                    integrated[crossSection] = total + thisHydro
         return integrated
 
     def addMissingVariables(self):
+        '''
+        add height bin depth and all variables derived from temperature,
+        pressure, relative humidity and hydrometeor content (see
+        thermodynamics.VARIABLES) in a single pass
+        '''
 
         self.addHeightBinDepth()
-        self.addSpecificHumidity()
-        self.addAbsoluteHumidity()
-        self.addDryAirDensity()
-        self.addAirDensity()
-        self.addDynamicViscosity()
-        self.addKinematicViscosity()
-        self.addWaterVaporPressure()
+        thermodynamics.addThermodynamicVariables(self.profile)
 
         return self.profile
 
@@ -293,18 +438,7 @@ class pamtra2(object):
         p = self.profile.pressure
         T = self.profile.temperature
         q = self.profile.specificHumidity
-        try:
-            qm = self.profile.hydrometeorContent.sum('hydrometeor')
-        except ValueError:
-            warnings.warn('hydrometeor content not considered when calculating'
-                          ' air density, because hydrometeor dimension is '
-                          'missing. ')
-            qm = 0
-        except AttributeError:
-            warnings.warn('hydrometeor content not considered when calculating'
-                          ' air density, because hydrometeorContent variable'
-                          ' is missing.')
-            qm = 0
+        qm = thermodynamics.hydrometeorContentSum(self.profile)
 
         args = (p, T, q, qm)
         self.profile['airDensity'] = xr.apply_ufunc(
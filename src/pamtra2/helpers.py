@@ -3,9 +3,11 @@ import collections
 import inspect
 from collections import OrderedDict
 from copy import deepcopy
-from functools import wraps
+from functools import partial
 
+import dask.array as da
 import numpy as np
+from dask.base import tokenize
 import xarray as xr
 import pandas as pd
 
@@ -49,6 +51,32 @@ def provideArgKwargNames(func):
     return argNames, kwargNames
 
 
+def _fingerprintable(arg):
+    if callable(arg):
+        # identity only. Tokenizing the callable itself would include the
+        # state of closures, which changes with every call.
+        return ('callable', id(arg), getattr(arg, '__qualname__', None))
+    elif isinstance(arg, xr.DataArray):
+        # attributes like units do not change the results
+        return (
+            arg.dims,
+            arg.data,
+            [(k, v.dims, v.data) for k, v in arg.coords.items()],
+        )
+    elif isinstance(arg, (list, tuple)):
+        return [_fingerprintable(a) for a in arg]
+    else:
+        return arg
+
+
+def fingerprint(*args):
+    """Content based fingerprint of inputs, e.g. of a hydrometeor property.
+    Callables are identified by their id only, so redefined functions
+    with the same name are detected, but not the state of closures.
+    Attributes of xr.DataArrays are ignored."""
+    return tokenize(*[_fingerprintable(arg) for arg in args])
+
+
 def concatDicts(*dicts):
     """
     concatenate (ordered) dicts
@@ -98,32 +126,54 @@ def getInputCoreDims(args, coreDims):
     return input_core_dims
 
 
-def mergeFlattResults(
-    core_shapes=None
+def _getItem(result, index):
+    return result[index]
+
+
+def _blockwiseMultiOutput(
+    func, *args, input_core_dims=None, output_core_shapes=None,
+    output_dtypes=None, kwargs={}
 ):
-    """Decorator to merge multiple outputs of a function's result
-    into one joined array. Dimensions NOT in core_shapes are preserved.
+    """Apply `func` with multiple outputs block-wise to dask arrays.
+
+    `func` is called once per block. Each output gets its own dask array
+    which only references its item of the tuple returned by `func`, so the
+    outputs are never joined into a single buffer.
+
+    All args must have the same number of broadcast (leading) dimensions,
+    followed by their core dimensions as given by `input_core_dims`.
     """
-    def mergeFlattResults_decorator(func):
-        @wraps(func)
-        def flatt_func(*args, **kwargs):
-            result = func(*args, **kwargs)
-            if type(result) is not tuple:
-                return result
-            else:
-                result = list(result)
-                for ii in range(len(result)):
-                    res_shape = list(result[ii].shape)
-                    for sh in core_shapes[ii]:
-                        res_shape.remove(sh)
-                    new_shape = tuple(
-                        res_shape) + tuple([np.product(
-                            core_shapes[ii]).astype(int)])
-                    result[ii] = result[ii].reshape(new_shape)
-                result = np.concatenate(result, axis=-1)
-            return result
-        return flatt_func
-    return mergeFlattResults_decorator
+    nBroadcast = args[0].ndim - len(input_core_dims[0])
+    loopIndex = tuple('loop%i' % ii for ii in range(nBroadcast))
+
+    blockwiseArgs = []
+    for arg, coreDims in zip(args, input_core_dims):
+        arg = da.asarray(arg)
+        # core dimensions must not be chunked
+        arg = arg.rechunk(
+            {nBroadcast + ii: -1 for ii in range(len(coreDims))})
+        blockwiseArgs += [arg, loopIndex + tuple(coreDims)]
+
+    blockResults = da.blockwise(
+        partial(func, **kwargs),
+        loopIndex,
+        *blockwiseArgs,
+        concatenate=True,
+        meta=np.empty((0,) * nBroadcast, dtype=object),
+    )
+
+    results = []
+    for ii, (coreShape, dtype) in enumerate(
+            zip(output_core_shapes, output_dtypes)):
+        results.append(da.map_blocks(
+            _getItem,
+            blockResults,
+            ii,
+            chunks=blockResults.chunks + tuple((cc,) for cc in coreShape),
+            new_axis=list(range(nBroadcast, nBroadcast + len(coreShape))),
+            meta=np.empty((0,) * (nBroadcast + len(coreShape)), dtype=dtype),
+        ))
+    return tuple(results)
 
 
 def apply_ufunc_extended(
@@ -133,77 +183,191 @@ def apply_ufunc_extended(
 ):
     """Extended version of xarray's `xr.apply_ufunc` which can handle with
     multiple output of a functions and dask. New keyword output_names
-    required with a list of the names of the returned variables. Note that
-    different types in the results are not preserved.
+    required with a list of the names of the returned variables.
+
+    Each output is returned by `func` as a separate array and kept
+    separate; with dask, the outputs become separate dask arrays sharing
+    one call of `func` per block.
     """
 
-    input_core_dims = kwargs.get('input_core_dims', [])
+    input_core_dims = kwargs.pop('input_core_dims', [[]] * len(args))
     output_sizes = kwargs.pop('output_sizes', {})
     output_names = kwargs.pop('output_names', [])
     output_core_dims = kwargs.pop('output_core_dims', [])
+    output_dtypes = kwargs.pop('output_dtypes', [args[0].dtype])
+    func_kwargs = kwargs.pop('kwargs', {})
+    dask = kwargs.pop('dask', 'forbidden')
 
     if len(output_core_dims) == 0:
         output_core_dims = [tuple()] * len(output_names)
 
     assert len(output_core_dims) == len(output_names)
 
-    OrderedDict(zip(output_names, output_core_dims))
-
-    all_input_core_dims = []
-    for input_core_dim in input_core_dims:
-        all_input_core_dims.append(*input_core_dim)
-    all_input_core_dims = list(set(all_input_core_dims))
-
-    non_core_dims = []
-    for arg in args:
-        non_core_dims += [d for d in arg.dims if d not in all_input_core_dims]
-    non_core_dims = list(set(non_core_dims))
-    arg0 = args[0]._to_temp_dataset()
-
-    non_core_shape = tuple([arg0.dims[key] for key in non_core_dims])
-
-    for ii in range(len(output_core_dims)):
-        if type(output_core_dims[ii]) is not tuple:
-            output_core_dims[ii] = tuple([output_core_dims[ii]])
-
-    output_shapes = OrderedDict()
-    output_core_shapes = []
-    for key, val in zip(output_names, output_core_dims):
-        output_shapes[key] = non_core_shape + \
-            tuple([output_sizes[ii] for ii in val])
-        output_core_shapes.append(tuple([output_sizes[ii] for ii in val])
-                                  )
-
-    len_tmp_dim = np.sum([np.prod(vv) for vv in output_shapes.values()])
-    flat_func = mergeFlattResults(output_core_shapes)(func)
+    output_core_dims = [
+        tuple([cc]) if type(cc) is not tuple else cc
+        for cc in output_core_dims
+    ]
+    output_core_shapes = [
+        tuple([output_sizes[dd] for dd in cc]) for cc in output_core_dims
+    ]
+    if len(output_dtypes) == 1:
+        output_dtypes = output_dtypes * len(output_names)
+
+    def multi_output_func(*arrays):
+        if any(isinstance(arr, da.Array) for arr in arrays):
+            if dask != 'parallelized':
+                raise ValueError('apply_ufunc_extended encountered a dask '
+                                 'array on an argument, but handling for '
+                                 'dask arrays has not been enabled.')
+            return _blockwiseMultiOutput(
+                func,
+                *arrays,
+                input_core_dims=input_core_dims,
+                output_core_shapes=output_core_shapes,
+                output_dtypes=output_dtypes,
+                kwargs=func_kwargs,
+            )
+        return func(*arrays, **func_kwargs)
 
     results = xr.apply_ufunc(
-        flat_func,
+        multi_output_func,
         *args,
-        output_core_dims=[('<TEMP_DIM>',)],
-        output_sizes={'<TEMP_DIM>': len_tmp_dim},
+        input_core_dims=input_core_dims,
+        output_core_dims=output_core_dims,
+        dask='allowed',
         **kwargs,
     )
 
-    ii = 0
     this_result = OrderedDict()
-    for kk, (key, this_shape) in enumerate(
-            zip(output_names, output_core_shapes)):
-        new_shape = non_core_shape + this_shape
-        this_len = np.prod(this_shape).astype(int)
-        this_result[key] = results.data[..., ii:ii+this_len].reshape(new_shape)
-        this_ccords = [arg0.coords[k] for k in non_core_dims] + [
-            xr.DataArray(
-                range(output_sizes[cc]),
-                name=cc,
-                dims=[cc]
-            ) for cc in output_core_dims[kk]]
-
-        this_result[key] = xr.DataArray(this_result[key], coords=this_ccords)
-        ii += this_len
+    for key, result, core_dims in zip(
+            output_names, results, output_core_dims):
+        this_result[key] = result.assign_coords(
+            **{cc: range(output_sizes[cc]) for cc in core_dims})
     return xr.Dataset(this_result)
 
 
+class DimensionFlattener(object):
+    """Flatten several dimensions of xarray objects into a single dimension
+    and back using plain reshapes.
+
+    Replacement for `stack` / `xrFastUnstack` round trips around
+    `xr.apply_ufunc`. No pandas MultiIndex is created and no reindexing
+    is required. If the flattened dimensions are already the leading
+    dimensions of a contiguous array, no data is copied.
+
+    Parameters
+    ----------
+    obj : xr.Dataset or xr.DataArray
+        Object providing the sizes and coordinates of `dims`.
+    dims : list of str
+        Dimensions to flatten, in this order. Dimensions not present in
+        `obj` are ignored.
+    dim : str, optional
+        Name of the flattened dimension (default 'merged').
+
+    Examples
+    --------
+    >>> flattener = DimensionFlattener(profile, ['layer', 'frequency'])
+    >>> flat = flattener.flatten(profile)
+    >>> result = xr.apply_ufunc(func, flat.a, flat.b, ...)
+    >>> result = flattener.unflatten(result)
+    """
+
+    def __init__(self, obj, dims, dim='merged'):
+        self.dims = [d for d in dims if d in obj.dims]
+        self.dim = dim
+        self.shape = tuple(obj.sizes[d] for d in self.dims)
+        self.size = int(np.prod(self.shape))
+        self.coords = OrderedDict()
+        for d in self.dims:
+            if d in obj.coords:
+                self.coords[d] = obj.coords[d].variable
+
+    def flatten(self, obj):
+        """Flatten `self.dims` of `obj` into the leading dimension `self.dim`.
+
+        Variables which do not depend on any of `self.dims` are returned
+        unchanged, all others are broadcasted against `self.dims`.
+
+        Parameters
+        ----------
+        obj : xr.Dataset or xr.DataArray
+
+        Returns
+        -------
+        xr.Dataset or xr.DataArray
+        """
+        if isinstance(obj, xr.Dataset):
+            return xr.Dataset(OrderedDict(
+                (name, self.flatten(obj[name])) for name in obj.data_vars
+            ))
+
+        if not any(d in obj.dims for d in self.dims):
+            return obj
+
+        missing = OrderedDict(
+            (d, s) for d, s in zip(self.dims, self.shape) if d not in obj.dims)
+        otherDims = [d for d in obj.dims if d not in self.dims]
+        variable = obj.variable
+        if len(missing) > 0:
+            variable = variable.set_dims(
+                concatDicts(missing, OrderedDict(variable.sizes)))
+        variable = variable.transpose(*(self.dims + otherDims))
+        data = variable.data.reshape(
+            (self.size,) + variable.shape[len(self.dims):])
+
+        coords = OrderedDict(
+            (k, v.variable) for k, v in obj.coords.items()
+            if all(d in otherDims for d in v.dims)
+        )
+        return xr.DataArray(
+            data,
+            dims=[self.dim] + otherDims,
+            coords=coords,
+            name=obj.name,
+            attrs=obj.attrs,
+        )
+
+    def unflatten(self, obj):
+        """Restore `self.dims` from dimension `self.dim` of `obj`.
+
+        The restored dimensions are put first, all other dimensions are
+        appended in their original order.
+
+        Parameters
+        ----------
+        obj : xr.Dataset or xr.DataArray
+
+        Returns
+        -------
+        xr.Dataset or xr.DataArray
+        """
+        if isinstance(obj, xr.Dataset):
+            return xr.Dataset(OrderedDict(
+                (name, self.unflatten(obj[name])) for name in obj.data_vars
+            ))
+
+        if self.dim not in obj.dims:
+            return obj
+
+        otherDims = [d for d in obj.dims if d != self.dim]
+        variable = obj.variable.transpose(*([self.dim] + otherDims))
+        data = variable.data.reshape(self.shape + variable.shape[1:])
+
+        coords = OrderedDict(
+            (k, v.variable) for k, v in obj.coords.items()
+            if self.dim not in v.dims
+        )
+        coords.update(self.coords)
+        return xr.DataArray(
+            data,
+            dims=self.dims + otherDims,
+            coords=coords,
+            name=obj.name,
+            attrs=obj.attrs,
+        )
+
+
 def xrGradient(data, dimension=None):
     '''
     Wrapper for np.gradient which is not available in xarray
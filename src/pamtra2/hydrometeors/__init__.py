@@ -8,6 +8,8 @@ from . import density
 from . import aspectRatio
 from . import scattering
 from . import fallVelocity
+from . import kernels
+from . import moments
 from . import relativePermittivity
 from . import numberConcentration
 
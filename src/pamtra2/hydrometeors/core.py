@@ -1,14 +1,18 @@
 # -*- coding: utf-8 -*-
 
+import functools
 import inspect
 import warnings
+from collections import OrderedDict
 
+import dask.array
 import numpy as np
 import xarray as xr
 
 from . import (aspectRatio, crossSectionArea, density, fallVelocity, mass,
-               scattering, size, numberConcentration, relativePermittivity)
-from .. import helpers, units
+               moments, scattering, size, numberConcentration,
+               relativePermittivity)
+from .. import helpers, units, validation
 from ..libs import refractiveIndex
 
 
@@ -29,6 +33,134 @@ def DEFAULT_CALCULATION_ORDER():
     ]
 
 
+def MOMENT_CALCULATION_ORDER():
+    return [
+        'lambd',
+        'numberConcentration',
+        'relativePermittivity',
+        'scattering',
+        'fallVelocity',
+    ]
+
+
+# expensive element-wise properties evaluated only for bins with particles
+# in sparse mode
+SPARSE_PROPERTIES = [
+    'relativePermittivityIce',
+    'relativePermittivity',
+    'scattering',
+    'fallVelocity',
+]
+
+
+def _evaluateSparse(func, kw4Func, mask):
+    """Evaluate func only where mask is True.
+
+    The dimensions of mask shared with the arguments are flattened and
+    reduced to the True elements before calling func. The result is
+    expanded back to the full shape, filled with zeros where mask is
+    False. func must work element-wise along the dimensions of mask.
+
+    Parameters
+    ----------
+    func : callable
+        function to evaluate
+    kw4Func : dict
+        arguments for func
+    mask : xr.DataArray
+        boolean mask
+
+    Returns
+    -------
+    thisProperty
+        xr.DataArray
+    """
+    dataArrays = [v for v in kw4Func.values() if isinstance(v, xr.DataArray)]
+    argDims = set(d for v in dataArrays for d in v.dims)
+    maskDims = [d for d in mask.dims if d in argDims]
+    if (
+        (len(maskDims) == 0) or
+        any(isinstance(v.data, dask.array.Array) for v in dataArrays)
+    ):
+        return func(**kw4Func)
+
+    mask = mask.any([d for d in mask.dims if d not in maskDims])
+    flattener = helpers.DimensionFlattener(mask, maskDims, dim='sparse')
+    index = np.flatnonzero(flattener.flatten(mask).values)
+    if len(index) == flattener.size:
+        return func(**kw4Func)
+
+    # evaluate at least one element to get the shape of the result
+    evalIndex = index if len(index) > 0 else [0]
+    compactKw4Func = {}
+    for k, v in kw4Func.items():
+        if isinstance(v, xr.DataArray) and any(d in v.dims for d in maskDims):
+            v = flattener.flatten(v).isel(sparse=evalIndex)
+        compactKw4Func[k] = v
+    compact = func(**compactKw4Func)
+
+    if not (isinstance(compact, xr.DataArray) and ('sparse' in compact.dims)):
+        return func(**kw4Func)
+
+    otherDims = [d for d in compact.dims if d != 'sparse']
+    compact = compact.transpose('sparse', *otherDims)
+    data = np.zeros((flattener.size,) + compact.shape[1:],
+                    dtype=compact.dtype)
+    data[index] = compact.values[:len(index)]
+    full = xr.DataArray(
+        data,
+        dims=compact.dims,
+        coords={k: v for k, v in compact.coords.items()
+                if 'sparse' not in v.dims},
+        attrs=compact.attrs,
+    )
+    full = flattener.unflatten(full)
+
+    # restore order of dimensions as obtained when broadcasting the args
+    argDims = []
+    for v in dataArrays:
+        argDims += [d for d in v.dims if d not in argDims]
+    order = [d for d in argDims if d in full.dims]
+    order += [d for d in full.dims if d not in order]
+    return full.transpose(*order)
+
+
+@functools.lru_cache(maxsize=None)
+def _cachedFuncSignature(func):
+    return _inspectFuncSignature(func)
+
+
+def _inspectFuncSignature(func):
+    argNames = []
+    defaults = {}
+    for name, parameter in inspect.signature(func).parameters.items():
+        if parameter.kind in (parameter.VAR_POSITIONAL,
+                              parameter.VAR_KEYWORD):
+            continue
+        argNames.append(name)
+        if parameter.default is not parameter.empty:
+            defaults[name] = parameter.default
+    return tuple(argNames), defaults
+
+
+def _funcSignature(func):
+    """Names of the arguments of func and their defaults. The result is
+    cached, so every function is inspected only once.
+
+    Returns
+    -------
+    argNames : tuple of str
+        names of all arguments except *args and **kwargs
+    defaults : dict
+        default values of the arguments. Do not modify.
+    """
+    try:
+        return _cachedFuncSignature(func)
+    except TypeError:
+        # unhashable callable
+        return _inspectFuncSignature(func)
+
+
 class hydrometeor(object):
     """generic class to store hydrometeor properties.
 
@@ -46,6 +178,14 @@ class hydrometeor(object):
             if parameters are not found in any kwarg, discreteProperties,
             parent's profile, then fall back to default values of the function.
             Helpful for debugging. default True.
+        sparse : bool, optional
+            Evaluate the properties in SPARSE_PROPERTIES (permittivity,
+            scattering, fall velocity) only where numberConcentration is
+            larger than zero. Elsewhere, they are set to zero. Requires
+            numpy arrays, not dask. default False.
+        validation : {'full', 'sampled', 'off'}, optional
+            validation policy used by `solve`, see `pamtra2.validation`.
+            default None, i.e. the global policy.
         **kwargs :
             All properties of the hydrometeor. Most hydrometeors require at
             least 'sizeCenter', 'aspectRatio', 'mass', 'density',
@@ -73,6 +213,9 @@ class hydrometeor(object):
             All properties of the hydrometeor. Most hydrometeors require at
             least 'sizeCenter', 'aspectRatio', 'mass', 'density',
             'crossSectionArea', and 'numberConcentration'.
+        calculationGraph : OrderedDict
+            For every property estimated by `solve`, the list of other
+            properties it depends on.
 
     """
 
@@ -83,10 +226,14 @@ class hydrometeor(object):
         discreteProperties=None,
         calculationOrder=None,
         useFuncArgDefaults=True,
+        sparse=False,
+        validation=None,
         **kwargs
     ):
 
         self.calculationOrder = calculationOrder
+        self.sparse = sparse
+        self.validation = validation
         # self.funcArgs = funcArgs
         self.useFuncArgDefaults = useFuncArgDefaults
         self.description = kwargs
@@ -128,6 +275,36 @@ class hydrometeor(object):
         merged = xr.merge((profile, parent))
         return merged
 
+    def getProfileWithParent(
+        self,
+        variables=None,
+        parentVariables=None,
+    ):
+        """Merge the hydrometeor's profile with the parent's profile without
+        broadcasting. In contrast to `getProfileWithParentAllBroadcasted`,
+        every variable keeps its own dimensions, e.g. sizeCenter typically
+        depends only on sizeBin. Broadcasting is left to the consumer.
+
+        Parameters
+        ----------
+        variables : list of str, optional
+            variables of the hydrometeor's profile (default all)
+        parentVariables : list of str, optional
+            variables of the parent's profile (default all)
+
+        Returns
+        -------
+        merged : xr.Dataset
+        """
+        profile = self.profile
+        if variables is not None:
+            profile = profile[variables]
+        parent = self._parentProfile
+        if parentVariables is not None:
+            parent = parent[parentVariables]
+        merged = xr.merge((profile, parent))
+        return merged
+
     @property
     def _parentProfile(self):
         """Helper function
@@ -140,6 +317,282 @@ class hydrometeor(object):
         """
         return self._parentFull.profile.sel(hydrometeor=self.name, drop=True)
 
+    def _bindFuncArgs(self, thisKey, func, profileKeys, parentKeys,
+                      fixedKeys=()):
+        """Helper function finding where the arguments of a function are
+        found. Only the names are used, no data is accessed.
+
+        Parameters
+        ----------
+        thisKey : str
+            name of the property estimated by func
+        func : callable
+            function estimating the property
+        profileKeys : list of str
+            properties of the hydrometeor's profile which can be used.
+        parentKeys : list of str
+            variables of parent's profile.
+        fixedKeys : list of str, optional
+            additional parameters for the function not defined elsewhere
+
+        Returns
+        -------
+        binding : list of tuple
+            (name, source) for every argument of func. Source is one of
+            'profile', 'parentProfile', 'description', 'fixedKwargs' or
+            'default'.
+        """
+        argNames, funcDefaults = _funcSignature(func)
+
+        binding = []
+        for k in argNames:
+            if k in profileKeys:
+                source = 'profile'
+            elif k in parentKeys:
+                source = 'parentProfile'
+            elif k in self.description.keys():
+                source = 'description'
+            elif k in fixedKeys:
+                source = 'fixedKwargs'
+            elif self.useFuncArgDefaults and (k in funcDefaults.keys()):
+                source = 'default'
+            else:
+                raise KeyError('Did not find %s in provided kwargs or '
+                               'discreteProperties or profile or '
+                               'functions\'s defaultArgs for '
+                               ' %s' % (k, thisKey))
+            binding.append((k, source))
+        return binding
+
+    def _collectFuncArgs(self, func, binding, profile, parentProfile,
+                         fixedKwargs={}):
+        """Helper function collecting the arguments of a function as found
+        by `_bindFuncArgs`.
+
+        Parameters
+        ----------
+        func : callable
+            function estimating the property
+        binding : list of tuple
+            (name, source) for every argument of func
+        profile : xr.Dataset or dict
+            properties of the hydrometeor
+        parentProfile : xr.Dataset
+            parent's profile for this hydrometeor
+        fixedKwargs : dict, optional
+            additional parameters for the function not defined elsewhere
+
+        Returns
+        -------
+        kw4Func : dict
+            arguments for func
+        """
+        kw4Func = {}
+        for k, source in binding:
+            if source == 'profile':
+                kw4Func[k] = profile[k]
+            elif source == 'parentProfile':
+                kw4Func[k] = parentProfile[k]
+            elif source == 'description':
+                kw4Func[k] = self.description[k]
+                try:
+                    self._keysToBeUsed.remove(k)
+                except ValueError:
+                    pass
+            elif source == 'fixedKwargs':
+                kw4Func[k] = fixedKwargs[k]
+            else:
+                kw4Func[k] = _funcSignature(func)[1][k]
+        return kw4Func
+
+    def _resolveFuncArgs(self, thisKey, func, profileKeys=None,
+                         **fixedKwargs):
+        """Helper function collecting the arguments of a function.
+
+        Parameters
+        ----------
+        thisKey : str
+            name of the property estimated by func
+        func : callable
+            function estimating the property
+        profileKeys : list of str, optional
+            properties of the hydrometeor's profile which can be used. If
+            None, all properties in profile are used (default None).
+        **fixedKwargs :
+            additional parameters for the function not defined elsewhere
+
+        Returns
+        -------
+        kw4Func : dict
+            arguments for func
+        sources : dict
+            where each argument was found, one of 'profile',
+            'parentProfile', 'description', 'fixedKwargs' or 'default'.
+        """
+        parentProfile = self._parentProfile
+        if profileKeys is None:
+            profileKeys = self.profile.keys()
+        binding = self._bindFuncArgs(
+            thisKey, func, profileKeys, parentProfile.keys(),
+            fixedKwargs.keys())
+        kw4Func = self._collectFuncArgs(
+            func, binding, self.profile, parentProfile, fixedKwargs)
+        return kw4Func, dict(binding)
+
+    def _executionPlan(self, parentKeys):
+        """Helper function providing the execution plan of `solve`.
+
+        The plan lists for every property of `calculationOrder` whether it
+        is described and where the arguments of its function are found. It
+        is built once and only rebuilt if `calculationOrder`, the functions
+        in `description`, the variables of parent's profile or
+        `useFuncArgDefaults` changed, so `solve` does not need to inspect
+        any function.
+
+        Parameters
+        ----------
+        parentKeys : list of str
+            variables of parent's profile.
+
+        Returns
+        -------
+        plan : list of tuple
+            (key, described, binding) for every property. binding is None
+            for properties which are not functions.
+        """
+        planKey = (
+            tuple(self.calculationOrder),
+            tuple((k, v if callable(v) else None)
+                  for k, v in self.description.items()),
+            tuple(parentKeys),
+            self.useFuncArgDefaults,
+        )
+        if getattr(self, '_plan', None) is not None:
+            if self._plan[0] == planKey:
+                return self._plan[1]
+
+        plan = []
+        profileKeys = []
+        for key in self.calculationOrder:
+            if key not in self.description.keys():
+                plan.append((key, False, None))
+                continue
+            thisDesription = self.description[key]
+            if callable(thisDesription):
+                # only use properties estimated before this one. The
+                # profile contains also results of previous calls of solve.
+                binding = self._bindFuncArgs(
+                    key, thisDesription, profileKeys, parentKeys)
+            else:
+                binding = None
+            plan.append((key, True, binding))
+            profileKeys.append(key)
+
+        self._plan = (planKey, plan)
+        return plan
+
+    def _asProfileVariable(self, thisKey, thisProperty):
+        """Helper function converting a property to the xr.DataArray it
+        would be when stored in and read from `profile`.
+        """
+        if isinstance(thisProperty, xr.DataArray):
+            thisProperty = thisProperty.copy(deep=False)
+        else:
+            thisProperty = xr.DataArray(xr.as_variable(
+                thisProperty, name=thisKey))
+        missingCoords = {
+            d: self.profile.coords[d] for d in thisProperty.dims
+            if (d not in thisProperty.coords) and (d in self.profile.coords)
+        }
+        if len(missingCoords) > 0:
+            thisProperty = thisProperty.assign_coords(**missingCoords)
+        thisProperty.name = thisKey
+        thisProperty.attrs['unit'] = units.units[thisKey]
+        return thisProperty
+
+    def _solveProperty(self, thisKey, thisDesription, binding, profile,
+                       parentProfile, recomputed):
+        """Helper function estimating a property during `solve`. The
+        property is only recalculated if its inputs changed since the last
+        call of `solve`.
+
+        Parameters
+        ----------
+        thisKey : str
+            name of the property
+        thisDesription :
+            function or value or xr.DataArray
+        binding : list of tuple or None
+            (name, source) for every argument of the function, None if
+            thisDesription is not a function.
+        profile : dict
+            properties estimated before during this call of `solve`
+        parentProfile : xr.Dataset
+            parent's profile for this hydrometeor
+        recomputed : set
+            properties recalculated during this call of `solve`. Updated
+            in place.
+
+        Returns
+        -------
+        thisProperty
+            value or xr.DataArray
+        """
+        if binding is not None:
+            try:
+                self._keysToBeUsed.remove(thisKey)
+            except ValueError:
+                pass
+            kw4Func = self._collectFuncArgs(
+                thisDesription, binding, profile, parentProfile)
+        else:
+            binding = []
+            kw4Func = {}
+
+        # properties estimated earlier are tracked via the graph, all other
+        # inputs via their fingerprint.
+        dependencies = [k for k, source in binding if source == 'profile']
+        self.calculationGraph[thisKey] = dependencies
+
+        # in sparse mode, the result depends also on where particles are
+        sparseMask = None
+        if (
+            self.sparse and
+            callable(thisDesription) and
+            (thisKey in SPARSE_PROPERTIES) and
+            ('numberConcentration' in profile)
+        ):
+            sparseMask = profile['numberConcentration'] > 0
+
+        fingerprint = helpers.fingerprint(thisDesription, sorted(
+            (k, v) for k, v in kw4Func.items() if k not in dependencies),
+            sparseMask)
+
+        cached = self._solveCache.get(thisKey)
+        if (
+            (cached is not None) and
+            (cached[0] == fingerprint) and
+            (len(recomputed.intersection(dependencies)) == 0)
+        ):
+            if self._parentFull.verbosity >= 1:
+                print('reusing', thisKey)
+            return cached[1]
+
+        if callable(thisDesription):
+            if self._parentFull.verbosity >= 2:
+                print('kw4Func', kw4Func)
+            if sparseMask is not None:
+                thisProperty = _evaluateSparse(
+                    thisDesription, kw4Func, sparseMask)
+            else:
+                thisProperty = thisDesription(**kw4Func)
+        else:
+            thisProperty = thisDesription
+
+        recomputed.add(thisKey)
+        self._solveCache[thisKey] = (fingerprint, thisProperty)
+        return thisProperty
+
     def _arrayOrFunc(self, thisKey, thisDesription, **fixedKwargs):
         """Helper function calling functions if required.
 
@@ -167,40 +620,7 @@ class hydrometeor(object):
             except ValueError:
                 pass
 
-            # inspect function to get the required arguments
-            argspec = inspect.getargspec(func)
-            funcArgs, funcVarargs, funcKeywords, funcDefaults = argspec
-
-            if funcDefaults is None:
-                funcDefaults = {}
-            else:
-                funcDefaults = dict(
-                    zip(funcArgs[-len(funcDefaults):], funcDefaults))
-
-            # where do we find the required data?
-            kw4Func = {}
-            for k in funcArgs:
-                # if k in self.funcArgs.keys():
-                #     kw4Func[k] = self.funcArgs[k]
-                if k in self.profile.keys():
-                    kw4Func[k] = self.profile[k]
-                elif k in self._parentProfile.keys():
-                    kw4Func[k] = self._parentProfile[k]
-                elif k in self.description.keys():
-                    kw4Func[k] = self.description[k]
-                    try:
-                        self._keysToBeUsed.remove(k)
-                    except ValueError:
-                        pass
-                elif k in fixedKwargs.keys():
-                    kw4Func[k] = fixedKwargs[k]
-                elif self.useFuncArgDefaults and (k in funcDefaults.keys()):
-                    kw4Func[k] = funcDefaults[k]
-                else:
-                    raise KeyError('Did not find %s in provided kwargs or '
-                                   'discreteProperties or profile or '
-                                   'functions\'s defaultArgs for '
-                                   ' %s' % (k, thisKey))
+            kw4Func, _ = self._resolveFuncArgs(thisKey, func, **fixedKwargs)
 
             if self._parentFull.verbosity >= 2:
                 print('kw4Func', kw4Func)
@@ -212,15 +632,39 @@ class hydrometeor(object):
 
         return thisProperty
 
-    def solve(self):
+    def solve(self, incremental=True):
         """Helper function to estimate all discrete properties of a
          hydrometeor
 
+        The dependencies between the properties are derived from the
+        argument names of the functions in `description` and stored in
+        `calculationGraph`. If `incremental` is True, a property is only
+        recalculated if one of its inputs (value or function in
+        `description`, parent's profile, function arguments) or one of the
+        properties it depends on changed since the last call. E.g.,
+        changing `hydrometeorContent` recalculates `numberConcentration`,
+        but not the scattering properties.
+
+        The results (and intermediate results of functions using
+        `pamtra2.validation`) are validated according to the hydrometeor's
+        validation policy.
+
+        Parameters
+        ----------
+        incremental : bool, optional
+            reuse properties from the last call if their inputs did not
+            change (default True)
+
         Returns
         -------
         discreteProperties
             xr.Dataset with results
         """
+        with validation.usePolicy(self.validation):
+            return self._solve(incremental)
+
+    def _solve(self, incremental):
+        """Helper function for `solve`"""
 
         if self._parentFull is None:
             raise AttributeError('set .parent attribute to pamtra2 object')
@@ -235,9 +679,19 @@ class hydrometeor(object):
 
         self._keysToBeUsed = list(self.description.keys())
 
-        for key in self.calculationOrder:
+        if (not incremental) or (not hasattr(self, '_solveCache')):
+            self._solveCache = {}
+        self.calculationGraph = OrderedDict()
+        recomputed = set()
 
-            if key not in self.description.keys():
+        # select parent's data only once
+        parentProfile = self._parentProfile
+        plan = self._executionPlan(list(parentProfile.variables.keys()))
+        results = OrderedDict()
+
+        for key, described, binding in plan:
+
+            if not described:
                 print('Did not find information about %s. This might cause'
                       ' trouble later.' % key)
                 continue
@@ -246,7 +700,8 @@ class hydrometeor(object):
             if self._parentFull.verbosity >= 1:
                 print(key, value)
 
-            thisProperty = self._arrayOrFunc(key, value)
+            thisProperty = self._solveProperty(
+                key, value, binding, results, parentProfile, recomputed)
             if (isinstance(thisProperty, xr.DataArray) and
                     (key in ['sizeCenter', 'sizeBoundsWidth'])):
                 # when sizeCenter and sizeBoundsWidth are estimated from
@@ -272,22 +727,22 @@ class hydrometeor(object):
                         coords=[self.profile.sizeBin1],
                         attrs={'unit': units.units[key]},
                     )
-            self.profile[key] = thisProperty
+            results[key] = self._asProfileVariable(key, thisProperty)
 
-            self.profile[key].attrs.update(
-                {'unit': units.units[key]}
-            )
+        # a single merge is much faster than adding properties one by one
+        self.profile = self.profile.assign(results)
         self._postProcessing()
 
-        self._keysToBeUsed = [x for x in self._keysToBeUsed if x not in
-                              DEFAULT_CALCULATION_ORDER()]
+        self._keysToBeUsed = [
+            x for x in self._keysToBeUsed if x not in
+            DEFAULT_CALCULATION_ORDER() + MOMENT_CALCULATION_ORDER()]
         if len(self._keysToBeUsed) > 0:
             warnings.warn('The following kwargs were NOT used: '
                           '%s' % self._keysToBeUsed)
 
         # Apply units
-        for k in self.profile.variables:
-            self.profile[k].attrs['unit'] = units.units[k]
+        for k, variable in self.profile.variables.items():
+            variable.attrs['unit'] = units.units[k]
 
         # test results
         varsGreaterZero = [
@@ -309,14 +764,28 @@ class hydrometeor(object):
         varsGreaterEqualZero = [
             'numberConcentration',
         ]
-
-        for key in varsGreaterZero:
-            if key in self.profile.keys():
-                assert (self.profile[key] > 0).all()
-
-        for key in varsGreaterEqualZero:
-            if key in self.profile.keys():
-                assert (self.profile[key] >= 0).all()
+        if self.sparse:
+            # zero where no particles are
+            sparseVars = [
+                'relativePermittivity',
+                'fallVelocity',
+                'extinctionCrossSection',
+                'scatterCrossSection',
+                'absorptionCrossSection',
+                'backscatterCrossSection',
+            ]
+            varsGreaterZero = [
+                k for k in varsGreaterZero if k not in sparseVars]
+            varsGreaterEqualZero += sparseVars
+
+        checks = [
+            (key, self.profile[key], 'greaterZero')
+            for key in varsGreaterZero if key in self.profile.keys()
+        ] + [
+            (key, self.profile[key], 'greaterEqualZero')
+            for key in varsGreaterEqualZero if key in self.profile.keys()
+        ]
+        validation.check(checks)
 
         return self.profile
 
@@ -339,7 +808,8 @@ class hydrometeor(object):
             )
 
         self.profile = self.profile.drop('scattering')
-        self.profile = self.profile.merge(scatteringProperty)
+        # overwrite results of previous calls of solve
+        self.profile.update(scatteringProperty)
 
         return
 
@@ -561,6 +1031,7 @@ class rain(softEllipsoidFixedDensity):
         kwargs['aspectRatio'] = aspectRatio
         kwargs['Dmin'] = Dmin
         kwargs['Dmax'] = Dmax
+        kwargs['N0'] = N0
 
         defaultArgs.update(kwargs)
 
@@ -711,3 +1182,119 @@ class snow(softEllipsoidMassSize):
         defaultArgs.update(kwargs)
 
         return super().__init__(*args, **defaultArgs)
+
+
+class momentHydrometeor(hydrometeor):
+    """bin-free hydrometeor class for the Rayleigh regime.
+
+        The size distribution is a truncated modified gamma distribution
+        N(D) = N0 * D**mu * exp(-lambd * D**gamma) between Dmin and Dmax
+        (exponential: mu = 0, gamma = 1; gamma: gamma = 1). The integrals
+        over the size distribution are evaluated analytically (see
+        `moments`) and stored in a single effective size bin, so no size
+        bins need to be resolved. numberConcentration is the total number
+        concentration, the cross sections are the means per particle and
+        fallVelocity is the reflectivity weighted mean. Scattering follows
+        the Rayleigh approximation for mass equivalent spheres with the
+        mass-size relation m = massSizeA * D**massSizeB.
+
+        The integrated cross sections (e.g. for simpleRadar) are exact, but
+        the spectral radar simulator requires size bins.
+
+        Parameters
+        ----------
+        parent : pamtra2 object
+            content of parent's class
+        name : str, optional
+            name of the hydrometeor
+        N0 : float or array_like, optional
+            N0 pre-factor (default 8e6)
+        lambd : float, array_like or func, optional
+            lambda parameter. default: moments.lambdFromContent which
+            requires hydrometeorContent either as kwarg or in pamtra2's
+            profile
+        mu : float or array_like, optional
+            mu parameter (default 0)
+        gamma : float or array_like, optional
+            gamma parameter (default 1)
+        Dmin : float, optional
+            Smallest boundary of size distribution. (default 0)
+        Dmax : float, optional
+            Largest boundary of size distribution. (default inf)
+        massSizeA : float, optional
+            pre-factor mass-size power law (default water spheres)
+        massSizeB : float, optional
+            exponent mass-size power law (default water spheres)
+        density : float, optional
+            density of the material of the mass equivalent spheres
+            (default density.water)
+        relativePermittivity : func, optional
+            relative permittivity of the material. default:
+            relativePermittivity.water_turner_kneifel_cadeddu
+        velocitySizeA : float, optional
+            pre-factor velocity-size power law (default 386.6, Atlas and
+            Ulbrich 1977 for rain)
+        velocitySizeB : float, optional
+            exponent velocity-size power law (default 0.67)
+        sparse : bool, optional
+            Evaluate permittivity, scattering and fall velocity only where
+            numberConcentration is larger than zero. (default True)
+        **kwargs :
+            Further properties if required.
+
+        Attributes
+        ----------
+        name : str, optional
+            name of the hydrometeor
+        description : dict
+            All properties of the hydrometeor.
+
+    """
+
+    def __init__(
+        self,
+        *args,
+        N0=8.e6,
+        lambd=moments.lambdFromContent,
+        mu=0.,
+        gamma=1.,
+        Dmin=0.,
+        Dmax=np.inf,
+        massSizeA=mass.powerLawLiquidPrefactor,
+        massSizeB=mass.powerLawLiquidExponent,
+        density=density.water,
+        relativePermittivity=relativePermittivity.
+        water_turner_kneifel_cadeddu,
+        velocitySizeA=386.6,
+        velocitySizeB=0.67,
+        sparse=True,
+        **kwargs
+    ):
+        if kwargs.pop('nBins', 1) != 1:
+            raise ValueError('momentHydrometeor has a single size bin')
+        kwargs.setdefault('discreteProperties', xr.Dataset(
+            coords=dict(sizeBin=range(1), sizeBin1=range(2))))
+
+        defaultArgs = {}
+        defaultArgs['numberConcentration'] = moments.numberConcentration
+        defaultArgs['scattering'] = moments.Rayleigh
+        defaultArgs['fallVelocity'] = moments.fallVelocityPowerLaw
+
+        kwargs['N0'] = N0
+        kwargs['lambd'] = lambd
+        kwargs['mu'] = mu
+        kwargs['gamma'] = gamma
+        kwargs['Dmin'] = Dmin
+        kwargs['Dmax'] = Dmax
+        kwargs['massSizeA'] = massSizeA
+        kwargs['massSizeB'] = massSizeB
+        kwargs['density'] = density
+        kwargs['relativePermittivity'] = relativePermittivity
+        kwargs['velocitySizeA'] = velocitySizeA
+        kwargs['velocitySizeB'] = velocitySizeB
+        if 'calculationOrder' not in kwargs.keys():
+            kwargs['calculationOrder'] = MOMENT_CALCULATION_ORDER()
+
+        defaultArgs.update(kwargs)
+
+        return super().__init__(*args, sparse=sparse, **defaultArgs)
@@ -1,8 +1,7 @@
 # -*- coding: utf-8 -*-
 import numpy as np
 
-# if this is too slow think about implementing @vectorize
-# https://numba.pydata.org/numba-doc/dev/user/vectorize.html
+from . import kernels
 
 
 def powerLaw(sizeCenter, areaSizeA, areaSizeB):
@@ -23,6 +22,10 @@ def powerLaw(sizeCenter, areaSizeA, areaSizeB):
         cross section area
     """
 
+    if kernels.compiled():
+        return kernels.evaluate(
+            kernels.powerLaw, sizeCenter, areaSizeA, areaSizeB)
+
     area = areaSizeA*sizeCenter**areaSizeB
 
     return area
@@ -1,6 +1,7 @@
 # -*- coding: utf-8 -*-
 import numpy as np
 
+from . import kernels
 from .. import constants
 
 # input names are not arbritrary and have to follow Pamtra2 defaults!
@@ -29,6 +30,11 @@ def softEllipsoid(sizeCenter, aspectRatio, mass, minDensity=100,
         density of hydrometeor
     """
 
+    if kernels.compiled():
+        return kernels.evaluate(
+            kernels.softEllipsoidDensity, sizeCenter, aspectRatio, mass,
+            minDensity, maxDensity)
+
     if np.all(aspectRatio <= 1):
         density = softOblateEllipsoid(
             sizeCenter, aspectRatio, mass,
@@ -37,7 +43,7 @@ def softEllipsoid(sizeCenter, aspectRatio, mass, minDensity=100,
             )
     elif np.all(aspectRatio > 1):
         density = softProlateEllipsoid(
-            sizeCenter, mass, minDensity=minDensity,
+            sizeCenter, aspectRatio, mass, minDensity=minDensity,
             maxDensity=maxDensity
             )
     else:
@@ -46,7 +52,7 @@ def softEllipsoid(sizeCenter, aspectRatio, mass, minDensity=100,
             maxDensity=maxDensity
             )
         density[aspectRatio > 1] = softProlateEllipsoid(
-            sizeCenter, mass,
+            sizeCenter, aspectRatio, mass,
             minDensity=minDensity, maxDensity=maxDensity
             )[aspectRatio > 1]
 
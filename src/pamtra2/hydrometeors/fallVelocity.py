@@ -1,12 +1,10 @@
 # -*- coding: utf-8 -*-
 import numpy as np
 
-# from numba import vectorize, float64, float32
+from . import kernels
 from .. import constants
 
 
-# @vectorize([float32(float32, float32, float32, float32, float32),
-#             float64(float64, float64, float64, float64, float64)])
 def heymsfield10_particles(
     sizeCenter,
     mass,
@@ -15,6 +13,11 @@ def heymsfield10_particles(
     dryAirDensity,
 ):
 
+    if kernels.compiled():
+        return kernels.evaluate(
+            kernels.heymsfield10_particles, sizeCenter, mass,
+            crossSectionArea, dynamicViscosity, dryAirDensity)
+
     k = 0.5  # defined in the paper
     delta_0 = 8.0
     C_0 = 0.35
@@ -33,14 +36,17 @@ def heymsfield10_particles(
     return velSpec
 
 
-# @vectorize([float32(float32, float32, float32),
-#             float64(float64, float64, float64)])
 def khvorostyanov01_drops(
     sizeCenter,
     dryAirDensity,
     kinematicViscosity,
 ):
 
+    if kernels.compiled():
+        return kernels.evaluate(
+            kernels.khvorostyanov01_drops, sizeCenter, dryAirDensity,
+            kinematicViscosity)
+
     # variables to cgs...
     rho_water_cp = constants.rhoWater/1000.  # g/cm³
     g_cp = constants.gravitation*100.  # cm/s
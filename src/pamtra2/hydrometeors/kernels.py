@@ -0,0 +1,191 @@
+# -*- coding: utf-8 -*-
+"""Compiled element-wise kernels of the per-bin microphysical properties.
+
+With the 'numba' backend, `mass`, `crossSectionArea`, `density` and
+`fallVelocity` functions evaluate their equations in a single compiled loop
+over all elements instead of a chain of numpy expressions with one
+temporary array per operation. The kernels are scalar functions compiled
+to numpy ufuncs with numba.vectorize on first use, so they broadcast like
+numpy and work with xr.DataArray and dask arrays.
+
+The backend determines which implementation is used:
+
+'numpy'
+    numpy expressions (default)
+'numba'
+    compiled kernels, requires numba
+
+Examples
+--------
+>>> pamtra2.hydrometeors.kernels.setBackend('numba')
+>>> with pamtra2.hydrometeors.kernels.useBackend('numpy'):
+...     pam2.hydrometeors.rain.solve()
+"""
+import contextlib
+import functools
+import inspect
+import math
+
+from .. import constants
+
+try:
+    import numba
+except ImportError:
+    numba = None
+
+BACKENDS = ['numpy', 'numba']
+
+_backend = 'numpy'
+
+
+def getBackend():
+    """Current global backend of the microphysical properties."""
+    return _backend
+
+
+def setBackend(backend):
+    """Set the global backend of the microphysical properties.
+
+    Parameters
+    ----------
+    backend : {'numpy', 'numba'}
+        backend
+    """
+    global _backend
+    _checkBackend(backend)
+    _backend = backend
+
+
+@contextlib.contextmanager
+def useBackend(backend):
+    """Context manager temporarily changing the global backend.
+
+    Parameters
+    ----------
+    backend : {'numpy', 'numba'} or None
+        backend. If None, the global backend is not changed.
+    """
+    if backend is None:
+        yield
+        return
+    previous = getBackend()
+    setBackend(backend)
+    try:
+        yield
+    finally:
+        setBackend(previous)
+
+
+def _checkBackend(backend):
+    if backend not in BACKENDS:
+        raise ValueError('Do not understand backend %s. Must be one of %s' %
+                         (backend, BACKENDS))
+    if (backend == 'numba') and (numba is None):
+        raise ImportError('backend numba requires numba')
+
+
+def compiled():
+    """True if the compiled kernels are to be used."""
+    return _backend == 'numba'
+
+
+@functools.lru_cache(maxsize=None)
+def _ufunc(kernel):
+    nArgs = len(inspect.signature(kernel).parameters)
+    signature = 'float64(%s)' % ', '.join(['float64'] * nArgs)
+    return numba.vectorize([signature])(kernel)
+
+
+def evaluate(kernel, *args):
+    """Evaluate a kernel element-wise, compiling it on first use.
+
+    Parameters
+    ----------
+    kernel : callable
+        scalar kernel of this module
+    *args : array_like
+        arguments of kernel, broadcasted like numpy. Can be numpy, dask or
+        xr.DataArray.
+
+    Returns
+    -------
+    array_like
+        result with the broadcasted shape of args
+    """
+    return _ufunc(kernel)(*args)
+
+
+def powerLaw(sizeCenter, prefactor, exponent):
+    """prefactor * sizeCenter**exponent, see mass.powerLaw"""
+    return prefactor * sizeCenter**exponent
+
+
+def massEllipsoid(sizeCenter, aspectRatio, density):
+    """see mass.ellipsoid"""
+    if aspectRatio <= 1:
+        volume = math.pi / 6 * sizeCenter * sizeCenter * (
+            sizeCenter * aspectRatio)
+    else:
+        A = sizeCenter / aspectRatio
+        volume = math.pi / 6 * A * A * sizeCenter
+    return volume * density
+
+
+def softEllipsoidDensity(sizeCenter, aspectRatio, mass, minDensity,
+                         maxDensity):
+    """see density.softEllipsoid"""
+    if aspectRatio <= 1:
+        density = (6. * mass) / (math.pi * sizeCenter**3 * aspectRatio)
+    else:
+        density = (6. * mass * aspectRatio**2) / (math.pi * sizeCenter**3)
+    if density < minDensity:
+        density = minDensity
+    elif density > maxDensity:
+        density = maxDensity
+    return density
+
+
+def heymsfield10_particles(sizeCenter, mass, crossSectionArea,
+                           dynamicViscosity, dryAirDensity):
+    """see fallVelocity.heymsfield10_particles"""
+    k = 0.5
+    delta_0 = 8.0
+    C_0 = 0.35
+    g = constants.gravitation
+
+    area_proj = crossSectionArea / ((math.pi / 4.) * sizeCenter**2)
+    Xstar = 8. * dryAirDensity * mass * g / (
+        math.pi * area_proj**(1. - k) * dynamicViscosity**2)
+    Re = delta_0**2 / 4. * (math.sqrt(
+        1. + 4. * math.sqrt(Xstar) / (delta_0**2 * math.sqrt(C_0))) - 1)**2
+    return dynamicViscosity * Re / (dryAirDensity * sizeCenter)
+
+
+def khvorostyanov01_drops(sizeCenter, dryAirDensity, kinematicViscosity):
+    """see fallVelocity.khvorostyanov01_drops"""
+    rho_water_cp = constants.rhoWater / 1000.
+    g_cp = constants.gravitation * 100.
+    dryAirDensity_cp = dryAirDensity / 1000.
+    sizeCenter_cp = 100. * sizeCenter
+    kinematicViscosity_cp = kinematicViscosity * 10000.
+    c1 = 0.0902
+    delta0 = 9.06
+    lam = 0.47
+
+    expD = math.exp(-sizeCenter_cp / lam)
+    xi = expD + (1. - expD) * (1. / (1. + (sizeCenter_cp / lam)))
+    # 2 * vB * D**2 / A with volume vB and area A of the sphere
+    X = 4. / 3. * xi * sizeCenter_cp**3 * (
+        rho_water_cp - dryAirDensity_cp) * g_cp / (
+        dryAirDensity_cp * kinematicViscosity_cp**2)
+
+    sqrtX = math.sqrt(X)
+    root = math.sqrt(1. + c1 * sqrtX)
+    bRe = 0.5 * c1 * sqrtX / ((root - 1.) * root)
+    aRe = (delta0**2 / 4.) * (root - 1.)**2 / X**bRe
+
+    velSpec = aRe * kinematicViscosity_cp**(1 - 2 * bRe) * (
+        4. / 3. * g_cp * xi * (
+            (rho_water_cp - dryAirDensity_cp) / dryAirDensity_cp)
+    )**bRe * sizeCenter_cp**(3 * bRe - 1)
+    return velSpec / 100.
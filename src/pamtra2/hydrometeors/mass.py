@@ -1,13 +1,11 @@
 # -*- coding: utf-8 -*-
 import numpy as np
 
+from . import kernels
 from .. import constants
 
 # input names are not arbritrary and have to follow Pamtra2 defaults!
 
-# if this is too slow think about implementing @vectorize
-# https://numba.pydata.org/numba-doc/dev/user/vectorize.html
-
 powerLawLiquidPrefactor = np.pi/6 * constants.rhoWater
 powerLawIcePrefactor = np.pi/6 * constants.rhoIce
 
@@ -67,6 +65,10 @@ def powerLaw(sizeCenter, massSizeA, massSizeB):
         particle mass
     """
 
+    if kernels.compiled():
+        return kernels.evaluate(
+            kernels.powerLaw, sizeCenter, massSizeA, massSizeB)
+
     m = massSizeA*sizeCenter**massSizeB
 
     return m
@@ -90,6 +92,10 @@ def ellipsoid(sizeCenter, aspectRatio, density):
         particle mass
     """
 
+    if kernels.compiled():
+        return kernels.evaluate(
+            kernels.massEllipsoid, sizeCenter, aspectRatio, density)
+
     if np.all(aspectRatio <= 1):
         mass = oblateEllipsoid(
             sizeCenter, aspectRatio, density)
@@ -98,9 +104,9 @@ def ellipsoid(sizeCenter, aspectRatio, density):
             sizeCenter, aspectRatio, density)
     else:
         mass = oblateEllipsoid(
-            sizeCenter, aspectRatio, density)
+            sizeCenter, np.minimum(aspectRatio, 1), density)
         mass[aspectRatio > 1] = prolateEllipsoid(
-            sizeCenter, aspectRatio, density)[aspectRatio > 1]
+            sizeCenter, np.maximum(aspectRatio, 1), density)[aspectRatio > 1]
     return mass
 
 
@@ -0,0 +1,276 @@
+# -*- coding: utf-8 -*-
+"""Bin-free properties of hydrometeors in the Rayleigh regime.
+
+For a modified gamma distribution
+
+    N(D) = N0 * D**mu * exp(-lambd * D**gamma)
+
+truncated at Dmin and Dmax, all moments have closed forms with incomplete
+gamma functions. The exponential (mu = 0, gamma = 1) and gamma
+(gamma = 1) distributions are special cases. Together with Rayleigh
+scattering of mass equivalent spheres and a power law mass-size relation
+m = massSizeA * D**massSizeB, the integrals over the size distribution
+required by the instruments can be evaluated without size bins.
+
+The functions are used by `momentHydrometeor`, which represents the whole
+distribution by a single effective size bin: numberConcentration is the
+total number concentration, the cross sections are the means per particle
+and fallVelocity is the reflectivity weighted mean. Summing cross section
+times number concentration over the bin yields the integrated cross
+sections.
+"""
+import numpy as np
+import scipy.special
+import xarray as xr
+
+from . import scattering
+
+
+def _truncation(s, lambd, gamma, Dmin, Dmax):
+    """Fraction of the complete gamma function Gamma(s) between Dmin and
+    Dmax. Uses the upper incomplete gamma function if the lower one is
+    close to one to avoid cancellation."""
+    xMin = lambd * Dmin**gamma
+    xMax = lambd * Dmax**gamma
+    lower = scipy.special.gammainc(s, xMax) - scipy.special.gammainc(s, xMin)
+    upper = scipy.special.gammaincc(s, xMin) - \
+        scipy.special.gammaincc(s, xMax)
+    return xr.where(xMin > s, upper, lower)
+
+
+def truncatedMoment(order, N0, lambd, mu, gamma, Dmin=0., Dmax=np.inf):
+    """Moment of the truncated modified gamma distribution
+
+    Parameters
+    ----------
+    order : float or array_like
+        order k of the moment, i.e. integral of D**k * N(D)
+    N0 : array_like
+        N0 pre-factor
+    lambd : array_like
+        lambda parameter
+    mu : float or array_like
+        mu parameter
+    gamma : float or array_like
+        gamma parameter
+    Dmin : float or array_like, optional
+        smallest size (default 0)
+    Dmax : float or array_like, optional
+        largest size (default inf)
+
+    Returns
+    -------
+    moment : array_like
+        moment [m^(order-3)]. Zero where the distribution is empty.
+    """
+    s = (mu + order + 1.) / gamma
+    truncation = _truncation(s, lambd, gamma, Dmin, Dmax)
+    moment = N0 / gamma * lambd**(-s) * scipy.special.gamma(s) * truncation
+    return xr.where(truncation > 0, moment, 0.)
+
+
+def momentRatio(order, referenceOrder, lambd, mu, gamma, Dmin=0.,
+                Dmax=np.inf):
+    """Ratio of two moments of the truncated modified gamma distribution,
+    i.e. the mean of D**(order - referenceOrder) weighted with
+    D**referenceOrder * N(D). Does not depend on N0.
+
+    Parameters
+    ----------
+    order : float or array_like
+        order of the numerator
+    referenceOrder : float or array_like
+        order of the denominator
+    lambd : array_like
+        lambda parameter
+    mu : float or array_like
+        mu parameter
+    gamma : float or array_like
+        gamma parameter
+    Dmin : float or array_like, optional
+        smallest size (default 0)
+    Dmax : float or array_like, optional
+        largest size (default inf)
+
+    Returns
+    -------
+    ratio : array_like
+        moment ratio [m^(order-referenceOrder)]. Zero where the
+        distribution is empty.
+    """
+    s = (mu + order + 1.) / gamma
+    s0 = (mu + referenceOrder + 1.) / gamma
+    truncation0 = _truncation(s0, lambd, gamma, Dmin, Dmax)
+    ratio = lambd**(-(order - referenceOrder) / gamma) * np.exp(
+        scipy.special.gammaln(s) - scipy.special.gammaln(s0)
+    ) * _truncation(s, lambd, gamma, Dmin, Dmax) / truncation0
+    return xr.where(truncation0 > 0, ratio, 0.)
+
+
+def _asSizeBin(value):
+    """Add the single effective size bin to value"""
+    if not isinstance(value, xr.DataArray):
+        value = xr.DataArray(value)
+    return value.expand_dims('sizeBin', axis=value.ndim)
+
+
+def lambdFromContent(hydrometeorContent, N0, mu, gamma, massSizeA,
+                     massSizeB):
+    """lambda of the modified gamma distribution from the hydrometeor
+    content and N0. As in numberConcentration.exponentialN0WC, truncation
+    is not considered.
+
+    Parameters
+    ----------
+    hydrometeorContent : array_like
+        hydrometeor water content [kg/m^3]
+    N0 : array_like
+        N0 pre-factor
+    mu : float or array_like
+        mu parameter
+    gamma : float or array_like
+        gamma parameter
+    massSizeA : float or array_like
+        pre-factor mass-size power law
+    massSizeB : float or array_like
+        exponent mass-size power law
+
+    Returns
+    -------
+    lambd : array_like
+        lambda parameter. inf for zero hydrometeor content.
+    """
+    s = (mu + massSizeB + 1.) / gamma
+    with np.errstate(divide='ignore'):
+        lambd = (massSizeA * N0 * scipy.special.gamma(s) /
+                 (gamma * hydrometeorContent))**(1. / s)
+    return lambd
+
+
+def numberConcentration(N0, lambd, mu, gamma, Dmin, Dmax):
+    """total number concentration of the truncated modified gamma
+    distribution
+
+    Parameters
+    ----------
+    N0 : array_like
+        N0 pre-factor
+    lambd : array_like
+        lambda parameter
+    mu : float or array_like
+        mu parameter
+    gamma : float or array_like
+        gamma parameter
+    Dmin : float or array_like
+        smallest size
+    Dmax : float or array_like
+        largest size
+
+    Returns
+    -------
+    number concentration : xr.DataArray
+        number concentration [1/m3] of the single effective size bin
+    """
+    return _asSizeBin(truncatedMoment(0., N0, lambd, mu, gamma, Dmin, Dmax))
+
+
+def Rayleigh(wavelength, relativePermittivity, lambd, mu, gamma, Dmin, Dmax,
+             massSizeA, massSizeB, density):
+    """mean Rayleigh cross sections per particle of the truncated modified
+    gamma distribution
+
+    The particles are mass equivalent spheres of a material with density
+    `density` and permittivity `relativePermittivity`, i.e. with diameter
+    (6 * m / (pi * density))**(1/3). So, backscattering and scattering
+    cross sections are proportional to D**(2 * massSizeB) and absorption
+    to D**massSizeB. For spheres with mass.ellipsoid and fixed density,
+    the results are identical to scattering.Rayleigh.
+
+    Parameters
+    ----------
+    wavelength : array_like
+        wavelength [m]
+    relativePermittivity : array_like
+        complex relative permittivity of the material
+    lambd : array_like
+        lambda parameter
+    mu : float or array_like
+        mu parameter
+    gamma : float or array_like
+        gamma parameter
+    Dmin : float or array_like
+        smallest size
+    Dmax : float or array_like
+        largest size
+    massSizeA : float or array_like
+        pre-factor mass-size power law
+    massSizeB : float or array_like
+        exponent mass-size power law
+    density : float or array_like
+        density of the material [kg/m^3]
+
+    Returns
+    -------
+    scatteringProperty : xr.DataArray
+        extinction, scattering, absorption and backscattering cross
+        sections [m2] along dimension scatteringProperty
+    """
+    # cross sections of a sphere with a diameter of 1 m
+    unit = scattering.Rayleigh(
+        xr.DataArray(1.), wavelength, relativePermittivity)
+
+    # D_equivalent**3 = volumeFactor * D**massSizeB
+    volumeFactor = 6. * massSizeA / (np.pi * density)
+    meanVolume = volumeFactor * momentRatio(
+        massSizeB, 0., lambd, mu, gamma, Dmin, Dmax)
+    meanVolume2 = volumeFactor**2 * momentRatio(
+        2. * massSizeB, 0., lambd, mu, gamma, Dmin, Dmax)
+
+    scatterCrossSection = unit.isel(scatteringProperty=1) * meanVolume2
+    absorptionCrossSection = unit.isel(scatteringProperty=2) * meanVolume
+    backscatterCrossSection = unit.isel(scatteringProperty=3) * meanVolume2
+    scatteringProperty = xr.concat([
+        absorptionCrossSection + scatterCrossSection,
+        scatterCrossSection,
+        absorptionCrossSection,
+        backscatterCrossSection,
+    ], dim='scatteringProperty')
+    scatteringProperty = _asSizeBin(scatteringProperty)
+    return scatteringProperty.transpose(..., 'scatteringProperty')
+
+
+def fallVelocityPowerLaw(lambd, mu, gamma, Dmin, Dmax, massSizeB,
+                         velocitySizeA, velocitySizeB):
+    """reflectivity weighted fall velocity of the truncated modified gamma
+    distribution for a power law velocity-size relation
+    v = velocitySizeA * D**velocitySizeB. The weights are the Rayleigh
+    backscattering cross sections (see Rayleigh), i.e. D**(2 * massSizeB).
+
+    Parameters
+    ----------
+    lambd : array_like
+        lambda parameter
+    mu : float or array_like
+        mu parameter
+    gamma : float or array_like
+        gamma parameter
+    Dmin : float or array_like
+        smallest size
+    Dmax : float or array_like
+        largest size
+    massSizeB : float or array_like
+        exponent mass-size power law
+    velocitySizeA : float or array_like
+        pre-factor velocity-size power law
+    velocitySizeB : float or array_like
+        exponent velocity-size power law
+
+    Returns
+    -------
+    fallVelocity : xr.DataArray
+        fall velocity [m/s] of the single effective size bin
+    """
+    fallVelocity = velocitySizeA * momentRatio(
+        2. * massSizeB + velocitySizeB, 2. * massSizeB, lambd, mu, gamma,
+        Dmin, Dmax)
+    return _asSizeBin(fallVelocity)
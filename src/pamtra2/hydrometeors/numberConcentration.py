@@ -8,7 +8,7 @@ import scipy.special
 import xarray as xr
 
 from . import mass
-from .. import units
+from .. import units, validation
 
 # input names are not arbritrary and have to follow Pamtra2 defaults!
 
@@ -351,13 +351,11 @@ def _exponentialField(temperature):
     N0
     """
 
-    if np.any(np.isnan(temperature)):
-        raise ValueError('Found NAN in temperature')
+    validation.check([('temperature', temperature, 'notNan')])
 
     N0 = 7.628e6 * np.exp(-0.107 * units.kelvin2Celsius(temperature))
 
-    if np.any(np.isnan(N0)):
-        raise ValueError('Found NAN in N0')
+    validation.check([('N0', N0, 'notNan')])
 
     return N0
 
@@ -384,18 +382,16 @@ def _exponentialWC2Lambda(N0, WC, massSizeA, massSizeB):
     warnings.warn('Truncation effect on the PSD are not considered. '
                   'I.e., typically mass is lost!')
 
-    if np.any(np.isnan(WC)):
-        raise ValueError('Found NAN in WC')
-    if np.any(np.isnan(massSizeA)):
-        raise ValueError('Found NAN in massSizeA')
-    if np.any(np.isnan(massSizeB)):
-        raise ValueError('Found NAN in massSizeB')
+    validation.check([
+        ('WC', WC, 'notNan'),
+        ('massSizeA', massSizeA, 'notNan'),
+        ('massSizeB', massSizeB, 'notNan'),
+    ])
 
     lambd = (massSizeA * N0 * scipy.special.gamma(massSizeB+1.) /
              WC)**(1. / (massSizeB+1.))
 
-    if np.any(np.isnan(lambd)):
-        raise ValueError('Found NAN in lambd')
+    validation.check([('lambd', lambd, 'notNan')])
 
     return lambd
 
@@ -418,12 +414,10 @@ def _exponentialReff2Lambda(effectiveRadius):
 
     raise NotImplementedError('See tests, they fail by a factor of 2?')
 
-    if np.any(np.isnan(effectiveRadius)):
-        raise ValueError('Found NAN in effectiveRadius')
+    validation.check([('effectiveRadius', effectiveRadius, 'notNan')])
 
     lambd = 3. / effectiveRadius
 
-    if np.any(np.isnan(lambd)):
-        raise ValueError('Found NAN in lambd')
+    validation.check([('lambd', lambd, 'notNan')])
 
     return lambd
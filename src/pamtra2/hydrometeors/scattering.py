@@ -1,9 +1,122 @@
 # -*- coding: utf-8 -*-
+import threading
+from functools import partial
+
 import numpy as np
 import xarray as xr
 
 from ..libs import singleScattering
 from .. import constants
+
+
+class DeduplicationCounter(object):
+    """Counts the number of input tuples passed to the scattering
+    dispatcher and the number of unique tuples the kernels were actually
+    called with.
+
+    Attributes
+    ----------
+    nInputs : int
+        number of input tuples
+    nUnique : int
+        number of unique input tuples, i.e. kernel evaluations
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        """Set counters to zero."""
+        with self._lock:
+            self.nInputs = 0
+            self.nUnique = 0
+
+    def add(self, nInputs, nUnique):
+        with self._lock:
+            self.nInputs += nInputs
+            self.nUnique += nUnique
+
+    @property
+    def reductionFactor(self):
+        """Ratio of input tuples to kernel evaluations."""
+        if self.nUnique == 0:
+            return np.nan
+        return self.nInputs / self.nUnique
+
+    def __repr__(self):
+        return ('DeduplicationCounter(nInputs=%i, nUnique=%i, '
+                'reductionFactor=%.3g)' % (
+                    self.nInputs, self.nUnique, self.reductionFactor))
+
+
+deduplicationCounter = DeduplicationCounter()
+
+
+def dispatchUnique(kernel, *args, elementwise=False, **kwargs):
+    """Call a scattering kernel only once for every unique tuple of inputs.
+
+    The inputs are broadcasted against each other and collapsed to their
+    unique set of tuples. The kernel is evaluated for the unique tuples
+    only and the results are scattered back via an index array. For
+    hydrometeors with a fixed size grid, the inputs repeat massively along
+    the additional and layer dimensions. The achieved reduction is recorded
+    in `deduplicationCounter`.
+
+    Parameters
+    ----------
+    kernel : callable
+        scattering kernel returning an array with trailing dimension
+        scatteringProperty.
+    *args : array_like
+        inputs of the kernel
+    elementwise : bool, optional
+        kernel accepts only scalar inputs and is called once for every
+        unique tuple. Otherwise, it is called once with 1D arrays of all
+        unique tuples (default False).
+    **kwargs :
+        passed to kernel
+
+    Returns
+    -------
+    scatteringProperty : array_like
+        results with shape of broadcasted args plus trailing dimension
+        scatteringProperty.
+    """
+    args = np.broadcast_arrays(*args)
+    shape = args[0].shape
+    flatArgs = [np.ravel(arg) for arg in args]
+    nInputs = flatArgs[0].size
+
+    # complex numbers cannot be sorted along an axis, so use real and
+    # imaginary part as separate columns
+    columns = []
+    for arg in flatArgs:
+        if np.iscomplexobj(arg):
+            columns += [arg.real, arg.imag]
+        else:
+            columns.append(arg.astype(np.float64))
+    _, firstIndex, inverse = np.unique(
+        np.stack(columns, axis=-1),
+        axis=0,
+        return_index=True,
+        return_inverse=True,
+    )
+    uniqueArgs = [arg[firstIndex] for arg in flatArgs]
+    deduplicationCounter.add(nInputs, len(firstIndex))
+
+    if elementwise:
+        uniqueResults = np.stack([
+            kernel(*uniqueArg, **kwargs) for uniqueArg in zip(*uniqueArgs)
+        ])
+    else:
+        uniqueResults = kernel(*uniqueArgs, **kwargs)
+    uniqueResults = np.asarray(uniqueResults)
+
+    return uniqueResults[inverse.ravel()].reshape(
+        shape + uniqueResults.shape[1:])
+
+
 # required because apply_ufunc is picky about args and kwargs...
 
 
@@ -14,20 +127,42 @@ def _MieRayleighWrapper(diameter,
                         ):
 
     if ((model == 'Rayleigh') or (model == 'Ray')):
-        scatt = singleScattering.rayleigh.RayleighScatt(
-            diameter,
-            wavelength=wavelength,
-            dielectric_permittivity=relativePermittivity,
-        )
+        return _RayleighWrapper(diameter, wavelength, relativePermittivity)
     elif (model == 'Mie'):
         scatt = singleScattering.mie.MieScatt(
             diameter,
             wavelength=wavelength,
             dielectric_permittivity=relativePermittivity,
+            cross_sections_only=True,
         )
     return np.stack([scatt.Cext, scatt.Csca, scatt.Cabs, scatt.Cbck], axis=-1)
 
 
+def _RayleighWrapper(diameter,
+                     wavelength,
+                     relativePermittivity,
+                     ):
+
+    return np.stack(
+        singleScattering.rayleigh.rayleigh_cross_sections(
+            diameter, wavelength, relativePermittivity),
+        axis=-1,
+    )
+
+
+def _DatabaseWrapper(diameter,
+                     wavelength,
+                     temperature,
+                     database=None,
+                     ):
+
+    return np.stack(
+        database.lookup(constants.speedOfLight/wavelength, temperature,
+                        diameter),
+        axis=-1,
+    )
+
+
 def _SSRGWrapper(diameter,
                  ssrg_volume,
                  aspect_ratio,
@@ -42,7 +177,8 @@ def _SSRGWrapper(diameter,
         dielectric_permittivity=relativePermittivity,
         volume=ssrg_volume,
         aspect_ratio=aspect_ratio,
-        ssrg_parameters=ssrg_parameters
+        ssrg_parameters=ssrg_parameters,
+        cross_sections_only=True,
     )
 
     return np.stack([scatt.Cext, scatt.Csca, scatt.Cabs, scatt.Cbck], axis=-1)
@@ -61,7 +197,7 @@ def _TMatrixWrapper(diameter,
         aspect_ratio=aspect_ratio,
         alpha=0.0,  # needs to be exposed to Pamtra2!
         beta=0.0,  # needs to be exposed to Pamtra2!
-
+        cross_sections_only=True,
     )
 
     return np.stack([scatt.Cext, scatt.Csca, scatt.Cabs, scatt.Cbck], axis=-1)
@@ -73,12 +209,13 @@ def Mie(
     relativePermittivity,
 ):
     """Simple Wrapper for singleScattering.Mie.MieScatt to
-    make sure it works with xr.DataArrays.
+    make sure it works with xr.DataArrays. Repeated inputs are evaluated
+    only once, see `dispatchUnique`.
     """
 
     kwargs = dict(model='Mie')
     scatteringProperty = xr.apply_ufunc(
-        _MieRayleighWrapper,
+        partial(dispatchUnique, _MieRayleighWrapper),
         sizeCenter,
         wavelength,
         relativePermittivity,
@@ -97,17 +234,17 @@ def Rayleigh(
     wavelength,
     relativePermittivity,
 ):
-    """Simple Wrapper for singleScattering.Rayleigh.RayleighScatt to
-    make sure it works with xr.DataArrays.
+    """Simple Wrapper for singleScattering.rayleigh.rayleigh_cross_sections
+    to make sure it works with xr.DataArrays. The closed form cross
+    sections are evaluated directly on the arrays, which is cheaper than
+    removing repeated inputs.
     """
 
-    kwargs = dict(model='Rayleigh')
     scatteringProperty = xr.apply_ufunc(
-        _MieRayleighWrapper,
+        _RayleighWrapper,
         sizeCenter,
         wavelength,
         relativePermittivity,
-        kwargs=kwargs,
         output_core_dims=[['scatteringProperty']],
         output_dtypes=[sizeCenter.dtype],
         output_sizes={'scatteringProperty': 4},
@@ -126,7 +263,8 @@ def SSRG(
     ssrgParameters='HW14',
 ):
     """Simple Wrapper for singleScattering.SSRG.SSRGScatt to
-    make sure it works with xr.DataArrays.
+    make sure it works with xr.DataArrays. Repeated inputs are evaluated
+    only once, see `dispatchUnique`.
     """
 
     kwargs = dict(ssrg_parameters=ssrgParameters)
@@ -134,7 +272,7 @@ def SSRG(
     volume_ssrg = mass/constants.rhoIce
 
     scatteringProperty = xr.apply_ufunc(
-        _SSRGWrapper,
+        partial(dispatchUnique, _SSRGWrapper, elementwise=True),
         sizeCenter,
         volume_ssrg,
         aspectRatio,
@@ -145,7 +283,6 @@ def SSRG(
         output_dtypes=[sizeCenter.dtype],
         output_sizes={'scatteringProperty': 4},
         dask='parallelized',
-        vectorize=True,
     )
 
     return scatteringProperty
@@ -158,13 +295,14 @@ def TMatrix(
     relativePermittivity,
 ):
     """Simple Wrapper for singleScattering.SSRG.SSRGScatt to
-    make sure it works with xr.DataArrays.
+    make sure it works with xr.DataArrays. Repeated inputs are evaluated
+    only once, see `dispatchUnique`.
     """
 
     kwargs = dict()
 
     scatteringProperty = xr.apply_ufunc(
-        _TMatrixWrapper,
+        partial(dispatchUnique, _TMatrixWrapper, elementwise=True),
         sizeCenter,
         aspectRatio,
         wavelength,
@@ -174,7 +312,230 @@ def TMatrix(
         output_dtypes=[sizeCenter.dtype],
         output_sizes={'scatteringProperty': 4},
         dask='parallelized',
-        vectorize=True,
     )
 
     return scatteringProperty
+
+
+class HybridReport(object):
+    """Statistics of the partitioning done by a hybrid scattering function.
+
+    Attributes
+    ----------
+    nBins : dict
+        number of evaluated bins per scattering model
+    maxRayleighError : float
+        estimated maximum relative error of the cross sections of the bins
+        using Rayleigh. Estimated by comparing with Mie for the bin with the
+        largest size parameter.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        """Set statistics to zero."""
+        with self._lock:
+            self.nBins = {'Rayleigh': 0, 'Mie': 0, 'TMatrix': 0}
+            self.maxRayleighError = 0.
+
+    def add(self, nBins, rayleighError):
+        with self._lock:
+            for model, nn in nBins.items():
+                self.nBins[model] += nn
+            self.maxRayleighError = max(self.maxRayleighError, rayleighError)
+
+    def __repr__(self):
+        return 'HybridReport(nBins=%s, maxRayleighError=%.3g)' % (
+            self.nBins, self.maxRayleighError)
+
+
+def _HybridWrapper(diameter,
+                   aspectRatio,
+                   wavelength,
+                   relativePermittivity,
+                   rayleighSizeParameter=0.01,
+                   aspectRatioTolerance=1e-6,
+                   report=None,
+                   ):
+
+    diameter, aspectRatio, wavelength, relativePermittivity = \
+        np.broadcast_arrays(
+            diameter, aspectRatio, wavelength, relativePermittivity)
+    shape = diameter.shape
+    diameter = diameter.ravel()
+    aspectRatio = aspectRatio.ravel()
+    wavelength = wavelength.ravel()
+    relativePermittivity = relativePermittivity.ravel()
+
+    sizeParameter = singleScattering.scattering_utilities.size_parameter(
+        0.5*diameter, wavelength)
+    sphere = np.abs(aspectRatio - 1) <= aspectRatioTolerance
+    partitions = {
+        'Rayleigh': sphere & (sizeParameter < rayleighSizeParameter),
+        'Mie': sphere & (sizeParameter >= rayleighSizeParameter),
+        'TMatrix': ~sphere,
+    }
+
+    result = np.empty(diameter.shape + (4,))
+    rayleighError = 0.
+    for model, partition in partitions.items():
+        if not np.any(partition):
+            continue
+        args = (diameter[partition], wavelength[partition],
+                relativePermittivity[partition])
+        if model == 'Rayleigh':
+            result[partition] = _RayleighWrapper(*args)
+            # Rayleigh error increases with size parameter
+            ii = np.argmax(sizeParameter[partition])
+            reference = _MieRayleighWrapper(
+                *[arg[ii:ii+1] for arg in args], model='Mie')
+            rayleighError = np.max(
+                np.abs(result[partition][ii] / reference[0] - 1))
+        elif model == 'Mie':
+            result[partition] = dispatchUnique(
+                _MieRayleighWrapper, *args, model='Mie')
+        elif model == 'TMatrix':
+            result[partition] = dispatchUnique(
+                _TMatrixWrapper,
+                diameter[partition],
+                aspectRatio[partition],
+                wavelength[partition],
+                relativePermittivity[partition],
+                elementwise=True,
+            )
+
+    if report is not None:
+        report.add(
+            {model: int(np.sum(partition))
+             for model, partition in partitions.items()},
+            rayleighError,
+        )
+
+    return result.reshape(shape + (4,))
+
+
+def hybridScattering(rayleighSizeParameter=0.01, aspectRatioTolerance=1e-6):
+    """Create a scattering function choosing the scattering model per size
+    bin.
+
+    Spheres with a size parameter smaller than `rayleighSizeParameter` are
+    calculated with Rayleigh, larger spheres with Mie, and non-spherical
+    particles with T-matrix. For liquid water between 35 and 94 GHz, the
+    cross sections of Rayleigh deviate from Mie by less than 0.2% for a
+    size parameter of 0.01.
+
+    Parameters
+    ----------
+    rayleighSizeParameter : float, optional
+        Rayleigh is used for spheres with smaller size parameter
+        pi*sizeCenter/wavelength (default 0.01)
+    aspectRatioTolerance : float, optional
+        particles with abs(aspectRatio - 1) not exceeding the tolerance are
+        treated as spheres (default 1e-6)
+
+    Returns
+    -------
+    Hybrid : callable
+        scattering function with the same interface as `TMatrix`. The
+        attribute `report` is a `HybridReport` with the number of bins per
+        model and the estimated error of the Rayleigh bins, accumulated
+        over all calls.
+
+    Examples
+    --------
+    >>> scattering=pamtra2.hydrometeors.scattering.hybridScattering(
+    ...     rayleighSizeParameter=0.005)
+    """
+
+    report = HybridReport()
+
+    def Hybrid(
+        sizeCenter,
+        aspectRatio,
+        wavelength,
+        relativePermittivity,
+    ):
+        """Scattering with Rayleigh, Mie or T-matrix depending on size
+        parameter and aspect ratio, see `hybridScattering`.
+        """
+
+        kwargs = dict(
+            rayleighSizeParameter=rayleighSizeParameter,
+            aspectRatioTolerance=aspectRatioTolerance,
+            report=report,
+        )
+
+        scatteringProperty = xr.apply_ufunc(
+            _HybridWrapper,
+            sizeCenter,
+            aspectRatio,
+            wavelength,
+            relativePermittivity,
+            kwargs=kwargs,
+            output_core_dims=[['scatteringProperty']],
+            output_dtypes=[sizeCenter.dtype],
+            output_sizes={'scatteringProperty': 4},
+            dask='parallelized',
+        )
+
+        return scatteringProperty
+
+    Hybrid.report = report
+    return Hybrid
+
+
+Hybrid = hybridScattering()
+
+
+def databaseScattering(database):
+    """Create a scattering function looking up tabulated scattering
+    properties.
+
+    Parameters
+    ----------
+    database : str or singleScattering.database.ScatteringDatabase
+        database or path to a store created with
+        singleScattering.database.create_database. The store is memory
+        mapped and shared by all calls.
+
+    Returns
+    -------
+    Database : callable
+        scattering function using sizeCenter, wavelength and temperature.
+
+    Examples
+    --------
+    >>> scattering=pamtra2.hydrometeors.scattering.databaseScattering(
+    ...     'liu_sector_snowflake')
+    """
+
+    if not isinstance(database, singleScattering.database.ScatteringDatabase):
+        database = singleScattering.database.ScatteringDatabase(database)
+
+    def Database(
+        sizeCenter,
+        wavelength,
+        temperature,
+    ):
+        """Scattering properties interpolated from a scattering database,
+        see `databaseScattering`.
+        """
+
+        scatteringProperty = xr.apply_ufunc(
+            _DatabaseWrapper,
+            sizeCenter,
+            wavelength,
+            temperature,
+            kwargs=dict(database=database),
+            output_core_dims=[['scatteringProperty']],
+            output_dtypes=[sizeCenter.dtype],
+            output_sizes={'scatteringProperty': 4},
+            dask='parallelized',
+        )
+
+        return scatteringProperty
+
+    Database.database = database
+    return Database
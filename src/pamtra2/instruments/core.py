@@ -104,6 +104,26 @@ class instrument(object):
 
 
 class microwaveInstrument(instrument):
+    '''Base class for microwave instrument simulators
+
+    Parameters
+    ----------
+    parent : {pamtra2 class}
+        Calling parent object
+    frequencies : {list} or {'all'}, optional
+        Use this instrument for the frequencies indicated in the list or
+        'all' frequencies (the default is 'all', which means all frequencies)
+    gaseousAttenuationModel : {str} or {pamgasabs.GasAbsorptionLookupTable}
+        Gas absorption model. 'Rosenkranz98' or 'Liebe93' evaluate the full
+        model for every grid point, 'Rosenkranz98LookupTable' and
+        'Liebe93LookupTable' interpolate the gas absorption from a lookup
+        table created once for the instrument's frequencies. Alternatively,
+        a prebuilt pamgasabs.GasAbsorptionLookupTable can be provided
+        (default 'Rosenkranz98').
+    **settings : {dict}
+        Additional settings for the instrument
+    '''
+
     def __init__(
         self,
         parent=None,
@@ -118,6 +138,11 @@ class microwaveInstrument(instrument):
             **settings,
         )
 
+    def _frequencyKey(self):
+        '''Frequencies of the instrument as tuple, used as part of the keys
+        of the parent's memo.'''
+        return tuple(np.atleast_1d(np.asarray(self.frequencies, dtype=float)))
+
     def _calcHydrometeorAbsorption(self):
         '''Calculate hydrometeor absorption
 
@@ -138,50 +163,83 @@ class microwaveInstrument(instrument):
 
         return hydroAbs
 
+    def _getGasAbsorptionLookupTable(self, model):
+        '''Get (and cache) the gas absorption lookup table of the instrument
+
+        The table is created only once and recreated only if the frequencies
+        or the model change.
+
+        Parameters
+        ----------
+        model : {'Rosenkranz98', 'Liebe93'}
+            gas absorption model
+
+        Returns
+        -------
+        pamgasabs.GasAbsorptionLookupTable
+            lookup table for all frequencies of the instrument
+        '''
+        frequencies = np.unique(np.asarray(self.frequencies, dtype=float))
+        table = getattr(self, '_gasAbsorptionLookupTable', None)
+        if (
+            (table is None) or
+            (table.model != model) or
+            (not np.array_equal(table.frequency, frequencies))
+        ):
+            table = pamgasabs.GasAbsorptionLookupTable(
+                frequencies, model=model)
+            self._gasAbsorptionLookupTable = table
+        return table
+
     def _calcGaseousAbsorption(self):
-        '''Calculate gaseous absorption
+        '''Calculate gaseous absorption. The result is shared with other
+        instruments using the same model via the parent's memo.
 
         Returns
         -------
         xr.DataArray
             absorption coefficient
         '''
-        coords = helpers.concatDicts(
-            self.parent.coords['additional'],
-            self.parent.coords['layer'],
-            self.parent.coords['frequency']
-        )
-        thisProf = self.parent.profile.sel(
-            frequency=self.frequencies
-            ).stack(merged=coords)
+        thisProf = self.parent.profile.sel(frequency=self.frequencies)
 
         kwargs = {}
+        gas = pamgasabs
 
-        args = [thisProf.frequency,
-                thisProf.temperature,
-                thisProf.waterVaporPressure,
-                thisProf.pressure
-                ]
-        args = xr.broadcast(*args)
-
-        if self.settings['gaseousAttenuationModel'] == 'Rosenkranz98':
+        model = self.settings['gaseousAttenuationModel']
+        if isinstance(model, gas.GasAbsorptionLookupTable):
+            func = model.multi_frequency
+        elif model == 'Rosenkranz98':
             kwargs['sumResults'] = True
-            func = pamgasabs.calculate_gas_absorption_rosenkranz98
-        elif self.settings['gaseousAttenuationModel'] == 'Liebe93':
-            func = pamgasabs.calculate_gas_absorption_liebe93
+            func = gas.calculate_gas_absorption_rosenkranz98_multi_frequency
+        elif model == 'Liebe93':
+            func = gas.calculate_gas_absorption_liebe93_multi_frequency
+        elif model in ['Rosenkranz98LookupTable', 'Liebe93LookupTable']:
+            func = self._getGasAbsorptionLookupTable(
+                model[:-len('LookupTable')]).multi_frequency
         else:
             raise ValueError('Do not recognize gaseousAttenuationModel: %s' %
                              self.settings['gaseousAttenuationModel'])
 
-        gasAbs = xr.apply_ufunc(
-            func,
-            *args,
-            kwargs=kwargs,
-            dask='parallelized',
-            output_dtypes=[args[1].dtype],
+        # frequency is kept separate from the atmospheric state so that
+        # frequency independent terms are calculated only once.
+        args = [
+            thisProf.frequency,
+            thisProf.temperature,
+            thisProf.waterVaporPressure,
+            thisProf.pressure,
+        ]
+        gasAbs = self.parent.memoize(
+            ('gaseousAbsorption', model, self._frequencyKey()),
+            lambda: xr.apply_ufunc(
+                func,
+                *args,
+                kwargs=kwargs,
+                input_core_dims=[['frequency'], [], [], []],
+                output_core_dims=[['frequency']],
+                dask='parallelized',
+                output_dtypes=[thisProf.temperature.dtype],
+            ),
+            args,
         )
 
-        gasAbs = xr.Dataset({'gasAbs': gasAbs})
-        gasAbs = helpers.xrFastUnstack(gasAbs, 'merged').gasAbs
-
         return gasAbs
@@ -1,5 +1,6 @@
 # -*- coding: utf-8 -*-
 import warnings
+from collections import OrderedDict
 
 import numpy as np
 import xarray as xr
@@ -9,6 +10,30 @@ from ..libs import pyPamtraRadarMoments, pyPamtraRadarSimulator
 from .core import microwaveInstrument
 
 
+def _createRadarSpectrum(diameterSpec, specWidth, backSpec, fallVelSpec,
+                         verticalWind, wavelength, **kwargs):
+    """Wrapper for pyPamtraRadarSimulator.createRadarSpectrum accepting
+    arguments which are only broadcastable against each other, e.g.
+    sizeCenter with shape (1, sizeBin). The arguments are broadcasted (as
+    views) only here, i.e. block by block when using dask.
+    """
+    shape = np.broadcast(
+        diameterSpec, specWidth, backSpec, fallVelSpec,
+        np.reshape(verticalWind, (-1, 1)), np.reshape(wavelength, (-1, 1)),
+    ).shape
+    diameterSpec, specWidth, backSpec, fallVelSpec = [
+        np.broadcast_to(arg, shape) for arg in
+        (diameterSpec, specWidth, backSpec, fallVelSpec)
+    ]
+    verticalWind, wavelength = [
+        np.broadcast_to(np.ravel(arg), shape[:1]) for arg in
+        (verticalWind, wavelength)
+    ]
+    return pyPamtraRadarSimulator.createRadarSpectrum(
+        diameterSpec, specWidth, backSpec, fallVelSpec, verticalWind,
+        wavelength, **kwargs)
+
+
 class simpleRadar(microwaveInstrument):
     def __init__(
         self,
@@ -45,15 +70,31 @@ class simpleRadar(microwaveInstrument):
             Ze_increment = 0.
             MDV_increment = 0.
 
-            for hydro in self.hydrometeorProfiles.keys():
-                bsc = self.hydrometeorProfiles[hydro].backscatterCrossSection\
-                    .sel(frequency=self.frequencies)
-                N = self.hydrometeorProfiles[hydro]\
-                    .numberConcentration.fillna(0)
-                Ze_bin = 1.e18*(1.e0/(K2*np.pi**5))*bsc*N*(wavelength)**4
-                vel = self.hydrometeorProfiles[hydro].fallVelocity
-                Ze_increment += Ze_bin.sum(['sizeBin'])
-                MDV_increment += (vel*Ze_bin).sum(['sizeBin'])
+            prefactor = 1.e18*(1.e0/(K2*np.pi**5))*(wavelength)**4
+            if self.parent.combineHydrometeorBins:
+                # all hydrometeors in a single pass
+                combined, _ = self.parent.getCombinedBins([
+                    'backscatterCrossSection',
+                    'numberConcentration',
+                    'fallVelocity',
+                ])
+                profiles = [(combined, 'bin')]
+            else:
+                profiles = [
+                    (self.hydrometeorProfiles[hydro], 'sizeBin')
+                    for hydro in self.hydrometeorProfiles.keys()
+                ]
+
+            for profile, binDim in profiles:
+                bsc = profile.backscatterCrossSection\
+                    .sel(frequency=self.frequencies).fillna(0)
+                N = profile.numberConcentration.fillna(0)
+                vel = profile.fallVelocity.fillna(0)
+                # xr.dot sums over the bins without materializing the
+                # products of the broadcasted variables
+                Ze_increment += prefactor * xr.dot(bsc, N, dims=binDim)
+                MDV_increment += prefactor * xr.dot(
+                    vel, bsc, N, dims=binDim)
             # perHydro = [] 
             # for name in self.hydrometeors.keys():
             #     numberConcentration = self.hydrometeors[
@@ -102,15 +143,24 @@ class simpleRadar(microwaveInstrument):
         absHydro = self._calcHydrometeorAbsorption()
         absGas = self._calcGaseousAbsorption()
 
-        # Doviak Zrnic eq 3.12 with 10*np.log10(np.exp(X) = 4.34*X
-        specificAttenuation = 10*np.log10(np.exp(absHydro + absGas))
-
-        PIA_bottomup, PIA_topdown = self._attenuation2pia(specificAttenuation)
+        # shared with other radars via the parent's memo
+        specificAttenuation, PIA_bottomup, PIA_topdown = self.parent.memoize(
+            ('attenuation', self._frequencyKey()),
+            lambda: self._absorption2attenuation(absHydro, absGas),
+            [absHydro, absGas, self.parent.profile.heightBinDepth],
+        )
 
         self.results['specificAttenuation'] = specificAttenuation
         self.results['pathIntegratedAttBottomUp'] = PIA_bottomup
         self.results['pathIntegratedAttTopDown'] = PIA_topdown
 
+    def _absorption2attenuation(self, absHydro, absGas):
+        # Doviak Zrnic eq 3.12 with 10*np.log10(np.exp(X) = 4.34*X
+        specificAttenuation = 10*np.log10(np.exp(absHydro + absGas))
+
+        PIA_bottomup, PIA_topdown = self._attenuation2pia(specificAttenuation)
+        return specificAttenuation, PIA_bottomup, PIA_topdown
+
     def _attenuation2pia(self, attenuation, dim='layer'):
 
         attenuation = attenuation * self.parent.profile.heightBinDepth
@@ -126,8 +176,72 @@ class simpleRadar(microwaveInstrument):
         return PIA_bottomup, PIA_topdown
 
 
+# results of dopplerRadarPamtra which do not depend on the noise realization
+_DETERMINISTIC_RESULTS = [
+    'specificAttenuation',
+    'pathIntegratedAttBottomUp',
+    'pathIntegratedAttTopDown',
+    'radarIdealizedSpectrum',
+]
+
+# settings of dopplerRadarPamtra which can be given per frequency
+_PER_FREQUENCY_SETTINGS = [
+    'radarMaxV',
+    'radarMinV',
+    'radarAliasingNyquistInterv',
+    'radarNFFT',
+    'radarAirmotion',
+    'radarAirmotionModel',
+    'radarAirmotionVmin',
+    'radarAirmotionVmax',
+    'radarAirmotionLinearSteps',
+    'radarAirmotionStepVmin',
+    'radarK2',
+    'radarBeamwidthDeg',
+    'radarIntegrationTime',
+    'radarPNoise1000',
+    'radarNAve',
+    'radarNoiseEngine',
+    'momentsNoiseDistanceFactor',
+    'momentsPeakMinSnr',
+    'momentsPeakMinBins',
+    'momentsSmoothSpectrum',
+    'momentsUseWiderPeak',
+    'momentsReceiverMiscalibration',
+]
+
+
+def _frequencySetting(key, value, index, frequency, nFrequencies):
+    """Value of setting `key` for a single frequency. Per frequency
+    settings are sequences with one value per frequency or xr.DataArrays
+    with dimension frequency."""
+    if isinstance(value, xr.DataArray):
+        if 'frequency' in value.dims:
+            value = value.sel(frequency=frequency)
+    elif isinstance(value, (list, tuple, np.ndarray)):
+        if np.ndim(value) != 1 or len(value) != nFrequencies:
+            raise ValueError('%s must be a scalar or have one value per '
+                             'frequency (%i)' % (key, nFrequencies))
+        value = value[index]
+    if isinstance(value, (np.generic, np.ndarray, xr.DataArray)):
+        value = np.asarray(value).item()
+    return value
+
+
 class dopplerRadarPamtra(simpleRadar):
 
+    """Spectral radar simulator
+
+    All settings listed in `_PER_FREQUENCY_SETTINGS` can be given per
+    frequency, i.e. as a sequence with one value per frequency or as a
+    xr.DataArray with dimension frequency. Frequencies with identical
+    settings are processed in a single call of the radar libraries.
+    Spectra of frequencies with different radarNFFT are padded with NaN,
+    if the Doppler velocities differ between frequencies, the coordinate
+    dopplerVelocity is replaced by dopplerVelocityGrid depending on
+    frequency.
+    """
+
     def __init__(
         self,
         name='dopplerRadarPamtra',
@@ -149,6 +263,7 @@ class dopplerRadarPamtra(simpleRadar):
         radarIntegrationTime=60,
         radarPNoise1000=-30,
         radarNAve=150,
+        radarNoiseEngine='exponential',
         momentsNPeaks=2,
         momentsNoiseDistanceFactor=0,
         momentsSpecNoiseMean=None,
@@ -161,6 +276,7 @@ class dopplerRadarPamtra(simpleRadar):
         seed=0,
         applyAttenuation=None,
         gaseousAttenuationModel='Rosenkranz98',
+        noiseFree=False,
     ):
 
         super().__init__(
@@ -181,6 +297,7 @@ class dopplerRadarPamtra(simpleRadar):
             radarK2=radarK2,
             radarPNoise1000=radarPNoise1000,
             radarNAve=radarNAve,
+            radarNoiseEngine=radarNoiseEngine,
             radarBeamwidthDeg=radarBeamwidthDeg,
             radarIntegrationTime=radarIntegrationTime,
             seed=seed,
@@ -195,17 +312,98 @@ class dopplerRadarPamtra(simpleRadar):
             momentsReceiverMiscalibration=momentsReceiverMiscalibration,
             applyAttenuation=applyAttenuation,
             gaseousAttenuationModel=gaseousAttenuationModel,
+            noiseFree=noiseFree,
         )
 
     def solve(self):
 
-        if len(self.frequencies) > 1:
-            warnings.warn('Note that the radar simulator '
-                          'assumes that settings are the same for '
-                          'all frequencies (due to '
-                          'missing support for vectorized '
-                          'settings.)')
+        # spectra and moments of a previous solve or solveRealizations are
+        # replaced, the latter also have other dims
+        self.results = self.results[[
+            vv for vv in _DETERMINISTIC_RESULTS if vv in self.results]]
+        self._solveIdealizedSpectrum()
+        if self.parent.nHydrometeors > 0:
+            if self.settings['noiseFree']:
+                self._calcNoiseFreeMoments()
+            else:
+                self._simulateRadar()
+                self._calcMoments()
+
+        for vv in self.results.variables:
+            self.results[vv].attrs['unit'] = units.units[vv]
+
+        return self.results
+
+    def solveRealizations(self, nRealizations, seeds=None):
+        """Simulate several noise realizations of the same idealized spectrum.
+
+        The idealized spectrum is calculated only if it is not available
+        from a previous call of `solve` or `solveRealizations`. The
+        realizations are flattened together with the gates, so noise and
+        turbulence of all realizations are simulated in a single call of the
+        simulator and the moments are estimated in a single call. Spectra
+        and moments get the additional dimension 'realization' with
+        coordinate 'realizationSeed'.
+
+        Parameters
+        ----------
+        nRealizations : int
+            number of realizations
+        seeds : list of int, optional
+            seed of every realization. Default is seed + r * nGates for
+            realization r, seed > 0 and the number of simulated gates
+            nGates, and random realizations (seed 0) otherwise. The random
+            numbers depend on seed + gate, so seeds of realizations must
+            differ by at least nGates, otherwise realizations are shifted
+            copies of each other.
+
+        Returns
+        -------
+        xr.Dataset
+            results
+        """
+        if seeds is not None:
+            seeds = np.asarray(seeds)
+            if seeds.shape != (nRealizations,):
+                raise ValueError('Need one seed per realization, got %i '
+                                 'seeds for %i realizations' % (
+                                     seeds.size, nRealizations))
+
+        if 'radarIdealizedSpectrum' not in self.results.variables:
+            self._solveIdealizedSpectrum()
+
+        if seeds is None:
+            if self.settings['seed'] > 0:
+                seeds = self.settings['seed'] + \
+                    self._nGates() * np.arange(nRealizations)
+            else:
+                seeds = np.zeros(nRealizations, dtype=int)
+        if self.parent.nHydrometeors > 0:
+            # spectra and moments of a previous solve have other dims
+            self.results = self.results[_DETERMINISTIC_RESULTS]
+            radarSpec = self._simulateRadar(seeds=seeds)
+            radarSpec = radarSpec.assign_coords(
+                realization=np.arange(nRealizations),
+                realizationSeed=('realization', seeds),
+            )
+            self.results['radarSpectrum'] = radarSpec
+            self._calcMoments()
+
+        for vv in self.results.variables:
+            self.results[vv].attrs['unit'] = units.units[vv]
 
+        return self.results
+
+    def _nGates(self):
+        """Number of gates simulated by `_simulateRadar` for all
+        frequencies."""
+        sizes = self.results.radarIdealizedSpectrum.sizes
+        return int(np.prod(
+            [sizes[d] for d in self._flattenedDims() if d in sizes]))
+
+    def _solveIdealizedSpectrum(self):
+        """Deterministic part of solve: path integrated attenuation and
+        idealized spectrum."""
         self._link_parent()
 
         for name in self.hydrometeorProfiles.keys():
@@ -215,15 +413,72 @@ class dopplerRadarPamtra(simpleRadar):
 
         self._calcPIA()
         if self.parent.nHydrometeors > 0:
-
             self._calcRadarSpectrum()
-            self._simulateRadar()
-            self._calcMoments()
 
-        for vv in self.results.variables:
-            self.results[vv].attrs['unit'] = units.units[vv]
+    def _frequencyGroups(self, func, keys=[]):
+        '''Group the frequencies by identical settings of func.
+
+        Parameters
+        ----------
+        func : function
+            library function, all its kwargs are taken from the settings
+        keys : list of str, optional
+            additional settings which must be identical within a group
+
+        Returns
+        -------
+        list of tuple
+            (frequencies, kwargs, settings) of every group with the kwargs
+            of func and the settings `keys` for the frequencies of the group
+        '''
+        argNames, kwargNames = helpers.provideArgKwargNames(func)
+        frequencies = np.atleast_1d(np.asarray(self.frequencies))
+        groups = OrderedDict()
+        for ii, frequency in enumerate(frequencies):
+            settings = OrderedDict()
+            for k in kwargNames + keys:
+                settings[k] = self.settings[k]
+                if k in _PER_FREQUENCY_SETTINGS:
+                    settings[k] = _frequencySetting(
+                        k, settings[k], ii, frequency, len(frequencies))
+            groupKey = tuple(
+                vv for k, vv in settings.items()
+                if k in _PER_FREQUENCY_SETTINGS
+            )
+            groups.setdefault(groupKey, ([], settings))[0].append(frequency)
+        return [
+            (ff, {k: settings[k] for k in kwargNames}, settings)
+            for ff, settings in groups.values()
+        ]
 
-        return self.results
+    def _concatFrequencyGroups(self, results, paddedDims=[]):
+        '''Concatenate the results of the frequency groups along frequency
+        in the order of self.frequencies. paddedDims are padded with NaN
+        to the largest size of all groups.'''
+        if len(results) == 1:
+            return results[0]
+        for dim in paddedDims:
+            size = max(rr.sizes[dim] for rr in results)
+            results = [
+                rr.pad({dim: (0, size - rr.sizes[dim])})
+                if rr.sizes[dim] < size else rr
+                for rr in results
+            ]
+        results = xr.concat(results, dim='frequency')
+        if results.chunks and len(paddedDims) > 0:
+            # padded dims are core dims of the following library calls
+            results = results.chunk({dim: -1 for dim in paddedDims})
+        return results.sel(frequency=np.atleast_1d(
+            np.asarray(self.frequencies)))
+
+    def _flattenedDims(self):
+        '''Dimensions which are flattened before calling the radar
+        simulator or the moments estimator.'''
+        return list(helpers.concatDicts(
+            self.parent.coords['additional'],
+            self.parent.coords['layer'],
+            self.parent.coords['frequency'],
+        ).keys())
 
     def _calcRadarSpectrum(self):
 
@@ -245,66 +500,49 @@ class dopplerRadarPamtra(simpleRadar):
             'fallVelocity',
         ] + profileVars
 
-        radarSpecs = []
-        for name in self.hydrometeorProfiles.keys():
-
-            # would be great if this could become an attribute of
-            # parent.hydrometeors[name].profile and we could use
-            # self.hydrometeorProfiles.
-            mergedProfile = self.parent.hydrometeors[
-                name
-            ].getProfileWithParentAllBroadcasted(
-                variables=hydroVars,
-                parentVariables=profileVars,
-                exclude=['sizeBin'],
+        # profiles with the bins of the hydrometeors along binDim. The
+        # radar simulator is called for the bins of every hydrometeor.
+        profiles = []
+        if self.parent.combineHydrometeorBins:
+            # merge and flatten the bins of all hydrometeors at once
+            combined, offsets = self.parent.getCombinedBins(hydroVars)
+            mergedProfile = xr.merge(
+                (combined, self.parent.profile[profileVars])
             ).sel(frequency=self.frequencies)
+            profiles.append((mergedProfile, 'bin', list(offsets.values())))
+        else:
+            for name in self.hydrometeorProfiles.keys():
+
+                # would be great if this could become an attribute of
+                # parent.hydrometeors[name].profile and we could use
+                # self.hydrometeorProfiles.
+                # Variables keep their dimensions, e.g. sizeCenter
+                # depending only on sizeBin is broadcasted block by block
+                # in _createRadarSpectrum.
+                mergedProfile = self.parent.hydrometeors[
+                    name
+                ].getProfileWithParent(
+                    variables=hydroVars,
+                    parentVariables=profileVars,
+                ).sel(frequency=self.frequencies)
+                profiles.append((mergedProfile, 'sizeBin', [slice(None)]))
 
-            mergedProfile = mergedProfile.stack(
-                merged=helpers.concatDicts(
-                    self.parent.coords['additional'],
-                    self.parent.coords['layer'],
-                    self.parent.coords['frequency']
-                )
-            )
-
-            mergedProfile['bcsWEIGHTED'] = (
-                mergedProfile['backscatterCrossSection'] *
-                mergedProfile['numberConcentration'].fillna(0)
-            )
-
-            argNames, kwargNames = helpers.provideArgKwargNames(
-                pyPamtraRadarSimulator.createRadarSpectrum)
-
-            args = []
-            for var in funcArgVars:
-                args.append(mergedProfile[var])
-
-            assert len(argNames) == len(args)
-
-            input_core_dims = helpers.getInputCoreDims(args, ['sizeBin'])
-            kwargs = {}
-            for k in kwargNames:
-                kwargs[k] = self.settings[k]
-
-            nfft = kwargs['radarNFFT'] * (
-                1 + 2*kwargs['radarAliasingNyquistInterv']
-            )
-
-            radarSpec = xr.apply_ufunc(
-                pyPamtraRadarSimulator.createRadarSpectrum,
-                *args,
-                kwargs=kwargs,
-                input_core_dims=input_core_dims,
-                output_core_dims=[('dopplerVelocityAliased',)],
-                output_dtypes=[mergedProfile.backscatterCrossSection.dtype],
-                output_sizes={'dopplerVelocityAliased': nfft},
-                dask='parallelized',
-            )
-            radarSpecs.append(radarSpec)
-        radarSpecs = xr.concat(radarSpecs, dim='hydrometeor')
-        radarSpecs = radarSpecs.sum('hydrometeor')
-        radarSpecs = xr.Dataset({'radarSpecs': radarSpecs})
-        radarSpecs = helpers.xrFastUnstack(radarSpecs, 'merged').radarSpecs
+        radarSpecs = []
+        for frequencies, kwargs, _ in self._frequencyGroups(
+                pyPamtraRadarSimulator.createRadarSpectrum):
+            groupSpecs = []
+            for mergedProfile, binDim, bins in profiles:
+                flattener, flatProfile = self._flattenSpectrumArgs(
+                    mergedProfile.sel(frequency=frequencies), funcArgVars)
+                for binSlice in bins:
+                    groupSpecs.append(self._radarSpectrumKernel(
+                        flatProfile.isel({binDim: binSlice}), funcArgVars,
+                        binDim, kwargs))
+            groupSpecs = xr.concat(groupSpecs, dim='hydrometeor')
+            radarSpecs.append(
+                flattener.unflatten(groupSpecs.sum('hydrometeor')))
+        radarSpecs = self._concatFrequencyGroups(
+            radarSpecs, ['dopplerVelocityAliased'])
 
         self.results['radarIdealizedSpectrum'] = radarSpecs
         self.results['radarIdealizedSpectrum'].attrs['unit'] = units.units[
@@ -312,15 +550,55 @@ class dopplerRadarPamtra(simpleRadar):
 
         return self.results['radarIdealizedSpectrum']
 
-    def _simulateRadar(self):
+    def _flattenSpectrumArgs(self, mergedProfile, funcArgVars):
+        '''Add the weighted backscattering cross section and flatten the
+        arguments of the radar simulator.'''
+        mergedProfile['bcsWEIGHTED'] = (
+            mergedProfile['backscatterCrossSection'] *
+            mergedProfile['numberConcentration'].fillna(0)
+        )
+
+        flattener = helpers.DimensionFlattener(
+            mergedProfile, self._flattenedDims())
+        mergedProfile = flattener.flatten(mergedProfile[funcArgVars])
+        return flattener, mergedProfile
 
+    def _radarSpectrumKernel(self, mergedProfile, funcArgVars, binDim,
+                             kwargs):
+        '''Apply the radar simulator to the flattened arguments with the
+        size bins along binDim.'''
         argNames, kwargNames = helpers.provideArgKwargNames(
-            pyPamtraRadarSimulator.simulateRadarSpectrum)
+            pyPamtraRadarSimulator.createRadarSpectrum)
 
-        kwargs = {}
-        for k in kwargNames:
-            kwargs[k] = self.settings[k]
+        args = []
+        for var in funcArgVars:
+            args.append(mergedProfile[var])
+
+        assert len(argNames) == len(args)
 
+        input_core_dims = helpers.getInputCoreDims(args, [binDim])
+
+        nfft = kwargs['radarNFFT'] * (
+            1 + 2*kwargs['radarAliasingNyquistInterv']
+        )
+
+        radarSpec = xr.apply_ufunc(
+            _createRadarSpectrum,
+            *args,
+            kwargs=kwargs,
+            input_core_dims=input_core_dims,
+            output_core_dims=[('dopplerVelocityAliased',)],
+            output_dtypes=[mergedProfile.bcsWEIGHTED.dtype],
+            output_sizes={'dopplerVelocityAliased': nfft},
+            dask='parallelized',
+        )
+        return radarSpec
+
+    def _simulatorProfile(self, frequencies, kwargs, seed=None):
+        '''Flattened arguments of the radar simulator for the idealized
+        spectrum of frequencies. If seed is given, it is appended to the
+        arguments. A dimension 'realization' of seed is flattened together
+        with the gates.'''
         variables = [
             'height',
             'eddyDissipationRate',
@@ -330,11 +608,16 @@ class dopplerRadarPamtra(simpleRadar):
             'wavelength',
         ]
 
+        # remove the padding of other frequencies
+        nfft = kwargs['radarNFFT'] * (
+            1 + 2*kwargs['radarAliasingNyquistInterv']
+        )
         mergedProfile = self.parent.profile.copy()
         mergedProfile['radarIdealizedSpectrum'] = self.results[
-            'radarIdealizedSpectrum']
+            'radarIdealizedSpectrum'].isel(
+                dopplerVelocityAliased=slice(0, nfft))
 
-        mergedProfile = mergedProfile.sel(frequency=self.frequencies)
+        mergedProfile = mergedProfile.sel(frequency=frequencies)
 
         if self.settings['applyAttenuation'] is None:
             mergedProfile['pathIntegratedAttenuation'] = xr.zeros_like(
@@ -350,46 +633,129 @@ class dopplerRadarPamtra(simpleRadar):
                              'None, "bottomUp" or "topDown"' %
                              self.settings['applyAttenuation'])
 
-        mergedProfile = mergedProfile.stack(
-            merged=helpers.concatDicts(
-                self.parent.coords['additional'],
-                self.parent.coords['layer'],
-                self.parent.coords['frequency'])
-        )
+        if seed is not None:
+            mergedProfile['seed'] = seed
+            variables.append('seed')
+
+        flattener = helpers.DimensionFlattener(
+            mergedProfile, ['realization'] + self._flattenedDims())
+        mergedProfile = flattener.flatten(mergedProfile[variables])
 
         args = []
         for var in variables:
             args.append(mergedProfile[var])
+        return flattener, args
 
-        assert len(argNames) == len(args)
+    def _simulateRadar(self, seeds=None):
+        '''Add noise and turbulence to the idealized spectrum. If seeds is
+        given, a realization is simulated for every seed in a single call of
+        the simulator and the spectrum gets the leading dimension
+        'realization'.'''
 
-        input_core_dims = helpers.getInputCoreDims(
-            args, ['dopplerVelocityAliased'])
+        argNames, kwargNames = helpers.provideArgKwargNames(
+            pyPamtraRadarSimulator.simulateRadarSpectrum)
 
-        radarSpec = xr.apply_ufunc(
-            pyPamtraRadarSimulator.simulateRadarSpectrum,
-            *args,
-            kwargs=kwargs,
-            input_core_dims=input_core_dims,
-            output_core_dims=[('dopplerVelocity',)],
-            output_dtypes=[mergedProfile.radarIdealizedSpectrum.dtype],
-            output_sizes={'dopplerVelocity': 256},
-            dask='parallelized',
-        )
-        radarSpec = xr.Dataset({'radarSpec': radarSpec})
-        radarSpec = helpers.xrFastUnstack(radarSpec, 'merged').radarSpec
-
-        self.results['radarSpectrum'] = radarSpec.assign_coords(
-            dopplerVelocity=np.linspace(
-                self.settings['radarMinV'],
-                self.settings['radarMaxV'],
-                self.settings['radarNFFT'],
+        radarSpecs = []
+        velocities = []
+        nGates = 0
+        for frequencies, kwargs, _ in self._frequencyGroups(
+                pyPamtraRadarSimulator.simulateRadarSpectrum):
+            seed = kwargs.pop('seed')
+            if seeds is None:
+                seed = xr.DataArray(seed)
+            else:
+                seed = xr.DataArray(np.asarray(seeds), dims=['realization'])
+            # random numbers depend on seed and gate, so continue counting
+            # the gates of the previous groups
+            seed = xr.where(seed > 0, seed + nGates, seed)
+            flattener, args = self._simulatorProfile(
+                frequencies, kwargs, seed=seed)
+            assert len(argNames) + 1 == len(args)
+            nGates += flattener.size // seed.size
+
+            input_core_dims = helpers.getInputCoreDims(
+                args, ['dopplerVelocityAliased'])
+
+            radarSpec = xr.apply_ufunc(
+                _simulateRadarSpectrum_wrapper,
+                *args,
+                kwargs=kwargs,
+                input_core_dims=input_core_dims,
+                output_core_dims=[('dopplerVelocity',)],
+                output_dtypes=[args[3].dtype],
+                output_sizes={'dopplerVelocity': kwargs['radarNFFT']},
+                dask='parallelized',
+            )
+            radarSpecs.append(flattener.unflatten(radarSpec))
+            velocity = np.linspace(
+                kwargs['radarMinV'],
+                kwargs['radarMaxV'],
+                kwargs['radarNFFT'],
                 endpoint=False
             )
-        )
+            velocities.append(xr.DataArray(
+                np.tile(velocity, (len(frequencies), 1)),
+                dims=['frequency', 'dopplerVelocity'],
+                coords={'frequency': frequencies},
+            ))
+        radarSpec = self._concatFrequencyGroups(
+            radarSpecs, ['dopplerVelocity'])
+        velocities = self._concatFrequencyGroups(
+            velocities, ['dopplerVelocity'])
+
+        if np.all(velocities.values == velocities.values[:1]):
+            radarSpec = radarSpec.assign_coords(
+                dopplerVelocity=velocities.values[0])
+        else:
+            radarSpec = radarSpec.assign_coords(
+                dopplerVelocityGrid=velocities)
+
+        self.results['radarSpectrum'] = radarSpec
 
         return self.results['radarSpectrum']
 
+    def _calcNoiseFreeMoments(self):
+        '''Moments calculated from the idealized spectrum without
+        simulating noise, analytically unless the broadened spectrum crosses
+        a Nyquist limit (see pyPamtraRadarSimulator.calcNoiseFreeMoments).
+        The moments have a single peak.'''
+
+        argNames, kwargNames = helpers.provideArgKwargNames(
+            pyPamtraRadarSimulator.calcNoiseFreeMoments)
+
+        moments = []
+        for frequencies, kwargs, _ in self._frequencyGroups(
+                pyPamtraRadarSimulator.calcNoiseFreeMoments):
+            flattener, args = self._simulatorProfile(frequencies, kwargs)
+            assert len(argNames) == len(args)
+
+            input_core_dims = helpers.getInputCoreDims(
+                args, ['dopplerVelocityAliased'])
+
+            groupMoments = helpers.apply_ufunc_extended(
+                _calcNoiseFreeMoments_wrapper,
+                *args,
+                kwargs=kwargs,
+                output_names=[
+                    'radarReflectivity',
+                    'meanDopplerVel',
+                    'spectrumWidth',
+                    'skewness',
+                    'kurtosis',
+                ],
+                input_core_dims=input_core_dims,
+                output_core_dims=[('peak')] * 5,
+                output_dtypes=[args[3].dtype],
+                output_sizes={'peak': 1},
+                dask='parallelized',
+            )
+            moments.append(flattener.unflatten(groupMoments))
+        moments = self._concatFrequencyGroups(moments)
+        moments = moments.assign_coords(peak=[1])
+
+        self.results = self.results.merge(moments)
+        return moments
+
     def _calcMoments(self):
 
         output_core_dims = [
@@ -426,38 +792,37 @@ class dopplerRadarPamtra(simpleRadar):
         # theseVars
         input_core_dims = [['dopplerVelocity', ]]
 
-        args = [
-            self.results.radarSpectrum.sel(
-                frequency=self.frequencies
-            ).stack(merged=helpers.concatDicts(
-                    self.parent.coords['additional'],
-                    self.parent.coords['layer'],
-                    self.parent.coords['frequency']
-                    )
-                    )
-        ]
-
         # take care of settings
         argNames, kwargNames = helpers.provideArgKwargNames(
             pyPamtraRadarMoments.calc_radarMoments)
-        kwargs = {}
-        for k in kwargNames:
-            kwargs[k] = self.settings[k]
 
-        assert len(argNames) == len(args)
+        moments = []
+        for frequencies, kwargs, settings in self._frequencyGroups(
+                pyPamtraRadarMoments.calc_radarMoments, ['radarNFFT']):
+            # remove the padding of other frequencies
+            radarSpectrum = self.results.radarSpectrum.sel(
+                frequency=frequencies).isel(
+                    dopplerVelocity=slice(0, settings['radarNFFT']))
+            # all realizations are processed in a single call
+            flattener = helpers.DimensionFlattener(
+                radarSpectrum, ['realization'] + self._flattenedDims())
+            args = [flattener.flatten(radarSpectrum)]
 
-        moments = helpers.apply_ufunc_extended(
-            _calc_radarMoments_wrapper,
-            *args,
-            kwargs=kwargs,
-            output_names=output_names,
-            input_core_dims=input_core_dims,
-            output_core_dims=output_core_dims,
-            output_dtypes=[args[0].dtype],
-            output_sizes=output_sizes,
-            dask='parallelized',
-        )
-        moments = helpers.xrFastUnstack(moments, 'merged')
+            assert len(argNames) == len(args)
+
+            groupMoments = helpers.apply_ufunc_extended(
+                _calc_radarMoments_wrapper,
+                *args,
+                kwargs=kwargs,
+                output_names=output_names,
+                input_core_dims=input_core_dims,
+                output_core_dims=output_core_dims,
+                output_dtypes=[args[0].dtype],
+                output_sizes=output_sizes,
+                dask='parallelized',
+            )
+            moments.append(flattener.unflatten(groupMoments))
+        moments = self._concatFrequencyGroups(moments)
 
         moments = moments.assign_coords(
             peak=np.arange(1, self.settings['momentsNPeaks']+1)
@@ -467,6 +832,19 @@ class dopplerRadarPamtra(simpleRadar):
         return moments
 
 
+def _simulateRadarSpectrum_wrapper(*args, **kwargs):
+    *args, seed = args
+    return pyPamtraRadarSimulator.simulateRadarSpectrum(
+        *args, seed=seed, **kwargs)
+
+
+def _calcNoiseFreeMoments_wrapper(*args, **kwargs):
+    Ze, *moments = pyPamtraRadarSimulator.calcNoiseFreeMoments(
+        *args, **kwargs)
+    result = [10 * np.log10(Ze)] + moments
+    return tuple(rr[:, np.newaxis] for rr in result)
+
+
 def _calc_radarMoments_wrapper(*args, **kwargs):
     result = pyPamtraRadarMoments.calc_radarMoments(
         *args, **kwargs)
@@ -73,3 +73,99 @@ class TestGetInputCoreDims(object):
         coreDims = ['x']
         res = pamtra2.helpers.getInputCoreDims(args, coreDims)
         assert res == [['x'], []]
+
+
+class TestDimensionFlattener(object):
+    def setUp(self):
+        self.ds = xr.Dataset({
+            'a': xr.DataArray(
+                np.random.random((2, 3, 4)),
+                dims=['x', 'y', 'core'],
+                coords={'x': [10, 20], 'y': [1, 2, 3]},
+            ),
+            'b': xr.DataArray(np.arange(3), dims=['y']),
+            'c': xr.DataArray(np.arange(4), dims=['core']),
+        })
+        self.flattener = pamtra2.helpers.DimensionFlattener(
+            self.ds, ['x', 'y', 'notThere'])
+
+    def test_flatten(self):
+        self.setUp()
+        flat = self.flattener.flatten(self.ds)
+        assert flat.a.dims == ('merged', 'core')
+        assert flat.b.dims == ('merged',)
+        assert flat.c.dims == ('core',)
+        assert np.all(flat.b.values == np.tile(np.arange(3), 2))
+        assert np.shares_memory(flat.a.values, self.ds.a.values)
+
+    def test_roundtrip(self):
+        self.setUp()
+        flat = self.flattener.flatten(self.ds)
+        ds = self.flattener.unflatten(flat)
+        assert ds.a.dims == ('x', 'y', 'core')
+        assert ds.a.equals(self.ds.a)
+        assert np.all(ds.x == self.ds.x)
+        assert ds.b.equals(self.ds.b.broadcast_like(self.ds.a.x))
+
+    def test_transposed(self):
+        self.setUp()
+        flat = self.flattener.flatten(self.ds.a.transpose('core', 'y', 'x'))
+        assert flat.dims == ('merged', 'core')
+        assert np.all(flat.values == self.ds.a.values.reshape((6, 4)))
+
+
+def _multiOutput(x, factor=1):
+    return x.sum(-1) * factor, np.stack([x.min(-1), x.max(-1)], -1)
+
+
+class TestApplyUfuncExtended(object):
+    def setUp(self):
+        self.arr = xr.DataArray(
+            np.random.random((4, 3, 5)), dims=['x', 'y', 'core'])
+
+    def _apply(self, arr):
+        return pamtra2.helpers.apply_ufunc_extended(
+            _multiOutput,
+            arr,
+            kwargs={'factor': 2},
+            output_names=['sum', 'minMax'],
+            input_core_dims=[['core']],
+            output_core_dims=[tuple(), ('extreme',)],
+            output_sizes={'extreme': 2},
+            output_dtypes=[arr.dtype],
+            dask='parallelized',
+        )
+
+    def test_numpy(self):
+        self.setUp()
+        res = self._apply(self.arr)
+        assert res['sum'].dims == ('x', 'y')
+        assert res['minMax'].dims == ('x', 'y', 'extreme')
+        assert np.allclose(res['sum'], self.arr.sum('core') * 2)
+        assert np.allclose(res['minMax'].isel(extreme=1),
+                           self.arr.max('core'))
+
+    def test_dask(self):
+        self.setUp()
+        ref = self._apply(self.arr)
+        res = self._apply(self.arr.chunk({'x': 1, 'core': 2}))
+        assert res['minMax'].chunks is not None
+        res = res.load()
+        assert res['sum'].equals(ref['sum'])
+        assert res['minMax'].equals(ref['minMax'])
+
+
+
+class TestFingerprint(object):
+    def test_callable(self):
+        calls = []
+
+        def stateful(x):
+            calls.append(x)
+            return x
+
+        before = pamtra2.helpers.fingerprint(stateful, 1)
+        stateful(1)
+        # the state of the closure is not part of the fingerprint
+        assert pamtra2.helpers.fingerprint(stateful, 1) == before
+        assert pamtra2.helpers.fingerprint(lambda x: x, 1) != before
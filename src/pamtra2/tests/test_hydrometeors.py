@@ -1,17 +1,232 @@
+import functools
+
 import numpy as np
 import pamtra2
 import pytest
+import xarray as xr
 
 
 class TestAspectRatio(object):
     pass
 
 
+def _createCloud(scattering, hydrometeorContent=1e-4, **kwargs):
+    pam2 = pamtra2.pamtra2(
+        nLayer=3,
+        hydrometeors=['cloud'],
+        frequencies=[35e9],
+    )
+    pam2.profile.height[:] = [1000, 2000, 3000]
+    pam2.profile.temperature[:] = 280
+    pam2.profile.pressure[:] = 90000
+    pam2.profile.relativeHumidity[:] = 90
+    pam2.profile.hydrometeorContent[:] = hydrometeorContent
+    pam2.addMissingVariables()
+    pam2.addHydrometeor(
+        pamtra2.hydrometeors.softEllipsoidFixedDensity(
+            name='cloud',
+            nBins=2,
+            sizeBounds=pamtra2.hydrometeors.size.linspaceBounds,
+            sizeCenter=pamtra2.hydrometeors.size.boundsToMid,
+            sizeBoundsWidth=pamtra2.hydrometeors.size.boundsWidth,
+            numberConcentration=pamtra2.hydrometeors.numberConcentration.
+            monoDisperseWC,
+            aspectRatio=1.0,
+            mass=pamtra2.hydrometeors.mass.ellipsoid,
+            density=pamtra2.hydrometeors.density.water,
+            crossSectionArea=pamtra2.hydrometeors.crossSectionArea.sphere,
+            relativePermittivity=pamtra2.hydrometeors.relativePermittivity.
+            water_turner_kneifel_cadeddu,
+            scattering=scattering,
+            fallVelocity=pamtra2.hydrometeors.fallVelocity.
+            khvorostyanov01_drops,
+            Dmin=1e-5 - 1e-10,
+            Dmax=1e-5 + 1e-10,
+            checkTemperatureForRelativePermittivity=False,
+            useFuncArgDefaults=False,
+            **kwargs
+        )
+    )
+    return pam2
+
+
 class TestCore(object):
-    '''
-    Doesn't make sense without the parent...
-    '''
-    pass
+
+    def testIncrementalSolve(self):
+        calls = []
+
+        def countingRayleigh(sizeCenter, wavelength, relativePermittivity):
+            calls.append(1)
+            return pamtra2.hydrometeors.scattering.Rayleigh(
+                sizeCenter, wavelength, relativePermittivity)
+
+        pam2 = _createCloud(countingRayleigh)
+        cloud = pam2.hydrometeors.cloud
+        assert len(calls) == 1
+        assert 'sizeCenter' in cloud.calculationGraph['scattering']
+        assert 'mass' in cloud.calculationGraph['numberConcentration']
+
+        # nothing changed
+        cloud.solve()
+        assert len(calls) == 1
+
+        # only the number concentration depends on the water content
+        pam2.profile.hydrometeorContent[:] = 2e-4
+        profile = cloud.solve()
+        assert len(calls) == 1
+
+        reference = _createCloud(
+            pamtra2.hydrometeors.scattering.Rayleigh,
+            hydrometeorContent=2e-4,
+        ).hydrometeors.cloud.profile
+        assert np.allclose(profile.numberConcentration,
+                           reference.numberConcentration)
+        assert np.allclose(profile.backscatterCrossSection,
+                           reference.backscatterCrossSection)
+
+        # changed temperature requires new permittivity and scattering
+        pam2.profile.temperature[:] = 270
+        cloud.solve()
+        assert len(calls) == 2
+
+        cloud.solve(incremental=False)
+        assert len(calls) == 3
+
+    def testExecutionPlan(self):
+        pam2 = _createCloud(pamtra2.hydrometeors.scattering.Rayleigh)
+        cloud = pam2.hydrometeors.cloud
+        plan = cloud._plan[1]
+        bindings = {key: binding for key, described, binding in plan}
+        assert bindings['aspectRatio'] is None
+        assert ('sizeCenter', 'profile') in bindings['scattering']
+        assert ('temperature', 'parentProfile') in \
+            bindings['relativePermittivity']
+
+        # plan is reused
+        reference = cloud.profile.backscatterCrossSection.copy()
+        cloud.solve(incremental=False)
+        assert cloud._plan[1] is plan
+        assert np.allclose(cloud.profile.backscatterCrossSection, reference)
+
+        # plan is rebuilt for new functions, keyword arguments bound with
+        # functools.partial are supported
+        def scaledRayleigh(sizeCenter, wavelength, relativePermittivity,
+                           factor):
+            return factor * pamtra2.hydrometeors.scattering.Rayleigh(
+                sizeCenter, wavelength, relativePermittivity)
+
+        cloud.description['scattering'] = functools.partial(
+            scaledRayleigh, factor=2.)
+        cloud.useFuncArgDefaults = True
+        cloud.solve()
+        assert cloud._plan[1] is not plan
+        bindings = {key: binding for key, described, binding in
+                    cloud._plan[1]}
+        assert ('factor', 'default') in bindings['scattering']
+        assert np.allclose(cloud.profile.backscatterCrossSection,
+                           2 * reference)
+
+    def testGetProfileWithParent(self):
+        pam2 = _createCloud(pamtra2.hydrometeors.scattering.Rayleigh)
+        cloud = pam2.hydrometeors.cloud
+        merged = cloud.getProfileWithParent(
+            variables=['sizeCenter', 'backscatterCrossSection'],
+            parentVariables=['temperature'],
+        )
+        assert merged.sizeCenter.dims == ('sizeBin',)
+        broadcasted = cloud.getProfileWithParentAllBroadcasted(
+            variables=['sizeCenter', 'backscatterCrossSection'],
+            parentVariables=['temperature'],
+        )
+        assert merged.sizeCenter.size < broadcasted.sizeCenter.size
+        xr.testing.assert_allclose(*xr.broadcast(
+            merged.sizeCenter,
+            broadcasted.sizeCenter.reset_coords(drop=True),
+        ))
+
+        integrated = pam2.getIntegratedScatteringCrossSections(
+            crossSections=['backscatterCrossSection'],
+        )['backscatterCrossSection']
+        reference = (cloud.profile.backscatterCrossSection *
+                     cloud.profile.numberConcentration).sum('sizeBin')
+        xr.testing.assert_allclose(*xr.align(integrated, reference))
+
+    def testValidation(self):
+        pam2 = _createCloud(pamtra2.hydrometeors.scattering.Rayleigh)
+        cloud = pam2.hydrometeors.cloud
+        cloud.description['aspectRatio'] = -1.
+
+        with pytest.raises(ValueError) as excinfo:
+            cloud.solve()
+        assert 'aspectRatio' in str(excinfo.value)
+
+        cloud.validation = 'off'
+        cloud.solve()
+        assert pamtra2.validation.getPolicy() == 'full'
+
+    def testRainN0(self):
+        pam2 = pamtra2.pamtra2(
+            nLayer=3,
+            hydrometeors=['rain'],
+            frequencies=[35e9],
+        )
+        pam2.profile.height[:] = [1000, 2000, 3000]
+        pam2.profile.temperature[:] = 285
+        pam2.profile.pressure[:] = 90000
+        pam2.profile.relativeHumidity[:] = 90
+        pam2.profile.hydrometeorContent[:] = 1e-4
+        pam2.addMissingVariables()
+        rain = pam2.addHydrometeor(pamtra2.hydrometeors.rain(
+            name='rain',
+            nBins=10,
+            N0=1e6,
+            scattering=pamtra2.hydrometeors.scattering.Rayleigh,
+        )).profile
+
+        reference = pamtra2.hydrometeors.numberConcentration.exponentialN0WC(
+            rain.sizeCenter, rain.sizeBoundsWidth, 1e6,
+            pam2.profile.hydrometeorContent.sel(hydrometeor='rain'))
+        assert np.allclose(rain.numberConcentration, reference)
+
+    def testSparse(self):
+        nEvaluated = []
+
+        def countingMie(sizeCenter, wavelength, relativePermittivity):
+            nEvaluated.append(xr.broadcast(
+                sizeCenter, wavelength, relativePermittivity)[0].size)
+            return pamtra2.hydrometeors.scattering.Mie(
+                sizeCenter, wavelength, relativePermittivity)
+
+        hydrometeorContent = np.array([[0], [1e-4], [0]])
+        dense = _createCloud(
+            pamtra2.hydrometeors.scattering.Mie,
+            hydrometeorContent=hydrometeorContent,
+        ).hydrometeors.cloud.profile
+        cloud = _createCloud(
+            countingMie,
+            hydrometeorContent=hydrometeorContent,
+            sparse=True,
+        ).hydrometeors.cloud
+        sparse = cloud.profile
+
+        # only one of three layers has particles
+        assert nEvaluated == [2]
+        assert sparse.backscatterCrossSection.dims == \
+            dense.backscatterCrossSection.dims
+        assert np.allclose(sparse.backscatterCrossSection.isel(layer=1),
+                           dense.backscatterCrossSection.isel(layer=1))
+        assert np.all(sparse.backscatterCrossSection.isel(layer=[0, 2]) == 0)
+        assert np.allclose(sparse.fallVelocity.isel(layer=1),
+                           dense.fallVelocity.isel(layer=1))
+        assert np.allclose(sparse.relativePermittivity.isel(layer=1),
+                           dense.relativePermittivity.isel(layer=1))
+
+        # scattering is recalculated when particles appear
+        cloud._parentFull.profile.hydrometeorContent[:] = 1e-4
+        sparse = cloud.solve()
+        assert nEvaluated == [2, 6]
+        assert np.allclose(sparse.backscatterCrossSection,
+                           dense.backscatterCrossSection.isel(layer=1))
 
 
 class TestCrossSectionArea(object):
@@ -100,6 +315,21 @@ class TestDensity(object):
             den2 = func(sizeCenter, aspectRatio, mass, maxDensity=999)
             assert den2 == 999
 
+    def testMixed(self):
+        sizeCenter = np.array([1., 1.])
+        aspectRatio = np.array([0.6, 1.6])
+        mass = np.array([100., 100.])
+        oblate = pamtra2.hydrometeors.density.softOblateEllipsoid(
+            sizeCenter, 0.6, mass)
+        prolate = pamtra2.hydrometeors.density.softProlateEllipsoid(
+            sizeCenter, 1.6, mass)
+        den = pamtra2.hydrometeors.density.softEllipsoid(
+            sizeCenter, aspectRatio, mass)
+        assert np.allclose(den, [oblate[0], prolate[1]])
+        den = pamtra2.hydrometeors.density.softEllipsoid(
+            sizeCenter, 1.6, mass)
+        assert np.allclose(den, prolate)
+
 
 class TestMass(object):
     def testPowerLaw(self):
@@ -155,6 +385,18 @@ class TestMass(object):
         assert np.all(sp1 == sp2)
         assert np.all(sp1 > sp3)
 
+    def testMixedEllipsoid(self):
+        sizeCenter = np.arange(1, 11)
+        density = 1000
+        aspectRatio = np.where(sizeCenter % 2 == 0, 0.5, 2.)
+        sp1 = pamtra2.hydrometeors.mass.oblateEllipsoid(
+            sizeCenter, 0.5, density)
+        sp2 = pamtra2.hydrometeors.mass.prolateEllipsoid(
+            sizeCenter, 2., density)
+        sp3 = pamtra2.hydrometeors.mass.ellipsoid(
+            sizeCenter, aspectRatio, density)
+        assert np.allclose(sp3, np.where(aspectRatio <= 1, sp1, sp2))
+
     def testOblateEllipsoid(self):
         sizeCenter = np.arange(1, 11)
         sp1 = pamtra2.hydrometeors.mass.waterSphere(sizeCenter)
@@ -342,6 +584,188 @@ class TestScattering(object):
         )[3]
         assert np.allclose(back1, back2)
 
+    def testRayleighCrossSections(self):
+        diameter = np.linspace(1e-4, 1e-3, 5)
+        wavelength = np.array([1e-2, 3e-3])[:, np.newaxis]
+        relativePermittivity = 5.97+2.79j
+        back = pamtra2.hydrometeors.scattering._RayleighWrapper(
+            diameter, wavelength, relativePermittivity)[..., 3]
+        K2 = np.abs((relativePermittivity - 1)/(relativePermittivity + 2))**2
+        assert back.shape == (2, 5)
+        assert np.allclose(back, np.pi**5 * K2 * diameter**6 / wavelength**4)
+
+    def testLazyAmplitudeMatrix(self):
+        singleScattering = pamtra2.libs.singleScattering
+        diameter = np.linspace(1e-4, 1e-3, 5)
+        wavelength = 1e-2
+        relativePermittivity = 5.97+2.79j
+        # horizontal backscattering
+        geometry = dict(theta_inc=np.pi/2, theta_sca=np.pi/2, phi_inc=0.,
+                        phi_sca=np.pi)
+
+        for Scatt in [singleScattering.rayleigh.RayleighScatt,
+                      singleScattering.mie.MieScatt]:
+            scatt = Scatt(
+                diameter,
+                wavelength=wavelength,
+                dielectric_permittivity=relativePermittivity,
+                **geometry
+            )
+            assert scatt._S is None
+            assert scatt.S.shape == (5, 2, 2)
+            Z = scatt.Z
+            assert Z.shape == (5, 4, 4)
+            assert np.allclose(4*np.pi*Z[:, 0, 0], scatt.Cbck)
+
+            fast = Scatt(
+                diameter,
+                wavelength=wavelength,
+                dielectric_permittivity=relativePermittivity,
+                cross_sections_only=True,
+                **geometry
+            )
+            assert np.allclose(fast.Cbck, scatt.Cbck)
+            with pytest.raises(AttributeError):
+                fast.S
+
+    def testDatabase(self, tmp_path):
+        singleScattering = pamtra2.libs.singleScattering
+        frequency = np.array([35e9, 94e9])[:, np.newaxis, np.newaxis]
+        temperature = np.array([263., 283.])[np.newaxis, :, np.newaxis]
+        diameter = np.logspace(-6, -2, 81)[np.newaxis, np.newaxis, :]
+        permittivity = pamtra2.hydrometeors.relativePermittivity.\
+            water_turner_kneifel_cadeddu(
+                *np.broadcast_arrays(temperature, frequency))
+        scatt = singleScattering.mie.MieScatt(
+            np.broadcast_to(diameter, (2, 2, 81)),
+            frequency=np.broadcast_to(frequency, (2, 2, 81)),
+            dielectric_permittivity=np.broadcast_to(
+                permittivity, (2, 2, 81)),
+            cross_sections_only=True,
+        )
+        # shuffled records
+        order = np.random.permutation(2*2*81)
+        database = singleScattering.database.create_database(
+            str(tmp_path / 'mie'),
+            np.broadcast_to(frequency, (2, 2, 81)).ravel()[order],
+            np.broadcast_to(temperature, (2, 2, 81)).ravel()[order],
+            np.broadcast_to(diameter, (2, 2, 81)).ravel()[order],
+            scatt.Cext.ravel()[order],
+            scatt.Csca.ravel()[order],
+            scatt.Cabs.ravel()[order],
+            scatt.Cbck.ravel()[order],
+        )
+
+        # tabulated values are reproduced
+        result = database.lookup(frequency, temperature, diameter)
+        assert np.allclose(result[0], scatt.Cext)
+        assert np.allclose(result[3], scatt.Cbck)
+
+        # interpolation between tabulated sizes
+        sizes = np.sqrt(diameter[..., 1:] * diameter[..., :-1])[0, 0, :60]
+        reference = singleScattering.mie.MieScatt(
+            sizes,
+            frequency=94e9,
+            dielectric_permittivity=permittivity[1, 0, 0],
+            cross_sections_only=True,
+        )
+        result = singleScattering.database.DatabaseScatt(
+            sizes, frequency=94e9, temperature=263., database=database)
+        assert np.allclose(result.Cext, reference.Cext, rtol=1e-2)
+        assert np.allclose(result.Cbck, reference.Cbck, rtol=1e-2)
+
+        # outside of the tabulated sizes
+        assert np.isnan(database.lookup(94e9, 263., 0.1)[0])
+        # NaN temperatures
+        crossSections = database.lookup(94e9, [263., np.nan], 1e-3)
+        assert np.all(np.isfinite([cc[0] for cc in crossSections]))
+        assert np.all(np.isnan([cc[1] for cc in crossSections]))
+        with pytest.raises(ValueError):
+            database.lookup(50e9, 263., 1e-3)
+
+        # via the generic interface
+        Cext = singleScattering.scattering(
+            sizes, frequencies=94e9, model='LiuDB', database=str(
+                tmp_path / 'mie'), temperature=263.)[0]
+        assert np.allclose(Cext, result.Cext)
+
+        # in pamtra2
+        pam2 = _createCloud(
+            pamtra2.hydrometeors.scattering.databaseScattering(database))
+        reference = _createCloud(pamtra2.hydrometeors.scattering.Mie)
+        assert np.allclose(
+            pam2.hydrometeors.cloud.profile.backscatterCrossSection,
+            reference.hydrometeors.cloud.profile.backscatterCrossSection,
+            rtol=2e-2,
+        )
+
+    def testDispatchUnique(self):
+        scattering = pamtra2.hydrometeors.scattering
+        diameter = np.linspace(1e-4, 1e-3, 5)[np.newaxis, :]
+        wavelength = np.array([1e-2, 3e-3])[:, np.newaxis]
+        relativePermittivity = np.array(
+            [[5.97+2.79j], [5.97+2.79j]])
+        diameter, wavelength, relativePermittivity = np.broadcast_arrays(
+            np.stack([diameter] * 3), wavelength, relativePermittivity)
+
+        reference = scattering._MieRayleighWrapper(
+            diameter, wavelength, relativePermittivity, model='Mie')
+
+        scattering.deduplicationCounter.reset()
+        deduplicated = scattering.dispatchUnique(
+            scattering._MieRayleighWrapper,
+            diameter,
+            wavelength,
+            relativePermittivity,
+            model='Mie',
+        )
+        assert deduplicated.shape == (3, 2, 5, 4)
+        assert np.allclose(deduplicated, reference)
+        assert scattering.deduplicationCounter.nInputs == 30
+        assert scattering.deduplicationCounter.nUnique == 10
+        assert scattering.deduplicationCounter.reductionFactor == 3
+
+        elementwise = scattering.dispatchUnique(
+            scattering._TMatrixWrapper,
+            diameter,
+            1.,
+            wavelength,
+            relativePermittivity,
+            elementwise=True,
+        )
+        assert np.allclose(elementwise[..., 3], reference[..., 3])
+
+
+    def testHybrid(self):
+        scattering = pamtra2.hydrometeors.scattering
+        hybrid = scattering.hybridScattering(rayleighSizeParameter=0.01)
+        sizeCenter = xr.DataArray(
+            np.logspace(-6, -2.5, 30), dims=['sizeBin'])
+        wavelength = xr.DataArray(
+            [3e8/35e9, 3e8/94e9], dims=['frequency'])
+        relativePermittivity = xr.DataArray(
+            [11.5+19.5j, 7+8.4j], dims=['frequency'])
+
+        sphere = hybrid(sizeCenter, 1., wavelength, relativePermittivity)
+        reference = scattering.Mie(
+            sizeCenter, wavelength, relativePermittivity)
+        assert sphere.dims == ('sizeBin', 'frequency', 'scatteringProperty')
+        assert np.allclose(sphere, reference, rtol=2e-3, atol=0)
+        assert hybrid.report.nBins['TMatrix'] == 0
+        assert hybrid.report.nBins['Rayleigh'] > 0
+        assert hybrid.report.nBins['Mie'] > 0
+        assert hybrid.report.nBins['Rayleigh'] + \
+            hybrid.report.nBins['Mie'] == 60
+        assert 0 < hybrid.report.maxRayleighError < 2e-3
+
+        hybrid.report.reset()
+        spheroid = hybrid(
+            sizeCenter[:3], 0.6, wavelength, relativePermittivity)
+        reference = scattering.TMatrix(
+            sizeCenter[:3], 0.6, wavelength, relativePermittivity)
+        assert np.allclose(spheroid, reference)
+        assert hybrid.report.nBins['TMatrix'] == 6
+
 
 class TestFallVelocity(object):
     def test_khvorostyanov01_drops(self):
@@ -379,3 +803,157 @@ class TestFallVelocity(object):
             [0.56276112, 0.74952901, 0.82443195, 0.86752849, 0.89629312])
 
         assert np.allclose(velSpec, refSpec)
+
+
+class TestKernels(object):
+    def setUp(self):
+        np.random.seed(0)
+        shape = (4, 50)
+        self.sizeCenter = np.random.uniform(1e-5, 1e-2, shape)
+        self.aspectRatio = np.random.uniform(0.5, 1.5, shape)
+        self.dryAirDensity = np.random.uniform(0.5, 1.3, (4, 1))
+        self.dynamicViscosity = np.random.uniform(1.5e-5, 1.8e-5, (4, 1))
+        self.kinematicViscosity = self.dynamicViscosity / self.dryAirDensity
+        self.mass = pamtra2.hydrometeors.mass.powerLaw(
+            self.sizeCenter, 0.0121, 1.9)
+        self.area = pamtra2.hydrometeors.crossSectionArea.powerLaw(
+            self.sizeCenter, 0.3, 1.9)
+
+    def _calls(self):
+        hydro = pamtra2.hydrometeors
+        return [
+            (hydro.mass.powerLaw, (self.sizeCenter, 0.0121, 1.9)),
+            (hydro.mass.waterSphere, (self.sizeCenter,)),
+            (hydro.mass.ellipsoid, (self.sizeCenter, self.aspectRatio, 200.)),
+            (hydro.mass.ellipsoid, (self.sizeCenter, 0.6, 200.)),
+            (hydro.mass.ellipsoid, (self.sizeCenter, 1.6, 200.)),
+            (hydro.crossSectionArea.sphere, (self.sizeCenter,)),
+            (hydro.density.softEllipsoid,
+             (self.sizeCenter, self.aspectRatio, self.mass)),
+            (hydro.density.softEllipsoid, (self.sizeCenter, 1.6, self.mass)),
+            (hydro.fallVelocity.heymsfield10_particles,
+             (self.sizeCenter, self.mass, self.area, self.dynamicViscosity,
+              self.dryAirDensity)),
+            (hydro.fallVelocity.khvorostyanov01_drops,
+             (self.sizeCenter, self.dryAirDensity, self.kinematicViscosity)),
+        ]
+
+    def test_parity(self):
+        pytest.importorskip('numba')
+        self.setUp()
+        for func, args in self._calls():
+            reference = func(*args)
+            with pamtra2.hydrometeors.kernels.useBackend('numba'):
+                compiled = func(*args)
+            assert compiled.shape == reference.shape
+            assert np.allclose(compiled, reference, rtol=1e-12, atol=0)
+
+    def test_xarray(self):
+        pytest.importorskip('numba')
+        self.setUp()
+        sizeCenter = xr.DataArray(self.sizeCenter, dims=['layer', 'sizeBin'])
+        dryAirDensity = xr.DataArray(self.dryAirDensity[:, 0], dims=['layer'])
+        kinematicViscosity = xr.DataArray(
+            self.kinematicViscosity[:, 0], dims=['layer'])
+        func = pamtra2.hydrometeors.fallVelocity.khvorostyanov01_drops
+        reference = func(sizeCenter, dryAirDensity, kinematicViscosity)
+        with pamtra2.hydrometeors.kernels.useBackend('numba'):
+            compiled = func(sizeCenter, dryAirDensity, kinematicViscosity)
+            lazy = func(sizeCenter.chunk({'layer': 2}), dryAirDensity,
+                        kinematicViscosity)
+        assert compiled.dims == reference.dims
+        assert lazy.chunks is not None
+        xr.testing.assert_allclose(compiled, reference, rtol=1e-12)
+        xr.testing.assert_allclose(lazy.compute(), reference, rtol=1e-12)
+
+    def test_solve(self):
+        pytest.importorskip('numba')
+        reference = _createCloud(
+            pamtra2.hydrometeors.scattering.Rayleigh).hydrometeors.cloud.solve()
+        with pamtra2.hydrometeors.kernels.useBackend('numba'):
+            compiled = _createCloud(
+                pamtra2.hydrometeors.scattering.Rayleigh
+            ).hydrometeors.cloud.solve()
+        for key in ['mass', 'crossSectionArea', 'fallVelocity']:
+            assert np.allclose(compiled[key], reference[key], rtol=1e-12)
+
+    def test_backend(self):
+        assert pamtra2.hydrometeors.kernels.getBackend() == 'numpy'
+        with pytest.raises(ValueError):
+            pamtra2.hydrometeors.kernels.setBackend('fortran')
+
+
+class TestMoments(object):
+    @pytest.mark.parametrize('mu, gamma, Dmin, Dmax', [
+        (0., 1., 0., np.inf),
+        (2., 1., 1e-4, 5e-3),
+        (1., 0.8, 1e-5, 1e-2),
+    ])
+    def test_truncatedMoment(self, mu, gamma, Dmin, Dmax):
+        scipy = pytest.importorskip('scipy.integrate')
+        N0 = 1e7
+        lambd = 2000.
+        for order in [0., 1.9, 6.]:
+            analytic = pamtra2.hydrometeors.moments.truncatedMoment(
+                order, N0, lambd, mu, gamma, Dmin, Dmax)
+            numeric = scipy.quad(
+                lambda D: D**order * N0 * D**mu * np.exp(-lambd * D**gamma),
+                Dmin, Dmax, epsabs=0, epsrel=1e-10)[0]
+            assert np.isclose(analytic, numeric, rtol=1e-7, atol=0)
+
+    def _create(self, hydro, hydrometeorContent):
+        pam2 = pamtra2.pamtra2(
+            nLayer=3,
+            hydrometeors=['rain'],
+            frequencies=[9.6e9, 35e9],
+        )
+        pam2.profile.height[:] = [1000, 2000, 3000]
+        pam2.profile.temperature[:] = 285
+        pam2.profile.pressure[:] = 90000
+        pam2.profile.relativeHumidity[:] = 90
+        pam2.profile.hydrometeorContent[:] = np.broadcast_to(
+            hydrometeorContent, (3,))[:, np.newaxis]
+        pam2.addMissingVariables()
+        pam2.addHydrometeor(hydro)
+        return pam2.addInstrument(pamtra2.instruments.radar.simpleRadar(
+            name='radar', frequencies=[9.6e9, 35e9])).results
+
+    @pytest.mark.parametrize('mu, gamma', [(0., 1.), (2., 1.), (1., 0.8)])
+    def test_binned(self, mu, gamma):
+        kwargs = dict(
+            name='rain',
+            N0=8e6,
+            lambd=xr.DataArray([4000., 3000., 2000.], dims=['layer']),
+            mu=mu,
+            gamma=gamma,
+            Dmin=1e-5,
+            Dmax=5e-3,
+        )
+        binned = self._create(pamtra2.hydrometeors.cloud(
+            nBins=2000,
+            sizeBounds=pamtra2.hydrometeors.size.logspaceBounds,
+            numberConcentration=pamtra2.hydrometeors.numberConcentration.
+            modifiedGamma,
+            scattering=pamtra2.hydrometeors.scattering.Rayleigh,
+            fallVelocity=lambda sizeCenter: 386.6 * sizeCenter**0.67,
+            **kwargs
+        ), 1e-4)
+        analytic = self._create(
+            pamtra2.hydrometeors.momentHydrometeor(**kwargs), 1e-4)
+
+        assert np.allclose(analytic.radarReflectivity,
+                           binned.radarReflectivity, rtol=0, atol=1e-3)
+        for key in ['meanDopplerVel', 'specificAttenuation']:
+            assert np.allclose(analytic[key], binned[key], rtol=1e-4)
+
+    def test_hydrometeorContent(self):
+        results = self._create(
+            pamtra2.hydrometeors.momentHydrometeor(name='rain'),
+            [0, 1e-4, 1e-3])
+        # Z = 720 * N0 / lambd**7 for an exponential distribution
+        lambd = (np.pi * 1000 * 8e6 / np.array([1e-4, 1e-3]))**0.25
+        Ze = 10 * np.log10(720 * 8e6 * lambd**-7 * 1e18)
+        reflectivity = results.radarReflectivity.sel(frequency=9.6e9)
+        assert np.isneginf(reflectivity[0])
+        # Rayleigh reflectivity with radarK2 of water
+        assert np.allclose(reflectivity[1:], Ze, atol=0.05)
@@ -1 +1,82 @@
 import pamtra2
+import numpy as np
+import pytest
+
+
+@pytest.mark.parametrize('model', ['Rosenkranz98', 'Liebe93'])
+def test_gaseous_absorption_lookup_table(model):
+
+    pam2 = pamtra2.pamtra2(
+        nLayer=3,
+        hydrometeors=[],
+        frequencies=[35e9, 94e9],
+    )
+    pam2.profile.height[:] = [500, 1000, 5000]
+    pam2.profile.temperature[:] = [285, 280, 255]
+    pam2.profile.relativeHumidity[:] = [90, 80, 50]
+    pam2.profile.pressure[:] = [95000, 90000, 55000]
+    pam2.addMissingVariables()
+
+    exact = pamtra2.instruments.microwaveInstrument(
+        parent=pam2,
+        gaseousAttenuationModel=model,
+    )
+    exact._link_parent()
+    exact = exact._calcGaseousAbsorption()
+    lookup = pamtra2.instruments.microwaveInstrument(
+        parent=pam2,
+        gaseousAttenuationModel='%sLookupTable' % model,
+    )
+    lookup._link_parent()
+    interpolated = lookup._calcGaseousAbsorption()
+
+    assert np.allclose(interpolated, exact, rtol=0.02, atol=0)
+    assert interpolated.dims == exact.dims
+
+    # table is cached
+    table = lookup._gasAbsorptionLookupTable
+    lookup._calcGaseousAbsorption()
+    assert lookup._gasAbsorptionLookupTable is table
+
+
+def test_memo():
+
+    pam2 = pamtra2.pamtra2(
+        nLayer=3,
+        hydrometeors=[],
+        frequencies=[35e9, 94e9],
+    )
+    pam2.profile.height[:] = [500, 1000, 5000]
+    pam2.profile.temperature[:] = [285, 280, 255]
+    pam2.profile.relativeHumidity[:] = [90, 80, 50]
+    pam2.profile.pressure[:] = [95000, 90000, 55000]
+    pam2.addMissingVariables()
+
+    first = pam2.addInstrument(
+        pamtra2.instruments.radar.simpleRadar(name='first')).results
+    second = pam2.addInstrument(
+        pamtra2.instruments.radar.simpleRadar(name='second')).results
+    # calculated only once
+    assert second.specificAttenuation.data is first.specificAttenuation.data
+
+    # modifying the profile in place invalidates the memo
+    pam2.profile.temperature[:] = [290, 285, 260]
+    pam2.profile.waterVaporPressure[:] = 0
+    third = pam2.addInstrument(
+        pamtra2.instruments.radar.simpleRadar(name='third')).results
+    assert np.all(third.specificAttenuation < first.specificAttenuation)
+
+    # other frequencies are stored separately
+    single = pam2.addInstrument(
+        pamtra2.instruments.radar.simpleRadar(
+            name='single', frequencies=[94e9])).results
+    assert np.allclose(single.specificAttenuation,
+                       third.specificAttenuation.sel(frequency=[94e9]))
+
+    pam2.clearMemo()
+    fourth = pam2.addInstrument(
+        pamtra2.instruments.radar.simpleRadar(name='fourth')).results
+    assert fourth.specificAttenuation.data is not \
+        third.specificAttenuation.data
+    assert np.allclose(fourth.specificAttenuation,
+                       third.specificAttenuation)
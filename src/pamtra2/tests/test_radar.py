@@ -27,6 +27,7 @@ def create_simple_cloud_creator():
         hydrometeor='cloud',
         hydrometeorContent=0.0001,
         verbosity=0,
+        frequencies=[3e9],
         **kwargs
     ):
 
@@ -36,7 +37,7 @@ def create_simple_cloud_creator():
             nLayer=nHeights,
             hydrometeors=['hydrometeor'],
             additionalDims=additionalDims,
-            frequencies=[3e9],
+            frequencies=frequencies,
         )
 
         pam2.profile.height[:] = 1000
@@ -384,6 +385,390 @@ def test_scale_edr(create_simple_cloud_creator, edr, result):
     assert np.allclose(m10, result, rtol=2e-01, atol=2e-01)
 
 
+def _create_two_clouds(combineHydrometeorBins):
+    pam2 = pamtra2.pamtra2(
+        nLayer=3,
+        hydrometeors=['cloud', 'drizzle'],
+        frequencies=[3e9, 35e9],
+        combineHydrometeorBins=combineHydrometeorBins,
+    )
+    pam2.profile.height[:] = [1000, 1100, 1200]
+    pam2.profile.temperature[:] = 280
+    pam2.profile.relativeHumidity[:] = 90
+    pam2.profile.pressure[:] = 100000
+    pam2.profile.eddyDissipationRate[:] = 1e-3
+    pam2.profile.horizontalWind[:] = 10
+    pam2.profile.verticalWind[:] = 0
+    pam2.profile.hydrometeorContent[:] = 1e-4
+    pam2.profile['heightBinDepth'] = 100
+    pam2.addMissingVariables()
+
+    for name, size, nBins in [('cloud', 1e-4, 2), ('drizzle', 5e-4, 3)]:
+        pam2.addHydrometeor(
+            pamtra2.hydrometeors.softEllipsoidFixedDensity(
+                name=name,
+                nBins=nBins,
+                sizeBounds=pamtra2.hydrometeors.size.linspaceBounds,
+                sizeCenter=pamtra2.hydrometeors.size.boundsToMid,
+                sizeBoundsWidth=pamtra2.hydrometeors.size.boundsWidth,
+                numberConcentration=pamtra2.hydrometeors.numberConcentration.
+                monoDisperse,
+                aspectRatio=1.0,
+                mass=pamtra2.hydrometeors.mass.ellipsoid,
+                density=pamtra2.hydrometeors.density.water,
+                crossSectionArea=pamtra2.hydrometeors.crossSectionArea.sphere,
+                relativePermittivity=pamtra2.hydrometeors.
+                relativePermittivity.water_turner_kneifel_cadeddu,
+                scattering=pamtra2.hydrometeors.scattering.Rayleigh,
+                fallVelocity=pamtra2.hydrometeors.fallVelocity.
+                khvorostyanov01_drops,
+                Dmin=size,
+                Dmax=size * 1.1,
+                Ntot=xr.DataArray([10, 100, 1000],
+                                  coords=[pam2.profile.layer]),
+                checkTemperatureForRelativePermittivity=False,
+                useFuncArgDefaults=False,
+            )
+        )
+    return pam2
+
+
+def test_combined_bins():
+    separate = _create_two_clouds(False)
+    combined = _create_two_clouds(True)
+
+    bins, offsets = combined.getCombinedBins(
+        ['sizeCenter', 'numberConcentration'])
+    assert bins.sizes['bin'] == 5
+    assert offsets['drizzle'] == slice(2, 5)
+    assert np.all(
+        bins.binHydrometeor.isel(bin=offsets['drizzle']) == 'drizzle')
+    assert np.allclose(
+        bins.sizeCenter.isel(bin=offsets['drizzle']),
+        combined.hydrometeors.drizzle.profile.sizeCenter)
+
+    for pam2 in [separate, combined]:
+        pam2.addInstrument(
+            pamtra2.instruments.radar.simpleRadar(name='simple'))
+        pam2.addInstrument(
+            pamtra2.instruments.radar.dopplerRadarPamtra(
+                name='spectral',
+                momentsNPeaks=1,
+                seed=11,
+                radarAliasingNyquistInterv=0,
+            ))
+
+    for instrument, variables in [
+        ('simple', ['radarReflectivity', 'meanDopplerVel',
+                    'specificAttenuation']),
+        ('spectral', ['radarIdealizedSpectrum', 'radarReflectivity']),
+    ]:
+        for var in variables:
+            xr.testing.assert_allclose(
+                separate.instruments[instrument].results[var],
+                combined.instruments[instrument].results[var],
+            )
+
+
+@pytest.mark.parametrize('combineHydrometeorBins', [False, True])
+def test_integrated_cross_sections(combineHydrometeorBins):
+    pam2 = _create_two_clouds(combineHydrometeorBins)
+
+    integrated = pam2.getIntegratedScatteringCrossSections()
+    assert sorted(integrated.keys()) == sorted([
+        'extinctionCrossSection',
+        'scatterCrossSection',
+        'absorptionCrossSection',
+        'backscatterCrossSection',
+    ])
+    for crossSection, value in integrated.items():
+        reference = sum(
+            xr.dot(
+                pam2.hydrometeors[name].profile[crossSection].fillna(0),
+                pam2.hydrometeors[name].profile.numberConcentration.fillna(
+                    0),
+                dims='sizeBin',
+            ) for name in ['cloud', 'drizzle']
+        )
+        assert value.sizes['frequency'] == 2
+        xr.testing.assert_allclose(value, reference.transpose(*value.dims))
+
+        # only the requested frequency is evaluated
+        subset = pam2.getIntegratedScatteringCrossSections(
+            frequencies=[35e9],
+            crossSections=[crossSection],
+        )[crossSection]
+        assert np.all(subset.frequency == [35e9])
+        xr.testing.assert_allclose(subset, value.sel(frequency=[35e9]))
+
+
+@pytest.mark.parametrize("nAve", [1, 20, 150])
+def test_gamma_noise_engine(nAve):
+    simulator = pamtra2.libs.pyPamtraRadarSimulator
+    nHeights = 200
+    nfft = 256
+    kwargs = dict(
+        height=np.full(nHeights, 1000.),
+        eddyDissipationRate=np.full(nHeights, 1e-3),
+        horizontalWind=np.full(nHeights, 10.),
+        mergedParticleSpec=np.zeros((nHeights, nfft)),
+        pathIntegratedAttenuation=np.zeros(nHeights),
+        wavelength=np.full(nHeights, 0.1),
+        radarAliasingNyquistInterv=0,
+        radarNFFT=nfft,
+        radarNAve=nAve,
+        seed=11,
+    )
+    noiseFree = simulator.simulateRadarSpectrum(
+        **dict(kwargs, radarNAve=0))
+    exponential = simulator.simulateRadarSpectrum(
+        radarNoiseEngine='exponential', **kwargs) / noiseFree
+    gamma = simulator.simulateRadarSpectrum(
+        radarNoiseEngine='gamma', **kwargs) / noiseFree
+
+    # mean 1 and variance 1/nAve, i.e. the same statistics
+    for noise in [exponential, gamma]:
+        assert np.isclose(noise.mean(), 1, atol=0.01)
+        assert np.isclose(noise.var() * nAve, 1, rtol=0.05)
+    assert np.isclose(np.median(exponential), np.median(gamma), rtol=0.02)
+    assert np.isclose(np.percentile(exponential, 95),
+                      np.percentile(gamma, 95), rtol=0.02)
+
+    # reproducible with fixed seed
+    assert np.all(gamma == simulator.simulateRadarSpectrum(
+        radarNoiseEngine='gamma', **kwargs) / noiseFree)
+
+
+def test_threads():
+    simulator = pamtra2.libs.pyPamtraRadarSimulator
+    moments = pamtra2.libs.pyPamtraRadarMoments
+    nHeights = 50
+    nfft = 256
+    spec = np.exp(-0.5 * ((np.arange(nfft) - 100) / 20.)**2)
+    kwargs = dict(
+        height=np.full(nHeights, 1000.),
+        eddyDissipationRate=np.full(nHeights, 1e-3),
+        horizontalWind=np.full(nHeights, 10.),
+        mergedParticleSpec=np.tile(spec, (nHeights, 1)),
+        pathIntegratedAttenuation=np.zeros(nHeights),
+        wavelength=np.full(nHeights, 0.1),
+        radarAliasingNyquistInterv=0,
+        radarNFFT=nfft,
+        radarNAve=10,
+        seed=11,
+    )
+
+    results = []
+    try:
+        for nThreads in [1, 4]:
+            simulator.setNumThreads(nThreads)
+            moments.setNumThreads(nThreads)
+            assert simulator.getNumThreads() in [1, nThreads]
+            spectrum = simulator.simulateRadarSpectrum(**kwargs)
+            results.append(
+                (spectrum,) + moments.calc_radarMoments(spectrum))
+    finally:
+        simulator.setNumThreads(0)
+        moments.setNumThreads(0)
+
+    # independent of the number of threads
+    for single, multi in zip(*results):
+        np.testing.assert_array_equal(single, multi)
+
+
+def test_realizations(create_simple_cloud_creator):
+    radar = create_simple_cloud_creator(
+        instrument='spectral',
+        nHeights=2,
+        Ntot=[1, 10],
+    )
+    idealized = radar.results.radarIdealizedSpectrum.data
+
+    results = radar.solveRealizations(3)
+    assert results.radarIdealizedSpectrum.data is idealized
+    assert results.radarSpectrum.sizes['realization'] == 3
+    assert results.radarReflectivity.sizes['realization'] == 3
+    # seeds spaced by the number of gates
+    assert np.all(results.realizationSeed == [11, 13, 15])
+
+    # first realization equals the single realization of solve
+    single = create_simple_cloud_creator(
+        instrument='spectral',
+        nHeights=2,
+        Ntot=[1, 10],
+    ).results
+    assert np.allclose(results.radarSpectrum.isel(realization=0),
+                       single.radarSpectrum)
+    assert np.allclose(results.radarReflectivity.isel(realization=0),
+                       single.radarReflectivity, equal_nan=True)
+    assert not np.allclose(results.radarSpectrum.isel(realization=1),
+                           results.radarSpectrum.isel(realization=2))
+
+    # reproducible with given seeds
+    spectra = radar.solveRealizations(2, seeds=[15, 11]).radarSpectrum
+    assert np.allclose(spectra.isel(realization=0),
+                       results.radarSpectrum.isel(realization=2))
+
+    with pytest.raises(ValueError):
+        radar.solveRealizations(2, seeds=[1])
+
+    # solve replaces the realizations
+    results = radar.solve()
+    assert 'realization' not in results.dims
+    assert np.allclose(results.radarSpectrum, single.radarSpectrum)
+    assert np.allclose(results.radarReflectivity, single.radarReflectivity,
+                       equal_nan=True)
+
+    # with identical gates, realizations are not shifted copies of each
+    # other
+    radar = create_simple_cloud_creator(
+        instrument='spectral',
+        nHeights=2,
+        Ntot=[10, 10],
+    )
+    spectra = radar.solveRealizations(2).radarSpectrum
+    assert np.allclose(radar.results.radarIdealizedSpectrum.isel(layer=0),
+                       radar.results.radarIdealizedSpectrum.isel(layer=1))
+    assert not np.allclose(spectra.isel(realization=1, layer=0),
+                           spectra.isel(realization=0, layer=1))
+
+
+def test_noise_free(create_simple_cloud_creator):
+    noisy = create_simple_cloud_creator(
+        instrument='spectral',
+        nHeights=2,
+        Ntot=[1, 10],
+        radarPNoise1000=-60,
+    )
+    noiseFree = noisy.parent.addInstrument(
+        pamtra2.instruments.radar.dopplerRadarPamtra(
+            name='noiseFree',
+            frequencies=3e9,
+            radarAliasingNyquistInterv=0,
+            noiseFree=True,
+        )
+    ).results
+
+    assert 'radarSpectrum' not in noiseFree.variables
+    assert noiseFree.radarReflectivity.sizes['peak'] == 1
+    for var, atol in [
+        ('radarReflectivity', 0.5),
+        ('meanDopplerVel', 0.05),
+        ('spectrumWidth', 0.05),
+    ]:
+        assert np.allclose(noiseFree[var],
+                           noisy.results[var].isel(peak=[0]),
+                           rtol=0, atol=atol)
+
+
+@pytest.mark.parametrize('edr, horizontalWind, radarMaxV, tolerances', [
+    # mean Doppler velocity of 3.7 m/s, i.e. the peak crosses the Nyquist
+    # limit and is broadened numerically
+    (1e-3, 10, 3.8, [
+        ('radarReflectivity', 0.5),
+        ('meanDopplerVel', 0.05),
+        ('spectrumWidth', 0.05),
+        ('skewness', 0.1),
+    ]),
+    # narrow peak in the next Nyquist interval, folded analytically. The
+    # noisy width is limited by the resolution of the spectrum.
+    (1e-6, 0, 2.5, [
+        ('meanDopplerVel', 0.05),
+    ]),
+])
+def test_noise_free_aliasing(create_simple_cloud_creator, edr,
+                             horizontalWind, radarMaxV, tolerances):
+    pam2 = create_simple_cloud_creator(
+        nHeights=2,
+        Ntot=[1, 10],
+        edr=edr,
+    ).parent
+    pam2.profile.horizontalWind[:] = horizontalWind
+    results = {}
+    for noiseFree in [False, True]:
+        results[noiseFree] = pam2.addInstrument(
+            pamtra2.instruments.radar.dopplerRadarPamtra(
+                name='noiseFree%s' % noiseFree,
+                frequencies=3e9,
+                seed=11,
+                momentsNPeaks=1,
+                radarAliasingNyquistInterv=1,
+                radarMaxV=radarMaxV,
+                radarMinV=-radarMaxV,
+                radarPNoise1000=-60,
+                noiseFree=noiseFree,
+            )
+        ).results
+
+    noiseFree = results[True]
+    assert np.all(noiseFree.meanDopplerVel >= -radarMaxV)
+    assert np.all(noiseFree.meanDopplerVel <= radarMaxV)
+    for var, atol in tolerances:
+        assert np.allclose(noiseFree[var],
+                           results[False][var].isel(peak=[0]),
+                           rtol=0, atol=atol)
+
+
+def test_per_frequency_settings(create_simple_cloud_creator):
+    pam2 = create_simple_cloud_creator(
+        nHeights=2,
+        Ntot=[1, 10],
+        frequencies=[3e9, 35e9],
+    ).parent
+    settings = dict(momentsNPeaks=1, radarAliasingNyquistInterv=0)
+    perFrequency = dict(
+        radarNFFT=[256, 128],
+        radarMaxV=[7.885, 10.],
+        radarMinV=[-7.885, -10.],
+        radarPNoise1000=[-30, -40],
+    )
+    both = pam2.addInstrument(
+        pamtra2.instruments.radar.dopplerRadarPamtra(
+            name='both',
+            frequencies=[3e9, 35e9],
+            seed=11,
+            **settings,
+            **perFrequency,
+        )
+    ).results
+    assert both.radarSpectrum.sizes['dopplerVelocity'] == 256
+    assert 'dopplerVelocityGrid' in both.coords
+
+    # the same as separate instruments, the random numbers of the second
+    # group continue after the 2 gates of the first one.
+    for ii, (frequency, seed) in enumerate(zip([3e9, 35e9], [11, 13])):
+        single = pam2.addInstrument(
+            pamtra2.instruments.radar.dopplerRadarPamtra(
+                name='single%i' % ii,
+                frequencies=frequency,
+                seed=seed,
+                **settings,
+                **{k: v[ii] for k, v in perFrequency.items()},
+            )
+        ).results
+        nfft = perFrequency['radarNFFT'][ii]
+        this = both.sel(frequency=[frequency])
+        assert np.allclose(
+            this.radarSpectrum.isel(dopplerVelocity=slice(0, nfft)),
+            single.radarSpectrum)
+        assert np.all(np.isnan(
+            this.radarSpectrum.isel(dopplerVelocity=slice(nfft, None))))
+        assert np.allclose(
+            this.dopplerVelocityGrid.isel(dopplerVelocity=slice(0, nfft)),
+            single.dopplerVelocity)
+        for var in ['radarReflectivity', 'meanDopplerVel', 'spectrumWidth']:
+            assert np.allclose(this[var], single[var], equal_nan=True)
+
+    with pytest.raises(ValueError):
+        pam2.addInstrument(
+            pamtra2.instruments.radar.dopplerRadarPamtra(
+                name='wrong',
+                frequencies=[3e9, 35e9],
+                radarNFFT=[256, 128, 64],
+            )
+        )
+
+
 # def test_attenuation2pia():
 #     arr = xr.DataArray(np.ones(4), coords={'layer': range(4)}, dims=['layer'])
 #     PIA_bottomup, PIA_topdown = pamtra2.instruments.radar._attenuation2pia(arr)
@@ -0,0 +1,64 @@
+import numpy as np
+import pamtra2
+import pytest
+
+
+def _createProfile(nHydrometeors=2):
+    pam2 = pamtra2.pamtra2(
+        nLayer=4,
+        hydrometeors=['cloud', 'rain'][:nHydrometeors],
+        frequencies=[35e9],
+        additionalDims={'time': range(3)},
+    )
+    pam2.profile.height[:] = [500, 1000, 2000, 5000]
+    pam2.profile.temperature[:] = np.linspace(250, 290, 12).reshape(3, 4)
+    pam2.profile.pressure[:] = [95000, 90000, 80000, 55000]
+    pam2.profile.relativeHumidity[:] = [[0], [50], [100]]
+    pam2.profile.hydrometeorContent[:] = 1e-4
+    return pam2
+
+
+@pytest.mark.parametrize('nHydrometeors', [2, 0])
+def test_fused(nHydrometeors):
+    pam2 = _createProfile(nHydrometeors)
+    pam2.addMissingVariables()
+    fused = pam2.profile
+
+    reference = _createProfile(nHydrometeors)
+    reference.addSpecificHumidity()
+    reference.addAbsoluteHumidity()
+    reference.addDryAirDensity()
+    reference.addAirDensity()
+    reference.addDynamicViscosity()
+    reference.addKinematicViscosity()
+    reference.addWaterVaporPressure()
+
+    for var in pamtra2.thermodynamics.VARIABLES:
+        assert fused[var].dims == reference.profile[var].dims
+        assert np.allclose(fused[var], reference.profile[var], rtol=1e-12,
+                           atol=0, equal_nan=True)
+
+
+def test_numpy_kernel():
+    pam2 = _createProfile()
+    args = [pam2.profile.temperature.values, pam2.profile.pressure.values,
+            pam2.profile.relativeHumidity.values,
+            pam2.profile.hydrometeorContent.sum('hydrometeor').values]
+    compiled = pamtra2.thermodynamics.deriveThermodynamics(*args)
+
+    args = [np.ravel(aa) for aa in args]
+    results = [np.empty(args[0].shape) for vv in compiled]
+    pamtra2.thermodynamics._deriveNumpy(*args, *results)
+    for rr, cc in zip(results, compiled):
+        assert np.allclose(rr, cc.ravel(), rtol=1e-12, atol=0)
+
+
+def test_dask():
+    pam2 = _createProfile()
+    pam2.profile = pam2.profile.chunk({'time': 1})
+    pam2.addMissingVariables()
+    assert pam2.profile.airDensity.chunks is not None
+
+    reference = _createProfile()
+    reference.addMissingVariables()
+    assert np.allclose(pam2.profile.airDensity, reference.profile.airDensity)
@@ -0,0 +1,60 @@
+import numpy as np
+import pamtra2
+import pytest
+import xarray as xr
+
+
+class TestCheck(object):
+    def setUp(self):
+        self.positive = xr.DataArray(
+            np.random.random((40, 300)) + 1, dims=['x', 'y'])
+        self.negative = -self.positive.copy()
+        self.withNan = self.positive.copy()
+        self.withNan[3, 5] = np.nan
+
+    def test_full(self):
+        self.setUp()
+        pamtra2.validation.check([
+            ('a', self.positive, 'greaterZero'),
+            ('b', 0, 'greaterEqualZero'),
+            ('c', self.negative, 'notNan'),
+        ])
+
+    def test_allViolations(self):
+        self.setUp()
+        with pytest.raises(ValueError) as excinfo:
+            pamtra2.validation.check([
+                ('a', self.negative, 'greaterZero'),
+                ('b', self.positive, 'greaterZero'),
+                ('c', self.withNan, 'notNan'),
+                ('d', self.withNan, 'greaterEqualZero'),
+            ])
+        message = str(excinfo.value)
+        assert 'a is not larger than zero' in message
+        assert 'b' not in message
+        assert 'Found NAN in c' in message
+        assert 'd is negative or NAN' in message
+
+    def test_dask(self):
+        self.setUp()
+        with pytest.raises(ValueError):
+            pamtra2.validation.check([
+                ('a', self.withNan.chunk({'x': 10}), 'notNan')])
+
+    def test_sampled(self):
+        self.setUp()
+        sample = pamtra2.validation._sample(self.positive.values)
+        assert sample.size <= pamtra2.validation.SAMPLE_SIZE
+        assert sample.base is not None
+        # the NaN is not part of the sample
+        pamtra2.validation.check(
+            [('a', self.withNan, 'notNan')], policy='sampled')
+
+    def test_off(self):
+        self.setUp()
+        with pamtra2.validation.usePolicy('off'):
+            pamtra2.validation.check([('a', self.withNan, 'notNan')])
+        assert pamtra2.validation.getPolicy() == 'full'
+        with pytest.raises(ValueError):
+            pamtra2.validation.setPolicy('some')
+
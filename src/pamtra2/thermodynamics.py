@@ -0,0 +1,193 @@
+# -*- coding: utf-8 -*-
+"""Fused derivation of the atmospheric variables of addMissingVariables.
+
+All variables are derived from temperature, pressure, relative humidity
+and hydrometeor content in a single pass. The saturation pressure is
+evaluated only once per grid point and all results are written into
+preallocated arrays. If numba is available, the loop is compiled,
+otherwise the same equations are evaluated with numpy in place.
+
+The equations are the ones of meteo_si (saturation pressure over water
+after the CIMO guide, specific and absolute humidity, density of moist
+air) and the Sutherland law for the dynamic viscosity of dry air.
+"""
+import warnings
+
+import numpy as np
+import xarray as xr
+
+from . import helpers
+from .libs.meteo_si import constants
+
+try:
+    import numba
+except ImportError:
+    numba = None
+
+# variables derived by deriveThermodynamics, in this order
+VARIABLES = [
+    'specificHumidity',
+    'absoluteHumidity',
+    'dryAirDensity',
+    'airDensity',
+    'dynamicViscosity',
+    'kinematicViscosity',
+    'waterVaporPressure',
+]
+
+# Sutherland law, see core._dynamic_viscosity_air
+_MU0 = 1.716e-5  # Pa s
+_T0 = 273.  # K
+_C = 111.  # K
+
+
+def _deriveLoop(T, p, rh, qm, q, a, rhoDry, rho, eta, nu, e):
+    for ii in range(T.size):
+        Tc = T[ii] + constants.Tnull
+        e[ii] = rh[ii] * 0.01 * 611.2 * np.exp(17.62 * Tc / (243.12 + Tc))
+        q[ii] = constants.Mwml * e[ii] / (
+            p[ii] - (1 - constants.Mwml) * e[ii])
+        a[ii] = e[ii] / (constants.Rvapor * T[ii])
+        rhoDry[ii] = p[ii] / (constants.Rair * T[ii])
+        rho[ii] = p[ii] / (constants.Rair * T[ii] * (
+            1 + (constants.Rvapor / constants.Rair - 1) * q[ii] - qm[ii]))
+        # (T / T0)**1.5 with sqrt, pow is much slower
+        x = T[ii] / _T0
+        eta[ii] = _MU0 * ((_T0 + _C) / (T[ii] + _C)) * x * np.sqrt(x)
+        nu[ii] = eta[ii] / rhoDry[ii]
+
+
+def _deriveNumpy(T, p, rh, qm, q, a, rhoDry, rho, eta, nu, e):
+    # e as temporary for the temperature in Celsius
+    np.add(T, constants.Tnull, out=e)
+    np.add(e, 243.12, out=a)
+    np.divide(e, a, out=e)
+    np.multiply(e, 17.62, out=e)
+    np.exp(e, out=e)
+    np.multiply(e, rh, out=e)
+    np.multiply(e, 0.01 * 611.2, out=e)
+
+    np.multiply(e, -(1 - constants.Mwml), out=q)
+    np.add(q, p, out=q)
+    np.divide(e, q, out=q)
+    np.multiply(q, constants.Mwml, out=q)
+
+    np.multiply(T, constants.Rvapor, out=a)
+    np.divide(e, a, out=a)
+
+    np.multiply(T, constants.Rair, out=rhoDry)
+    np.divide(p, rhoDry, out=rhoDry)
+
+    np.multiply(q, constants.Rvapor / constants.Rair - 1, out=rho)
+    np.subtract(rho, qm, out=rho)
+    np.add(rho, 1, out=rho)
+    np.divide(rhoDry, rho, out=rho)
+
+    # nu as temporary for (T / T0)**1.5
+    np.divide(T, _T0, out=nu)
+    np.sqrt(nu, out=eta)
+    np.multiply(nu, eta, out=nu)
+    np.add(T, _C, out=eta)
+    np.divide(_MU0 * (_T0 + _C), eta, out=eta)
+    np.multiply(eta, nu, out=eta)
+
+    np.divide(eta, rhoDry, out=nu)
+
+
+if numba is not None:
+    _deriveKernel = numba.njit(_deriveLoop)
+else:
+    _deriveKernel = _deriveNumpy
+
+
+def deriveThermodynamics(temperature, pressure, relativeHumidity,
+                         hydrometeorContent=0.):
+    """Derive all atmospheric variables of addMissingVariables at once.
+
+    Parameters
+    ----------
+    temperature : array_like
+        temperature [K]
+    pressure : array_like
+        pressure [Pa]
+    relativeHumidity : array_like
+        relative humidity [%]
+    hydrometeorContent : array_like, optional
+        sum of the hydrometeor contents [kg/kg] contributing to the air
+        mass (default 0)
+
+    Returns
+    -------
+    tuple of array_like
+        specific humidity [kg/kg], absolute humidity [kg/m^3], density of
+        dry air [kg/m^3], density of moist air [kg/m^3], dynamic viscosity
+        of dry air [Pa s], kinematic viscosity of dry air [m^2/s] and water
+        vapor pressure [Pa] with the broadcasted shape of the input
+    """
+    inputs = np.broadcast_arrays(
+        temperature, pressure, relativeHumidity, hydrometeorContent)
+    shape = inputs[0].shape
+    # copies only if broadcasted or not contiguous
+    inputs = [np.ascontiguousarray(ii, dtype=np.float64).ravel()
+              for ii in inputs]
+    results = [np.empty(shape, dtype=np.float64) for vv in VARIABLES]
+    _deriveKernel(*inputs, *[rr.reshape(-1) for rr in results])
+    return tuple(results)
+
+
+def hydrometeorContentSum(profile):
+    """Sum of the hydrometeor contents of profile, 0 if not available.
+
+    Parameters
+    ----------
+    profile : xr.Dataset
+        profile with variable hydrometeorContent and dimension hydrometeor
+
+    Returns
+    -------
+    xr.DataArray or float
+        sum of the hydrometeor contents
+    """
+    try:
+        return profile.hydrometeorContent.sum('hydrometeor')
+    except ValueError:
+        warnings.warn('hydrometeor content not considered when calculating'
+                      ' air density, because hydrometeor dimension is '
+                      'missing. ')
+    except AttributeError:
+        warnings.warn('hydrometeor content not considered when calculating'
+                      ' air density, because hydrometeorContent variable'
+                      ' is missing.')
+    return 0
+
+
+def addThermodynamicVariables(profile):
+    """Add all variables of VARIABLES to profile in a single pass.
+
+    Parameters
+    ----------
+    profile : xr.Dataset
+        profile with temperature, pressure, relativeHumidity and optionally
+        hydrometeorContent. Modified in place.
+
+    Returns
+    -------
+    xr.Dataset
+        profile
+    """
+    hydrometeorContent = hydrometeorContentSum(profile)
+    if not isinstance(hydrometeorContent, xr.DataArray):
+        hydrometeorContent = xr.zeros_like(profile.temperature)
+    derived = helpers.apply_ufunc_extended(
+        deriveThermodynamics,
+        profile.temperature,
+        profile.pressure,
+        profile.relativeHumidity,
+        hydrometeorContent,
+        output_names=VARIABLES,
+        output_dtypes=[np.float64],
+        dask='parallelized',
+    )
+    for var in VARIABLES:
+        profile[var] = derived[var]
+    return profile
@@ -0,0 +1,147 @@
+# -*- coding: utf-8 -*-
+"""Validation of intermediate and final results.
+
+All checks of an array are reduced to its minimum, i.e. every array is
+scanned once without creating boolean temporaries, and NaNs propagate into
+the minimum. All violations are reported at once.
+
+The validation policy determines how much is checked:
+
+'full'
+    check all elements (default)
+'sampled'
+    check only a regular sample of at most SAMPLE_SIZE elements per array
+'off'
+    no checks
+
+Examples
+--------
+>>> pamtra2.validation.setPolicy('sampled')
+>>> with pamtra2.validation.usePolicy('off'):
+...     pam2.hydrometeors.cloud.solve()
+"""
+import contextlib
+
+import dask
+import numpy as np
+import xarray as xr
+
+POLICIES = ['full', 'sampled', 'off']
+
+SAMPLE_SIZE = 10000
+
+# condition: (message, test applied to the minimum of the array)
+CONDITIONS = {
+    'notNan': ('Found NAN in %s', lambda minimum: not np.isnan(minimum)),
+    'greaterZero': ('%s is not larger than zero',
+                    lambda minimum: minimum > 0),
+    'greaterEqualZero': ('%s is negative or NAN',
+                         lambda minimum: minimum >= 0),
+}
+
+_policy = 'full'
+
+
+def getPolicy():
+    """Current global validation policy."""
+    return _policy
+
+
+def setPolicy(policy):
+    """Set the global validation policy.
+
+    Parameters
+    ----------
+    policy : {'full', 'sampled', 'off'}
+        validation policy
+    """
+    global _policy
+    _checkPolicy(policy)
+    _policy = policy
+
+
+@contextlib.contextmanager
+def usePolicy(policy):
+    """Context manager temporarily changing the global validation policy.
+
+    Parameters
+    ----------
+    policy : {'full', 'sampled', 'off'} or None
+        validation policy. If None, the global policy is not changed.
+    """
+    if policy is None:
+        yield
+        return
+    previous = getPolicy()
+    setPolicy(policy)
+    try:
+        yield
+    finally:
+        setPolicy(previous)
+
+
+def _checkPolicy(policy):
+    if policy not in POLICIES:
+        raise ValueError('Do not understand validation policy %s. Must be '
+                         'one of %s' % (policy, POLICIES))
+
+
+def _sample(data):
+    """Regular sample of at most about SAMPLE_SIZE elements of data.
+    Slicing every axis with a step avoids copying the array."""
+    if data.size <= SAMPLE_SIZE:
+        return data
+    nPerAxis = max(1, int(SAMPLE_SIZE ** (1. / data.ndim)))
+    steps = [max(1, int(np.ceil(n / nPerAxis))) for n in data.shape]
+    return data[tuple(slice(None, None, step) for step in steps)]
+
+
+def check(checks, policy=None):
+    """Check arrays against conditions.
+
+    Parameters
+    ----------
+    checks : list of tuple
+        (name, array, condition) with condition one of 'notNan',
+        'greaterZero' or 'greaterEqualZero'. Arrays can be numpy, dask or
+        xr.DataArray. With dask, all arrays are reduced in a single
+        computation.
+    policy : {'full', 'sampled', 'off'}, optional
+        validation policy. Default is the global policy.
+
+    Raises
+    ------
+    ValueError
+        listing all violated conditions
+    """
+    if policy is None:
+        policy = _policy
+    _checkPolicy(policy)
+    if policy == 'off':
+        return
+
+    names = []
+    minima = []
+    for name, data, condition in checks:
+        if condition not in CONDITIONS.keys():
+            raise ValueError('Do not understand condition %s' % condition)
+        if isinstance(data, xr.DataArray):
+            data = data.data
+        if not hasattr(data, 'min'):
+            data = np.asarray(data)
+        if data.size == 0:
+            continue
+        if policy == 'sampled':
+            data = _sample(data)
+        names.append((name, condition))
+        minima.append(data.min())
+
+    with np.errstate(invalid='ignore'):
+        minima = dask.compute(*minima)
+        violations = [
+            CONDITIONS[condition][0] % name
+            for (name, condition), minimum in zip(names, minima)
+            if not CONDITIONS[condition][1](minimum)
+        ]
+    if len(violations) > 0:
+        raise ValueError('; '.join(violations))